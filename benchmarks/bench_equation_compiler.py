@@ -0,0 +1,71 @@
+"""
+Benchmark : évaluation d'un ensemble d'équations par parcours d'arbre
+contre la fonction générée par EquationCompiler.
+
+Usage : python benchmarks/bench_equation_compiler.py [--equations N] [--samples N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from domain.services.equation_compiler import EquationCompiler, evaluate  # noqa: E402
+from domain.services.equation_parser import EquationParser  # noqa: E402
+
+
+def random_equation(rng: random.Random, variables: list[str], depth: int) -> str:
+    if depth == 0 or rng.random() < 0.2:
+        name = rng.choice(variables)
+        return f"!{name}" if rng.random() < 0.3 else name
+    op = rng.choice(["&", "|"])
+    left = random_equation(rng, variables, depth - 1)
+    right = random_equation(rng, variables, depth - 1)
+    return f"({left} {op} {right})"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--equations", type=int, default=200)
+    parser.add_argument("--variables", type=int, default=32)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    variables = [f"S{i}" for i in range(args.variables)]
+    equation_parser = EquationParser()
+    equations = {
+        f"n{i}": equation_parser.parse(random_equation(rng, variables, depth=5))
+        for i in range(args.equations)
+    }
+    samples = [{v: rng.random() < 0.5 for v in variables} for _ in range(args.samples)]
+
+    start = time.perf_counter()
+    compiled = EquationCompiler().compile_many(equations)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [{name: evaluate(expr, env) for name, expr in equations.items()} for env in samples]
+    tree_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [compiled(env) for env in samples]
+    compiled_time = time.perf_counter() - start
+
+    if actual != expected:
+        raise SystemExit("Résultats divergents entre parcours d'arbre et code compilé")
+
+    evaluations = args.equations * args.samples
+    print(f"{args.equations} équations x {args.samples} échantillons")
+    print(f"compilation      : {compile_time * 1000:8.1f} ms")
+    print(f"parcours d'arbre : {tree_time * 1000:8.1f} ms ({evaluations / tree_time:,.0f} éval/s)")
+    print(f"code compilé     : {compiled_time * 1000:8.1f} ms ({evaluations / compiled_time:,.0f} éval/s)")
+    print(f"accélération     : x{tree_time / compiled_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
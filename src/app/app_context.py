@@ -8,6 +8,7 @@ class AppContext:
         self.current_project: Optional[Project] = None
         self.current_path: Optional[Path] = None
         self.is_dirty: bool = False
+        self.revision: int = 0  # incrémenté à chaque modification
 
     def set_project(self, project: Project, path: Optional[Path] = None):
         self.current_project = project
@@ -16,3 +17,9 @@ class AppContext:
 
     def mark_dirty(self):
         self.is_dirty = True
+        self.revision += 1
+
+    def mark_saved(self, revision: int):
+        """Le projet a été enregistré tel qu'il était à revision."""
+        if revision == self.revision:
+            self.is_dirty = False
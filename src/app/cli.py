@@ -0,0 +1,199 @@
+"""
+Export DEPS en ligne de commande, sans interface graphique.
+
+    modeltodeps-cli "projets/**/*.depsproj" --output-dir build/deps --workers 8
+
+Chaque projet est chargé par ProjectRepository, validé par ProjectService
+puis exporté par DepsGenerator. Les projets sont traités en parallèle dans
+un pool de processus. Les fichiers .deps sont écrits de façon atomique ;
+deux projets qui produiraient le même fichier (p.depsproj et p.depsbin,
+ou a/x et b/x avec --output-dir) sont refusés avant tout export.
+Ce module n'importe pas PySide6.
+"""
+
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from domain.models.validation import Severity
+from domain.services.deps_generator import DepsGenerator, EmissionOrder
+from domain.services.project_service import ProjectService
+from infrastructure.repositories.project_repository import ProjectRepository
+from infrastructure.storage.file_storage import FileStorage
+
+PROJECT_SUFFIXES = (".depsproj", ".depsbin")
+
+
+@dataclass
+class ExportResult:
+    source: str
+    target: Optional[str] = None
+    errors: int = 0
+    warnings: int = 0
+    messages: List[str] = field(default_factory=list)
+    failure: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.failure is None
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[Path]:
+    """Motifs glob (** accepté) ou dossiers -> liste triée de fichiers projet, sans doublons."""
+    found: Dict[str, Path] = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [
+                match
+                for suffix in PROJECT_SUFFIXES
+                for match in glob.glob(os.path.join(pattern, "**", f"*{suffix}"), recursive=True)
+            ]
+        else:
+            matches = glob.glob(pattern, recursive=True) or ([pattern] if os.path.isfile(pattern) else [])
+        for match in matches:
+            path = Path(match)
+            found.setdefault(str(path.resolve()), path)
+    return sorted(found.values())
+
+
+def target_path(source: Path, output_dir: Optional[Path]) -> Path:
+    name = source.with_suffix(".deps").name
+    return (output_dir / name) if output_dir else source.with_name(name)
+
+
+def duplicate_targets(jobs: Iterable[Tuple[Path, Path]]) -> Dict[Path, List[Path]]:
+    """Fichiers de sortie visés par plusieurs projets (p.depsproj et p.depsbin, a/x et b/x avec -o)."""
+    sources_by_target: Dict[str, List[Path]] = {}
+    targets: Dict[str, Path] = {}
+    for source, target in jobs:
+        key = os.path.normcase(str(target.resolve()))
+        sources_by_target.setdefault(key, []).append(source)
+        targets.setdefault(key, target)
+    return {targets[key]: sources for key, sources in sources_by_target.items() if len(sources) > 1}
+
+
+# Services propres à chaque processus (caches d'équations réutilisés d'un projet à l'autre)
+_repository: Optional[ProjectRepository] = None
+_service: Optional[ProjectService] = None
+_generator: Optional[DepsGenerator] = None
+_storage: Optional[FileStorage] = None
+
+
+def _init_worker(generator_options: Dict[str, Any]) -> None:
+    global _repository, _service, _generator, _storage
+    _repository = ProjectRepository()
+    _storage = FileStorage()
+    _service = ProjectService()
+    # un diagramme n'est généré qu'une fois par projet : pas de cache de fragments
+    _generator = DepsGenerator(incremental=False, **generator_options)
+
+
+def export_project(source: str, target: str, strict: bool) -> ExportResult:
+    assert _repository is not None and _service is not None and _generator is not None and _storage is not None
+    result = ExportResult(source=source)
+    try:
+        project = _repository.load(Path(source))
+    except Exception as exc:
+        result.failure = f"chargement impossible : {exc}"
+        return result
+
+    for issue in _service.validate_project(project):
+        if issue.severity == Severity.ERROR:
+            result.errors += 1
+        elif issue.severity == Severity.WARNING:
+            result.warnings += 1
+        result.messages.append(f"[{issue.severity.value}] {issue.message}")
+
+    if strict and result.errors:
+        result.failure = f"{result.errors} erreur(s) de validation, export ignoré"
+        return result
+
+    try:
+        # écriture atomique : un export interrompu ne laisse pas de fichier tronqué
+        _storage.write_text(Path(target), lambda f: _generator.generate_to(project, f))
+    except Exception as exc:
+        result.failure = f"export impossible : {exc}"
+        return result
+    result.target = target
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="modeltodeps-cli",
+        description="Génère le code DEPS de projets .depsproj / .depsbin sans interface graphique.",
+    )
+    parser.add_argument("inputs", nargs="+", help="fichiers, dossiers ou motifs glob (ex: 'projets/**/*.depsproj')")
+    parser.add_argument("-o", "--output-dir", type=Path, help="dossier de sortie (par défaut : à côté de chaque projet)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="nombre de processus")
+    parser.add_argument("--strict", action="store_true", help="ne pas exporter un projet qui a des erreurs de validation")
+    parser.add_argument("--optimize-equations", action="store_true", help="simplifier les équations exportées")
+    parser.add_argument(
+        "--order",
+        choices=[order.value for order in EmissionOrder],
+        default=EmissionOrder.LIST.value,
+        help="ordre d'émission des NODE",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="afficher le détail des problèmes de validation")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    sources = expand_inputs(args.inputs)
+    if not sources:
+        print("Aucun projet trouvé.", file=sys.stderr)
+        return 2
+
+    generator_options = {
+        "optimize_equations": args.optimize_equations,
+        "order": EmissionOrder(args.order),
+    }
+    targets = [(source, target_path(source, args.output_dir)) for source in sources]
+    duplicates = duplicate_targets(targets)
+    if duplicates:
+        # deux processus écriraient le même fichier : on refuse avant de commencer
+        for target, clashing in duplicates.items():
+            names = ", ".join(str(source) for source in clashing)
+            print(f"Plusieurs projets seraient exportés vers {target} : {names}", file=sys.stderr)
+        return 2
+    jobs = [(str(source), str(target), args.strict) for source, target in targets]
+    workers = max(1, min(args.workers, len(jobs)))
+
+    executor: Optional[ProcessPoolExecutor] = None
+    if workers == 1:
+        _init_worker(generator_options)
+        results: Iterable[ExportResult] = (export_project(*job) for job in jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(generator_options,))
+        results = executor.map(export_project, *zip(*jobs), chunksize=max(1, len(jobs) // (workers * 4)))
+
+    failures = 0
+    for result in results:
+        if result.ok:
+            status = "OK "
+            detail = f"-> {result.target}"
+            if result.errors or result.warnings:
+                detail += f" ({result.errors} erreur(s), {result.warnings} avertissement(s))"
+        else:
+            failures += 1
+            status = "ERR"
+            detail = result.failure
+        print(f"{status} {result.source} {detail}")
+        if args.verbose:
+            for message in result.messages:
+                print(f"    {message}")
+
+    if executor is not None:
+        executor.shutdown()
+    print(f"{len(jobs) - failures}/{len(jobs)} projet(s) exporté(s).")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import uuid
 
 
@@ -31,25 +31,47 @@ class ConnectionType(str, Enum):
     FEEDBACK = "feedback"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NodeAppearance:
+    """
+    Style visuel d'un noeud. Immuable et partagé : les noeuds d'un même style
+    pointent vers une seule instance, celle du registre (intern()). Pour
+    changer le style d'un noeud, lui affecter une autre apparence
+    (dataclasses.replace(node.appearance, fill_color=...)).
+    """
+
     shape: NodeShape = NodeShape.RECTANGLE
     border: BorderStyle = BorderStyle.SINGLE
     fill_color: str = "#f5f5f5"
     border_color: str = "#2d2d2d"
     text_color: str = "#111111"
 
+    def intern(self) -> "NodeAppearance":
+        """Instance partagée égale à self (self si c'est la première)."""
+        return _APPEARANCES.setdefault(self, self)
+
     @staticmethod
     def from_dict(data: Optional[Dict[str, str]]) -> "NodeAppearance":
         if not data:
-            return NodeAppearance()
-        return NodeAppearance(
-            shape=NodeShape(data.get("shape", NodeShape.RECTANGLE.value)),
-            border=BorderStyle(data.get("border", BorderStyle.SINGLE.value)),
-            fill_color=data.get("fill_color", "#f5f5f5"),
-            border_color=data.get("border_color", "#2d2d2d"),
-            text_color=data.get("text_color", "#111111"),
+            return DEFAULT_APPEARANCE
+        key = (
+            data.get("shape", NodeShape.RECTANGLE.value),
+            data.get("border", BorderStyle.SINGLE.value),
+            data.get("fill_color", "#f5f5f5"),
+            data.get("border_color", "#2d2d2d"),
+            data.get("text_color", "#111111"),
         )
+        appearance = _APPEARANCES_BY_VALUES.get(key)
+        if appearance is None:
+            appearance = NodeAppearance(
+                shape=NodeShape(key[0]),
+                border=BorderStyle(key[1]),
+                fill_color=key[2],
+                border_color=key[3],
+                text_color=key[4],
+            ).intern()
+            _APPEARANCES_BY_VALUES[key] = appearance
+        return appearance
 
     def to_dict(self) -> Dict[str, str]:
         return {
@@ -61,14 +83,21 @@ class NodeAppearance:
         }
 
 
-@dataclass
+# registre des apparences partagées ; _APPEARANCES_BY_VALUES évite de
+# reconstruire une apparence pour retrouver l'instance partagée au chargement
+_APPEARANCES: Dict[NodeAppearance, NodeAppearance] = {}
+_APPEARANCES_BY_VALUES: Dict[Tuple[str, str, str, str, str], NodeAppearance] = {}
+DEFAULT_APPEARANCE = NodeAppearance().intern()
+
+
+@dataclass(slots=True)
 class Node:
     id: str
     type: NodeType
     label: str
     x: float
     y: float
-    appearance: NodeAppearance = field(default_factory=NodeAppearance)
+    appearance: NodeAppearance = DEFAULT_APPEARANCE
     properties: Dict[str, str] = field(default_factory=dict)  # ex: "equation", "tag", etc.
 
     @staticmethod
@@ -87,12 +116,19 @@ class Node:
             label=label,
             x=x,
             y=y,
-            appearance=appearance or NodeAppearance(),
+            appearance=(appearance or DEFAULT_APPEARANCE).intern(),
             properties=properties or {},
         )
 
+    def set_property(self, key: str, value: Optional[str]) -> None:
+        """Modifie une propriété (None : la supprime). Valable aussi pour les NodeView d'un DiagramStore."""
+        if value is None:
+            self.properties.pop(key, None)
+        else:
+            self.properties[key] = value
 
-@dataclass
+
+@dataclass(slots=True)
 class Connection:
     id: str
     source_id: str
@@ -133,6 +169,81 @@ class Diagram:
     nodes: List[Node] = field(default_factory=list)
     connections: List[Connection] = field(default_factory=list)
 
+    def is_empty(self) -> bool:
+        return not self.nodes
+
+
+DiagramContentLoader = Callable[[], Tuple[List[Node], List[Connection]]]
+
+
+class LazyDiagram(Diagram):
+    """
+    Diagramme dont l'en-tête (id, nom, type) est connu tout de suite et dont
+    les noeuds et connexions ne sont chargés qu'au premier accès, via loader.
+    S'utilise partout comme un Diagram. node_count (lu dans l'index du
+    fichier, s'il est connu) permet à is_empty() de répondre sans charger.
+    """
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        diagram_type: DiagramType,
+        loader: DiagramContentLoader,
+        node_count: Optional[int] = None,
+    ):
+        self.id = id
+        self.name = name
+        self.diagram_type = diagram_type
+        self.loader = loader
+        self.node_count = node_count
+        self._nodes: Optional[List[Node]] = None
+        self._connections: Optional[List[Connection]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._nodes is not None
+
+    def load(self) -> None:
+        if self._nodes is None:
+            self._nodes, self._connections = self.loader()
+
+    def is_empty(self) -> bool:
+        if self._nodes is None and self.node_count is not None:
+            return self.node_count == 0
+        return not self.nodes
+
+    @property
+    def nodes(self) -> List[Node]:
+        self.load()
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, value: List[Node]) -> None:
+        self.load()
+        self._nodes = value
+
+    @property
+    def connections(self) -> List[Connection]:
+        self.load()
+        return self._connections
+
+    @connections.setter
+    def connections(self, value: List[Connection]) -> None:
+        self.load()
+        self._connections = value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Diagram):
+            return NotImplemented
+        return (self.id, self.name, self.diagram_type, self.nodes, self.connections) == (
+            other.id, other.name, other.diagram_type, other.nodes, other.connections
+        )
+
+    def __repr__(self) -> str:
+        content = f"nodes={len(self._nodes)}" if self._nodes is not None else "non chargé"
+        return f"LazyDiagram(id={self.id!r}, name={self.name!r}, diagram_type={self.diagram_type}, {content})"
+
 
 @dataclass
 class DiagramComponent:
@@ -143,3 +254,7 @@ class DiagramComponent:
     node_type: NodeType
     appearance: NodeAppearance
     default_properties: Dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # les noeuds créés depuis la palette partagent l'apparence du registre
+        self.appearance = self.appearance.intern()
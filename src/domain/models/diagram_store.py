@@ -0,0 +1,259 @@
+from array import array
+from collections.abc import MutableSequence
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Union, overload
+
+from .diagram import Node, NodeType, NodeAppearance
+
+_NODE_TYPES: List[NodeType] = list(NodeType)
+_NODE_TYPE_CODES: Dict[NodeType, int] = {t: i for i, t in enumerate(_NODE_TYPES)}
+# propriétés d'un noeud qui n'en a pas : partagées et en lecture seule
+_NO_PROPERTIES: Mapping[str, str] = MappingProxyType({})
+
+
+class DiagramStore:
+    """
+    Noeuds d'un diagramme stockés en colonnes (struct of arrays) : ids et
+    libellés en listes, type, position et style en tableaux typés (indice
+    dans la table des NodeAppearance partagées), pas de dict de propriétés pour
+    les noeuds qui n'en ont pas.
+
+    nodes() retourne une NodeList utilisable comme diagram.nodes : ses
+    éléments sont des NodeView, des Node légers qui lisent et écrivent dans
+    les colonnes. Une vue désigne une position : supprimer ou insérer un
+    noeud décale les vues qui suivent.
+
+    Un noeud sans propriétés n'a pas de dict : NodeView.properties retourne
+    alors une vue vide en lecture seule, et set_property() crée le dict à
+    la première écriture.
+    """
+
+    __slots__ = ("ids", "labels", "types", "xs", "ys", "style_index", "styles", "properties", "_style_ids")
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.labels: List[str] = []
+        self.types = array("B")
+        self.xs = array("d")
+        self.ys = array("d")
+        self.style_index = array("I")
+        self.styles: List[NodeAppearance] = []
+        self.properties: List[Optional[Dict[str, str]]] = []
+        self._style_ids: Dict[NodeAppearance, int] = {}
+
+    @staticmethod
+    def from_nodes(nodes: Iterable[Node]) -> "DiagramStore":
+        store = DiagramStore()
+        for node in nodes:
+            store.append(node)
+        return store
+
+    @staticmethod
+    def from_columns(
+        ids: List[str],
+        types: Iterable[NodeType],
+        labels: List[str],
+        xs: array,
+        ys: array,
+        styles: List[NodeAppearance],
+        style_index: array,
+        properties: List[Optional[Dict[str, str]]],
+    ) -> "DiagramStore":
+        """Construit le store sans passer par des Node (décodage d'un bloc binaire)."""
+        store = DiagramStore()
+        store.ids = ids
+        store.labels = labels
+        store.types = array("B", (_NODE_TYPE_CODES[t] for t in types))
+        store.xs = xs
+        store.ys = ys
+        store.properties = properties
+        remap = array("I", (store.intern_style(a) for a in styles))
+        store.style_index = array("I", (remap[i] for i in style_index))
+        return store
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def nodes(self) -> "NodeList":
+        return NodeList(self)
+
+    def view(self, index: int) -> "NodeView":
+        return NodeView(self, index)
+
+    def intern_style(self, appearance: NodeAppearance) -> int:
+        index = self._style_ids.get(appearance)
+        if index is None:
+            index = self._style_ids[appearance] = len(self.styles)
+            self.styles.append(appearance.intern())
+        return index
+
+    def append(self, node: Node) -> None:
+        self.insert(len(self.ids), node)
+
+    def insert(self, index: int, node: Node) -> None:
+        self.ids.insert(index, node.id)
+        self.labels.insert(index, node.label)
+        self.types.insert(index, _NODE_TYPE_CODES[node.type])
+        self.xs.insert(index, node.x)
+        self.ys.insert(index, node.y)
+        self.style_index.insert(index, self.intern_style(node.appearance))
+        self.properties.insert(index, dict(node.properties) if node.properties else None)
+
+    def set(self, index: int, node: Node) -> None:
+        self.ids[index] = node.id
+        self.labels[index] = node.label
+        self.types[index] = _NODE_TYPE_CODES[node.type]
+        self.xs[index] = node.x
+        self.ys[index] = node.y
+        self.style_index[index] = self.intern_style(node.appearance)
+        self.properties[index] = dict(node.properties) if node.properties else None
+
+    def delete(self, index: int) -> None:
+        for column in (self.ids, self.labels, self.types, self.xs, self.ys, self.style_index, self.properties):
+            del column[index]
+
+
+class NodeView(Node):
+    """Noeud d'un DiagramStore : mêmes attributs qu'un Node, lus et écrits dans les colonnes."""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: DiagramStore, index: int):
+        object.__setattr__(self, "_store", store)
+        object.__setattr__(self, "_index", index)
+
+    @property
+    def id(self) -> str:
+        return self._store.ids[self._index]
+
+    @id.setter
+    def id(self, value: str) -> None:
+        self._store.ids[self._index] = value
+
+    @property
+    def type(self) -> NodeType:
+        return _NODE_TYPES[self._store.types[self._index]]
+
+    @type.setter
+    def type(self, value: NodeType) -> None:
+        self._store.types[self._index] = _NODE_TYPE_CODES[NodeType(value)]
+
+    @property
+    def label(self) -> str:
+        return self._store.labels[self._index]
+
+    @label.setter
+    def label(self, value: str) -> None:
+        self._store.labels[self._index] = value
+
+    @property
+    def x(self) -> float:
+        return self._store.xs[self._index]
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self._store.xs[self._index] = value
+
+    @property
+    def y(self) -> float:
+        return self._store.ys[self._index]
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self._store.ys[self._index] = value
+
+    @property
+    def appearance(self) -> NodeAppearance:
+        return self._store.styles[self._store.style_index[self._index]]
+
+    @appearance.setter
+    def appearance(self, value: NodeAppearance) -> None:
+        self._store.style_index[self._index] = self._store.intern_style(value)
+
+    @property
+    def properties(self) -> Mapping[str, str]:
+        props = self._store.properties[self._index]
+        return _NO_PROPERTIES if props is None else props
+
+    @properties.setter
+    def properties(self, value: Mapping[str, str]) -> None:
+        self._store.properties[self._index] = dict(value) if value else None
+
+    def set_property(self, key: str, value: Optional[str]) -> None:
+        properties = self._store.properties
+        props = properties[self._index]
+        if value is not None:
+            if props is None:
+                props = properties[self._index] = {}
+            props[key] = value
+        elif props is not None:
+            props.pop(key, None)
+            if not props:
+                properties[self._index] = None
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Node):
+            return NotImplemented
+        return (self.id, self.type, self.label, self.x, self.y, self.appearance, self.properties) == (
+            other.id, other.type, other.label, other.x, other.y, other.appearance, other.properties
+        )
+
+    __hash__ = None
+
+
+class NodeList(MutableSequence):
+    """Séquence de NodeView sur un DiagramStore ; append/insert recopient le Node dans les colonnes."""
+
+    __slots__ = ("store",)
+
+    def __init__(self, store: DiagramStore):
+        self.store = store
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    @overload
+    def __getitem__(self, index: int) -> NodeView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[NodeView]: ...
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [NodeView(self.store, i) for i in range(*index.indices(len(self.store)))]
+        return NodeView(self.store, self._position(index))
+
+    def __setitem__(self, index: int, node: Node) -> None:
+        if isinstance(index, slice):
+            raise TypeError("NodeList ne gère pas l'affectation par tranche")
+        self.store.set(self._position(index), node)
+
+    def __delitem__(self, index: int) -> None:
+        if isinstance(index, slice):
+            for i in sorted(range(*index.indices(len(self.store))), reverse=True):
+                self.store.delete(i)
+            return
+        self.store.delete(self._position(index))
+
+    def insert(self, index: int, node: Node) -> None:
+        self.store.insert(min(max(index if index >= 0 else len(self.store) + index, 0), len(self.store)), node)
+
+    def __iter__(self):
+        store = self.store
+        return (NodeView(store, i) for i in range(len(store)))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (list, NodeList)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"NodeList({len(self.store)} noeuds)"
+
+    def _position(self, index: int) -> int:
+        size = len(self.store)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("index de noeud hors limites")
+        return index
@@ -1,34 +1,146 @@
 from dataclasses import dataclass
-from typing import List
+from threading import Lock
+from typing import Any, ClassVar, Dict, Sequence, Tuple, Type
+import weakref
 
 
-@dataclass
 class Expr:
-    pass
+    """
+    Noeud d'expression booléenne, immuable et interné (hash-consing).
+
+    Deux expressions structurellement égales sont le même objet :
+    Var("A") is Var("A"), And(a, b) is And(a, b). Le hash est calculé une
+    seule fois à la construction et l'égalité se réduit à l'identité, ce qui
+    permet de mémoïser n'importe quel traitement sur id(expr) ou sur expr.
+    """
+
+    __slots__ = ("_hash", "__weakref__")
+    _fields: ClassVar[Tuple[str, ...]] = ()
+    _table: ClassVar["weakref.WeakValueDictionary[tuple, Expr]"] = weakref.WeakValueDictionary()
+    _lock: ClassVar[Lock] = Lock()
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "Expr":
+        values = cls._bind(args, kwargs)
+        # les enfants sont déjà internés : leur hash et leur égalité sont en O(1)
+        key = (cls, *values)
+        existing = Expr._table.get(key)
+        if existing is not None:
+            return existing
+        with Expr._lock:
+            existing = Expr._table.get(key)
+            if existing is not None:
+                return existing
+            self = object.__new__(cls)
+            for name, value in zip(cls._fields, values):
+                object.__setattr__(self, name, value)
+            object.__setattr__(self, "_hash", hash(key))
+            Expr._table[key] = self
+            return self
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # tout est fait dans __new__ (l'instance peut être partagée)
+        pass
+
+    @classmethod
+    def _bind(cls, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Any, ...]:
+        if len(args) > len(cls._fields):
+            raise TypeError(f"{cls.__name__} attend {len(cls._fields)} argument(s)")
+        values = list(args)
+        for name in cls._fields[len(args):]:
+            if name not in kwargs:
+                raise TypeError(f"{cls.__name__} : argument '{name}' manquant")
+            values.append(kwargs.pop(name))
+        if kwargs:
+            raise TypeError(f"{cls.__name__} : argument(s) inattendu(s) {', '.join(kwargs)}")
+        return tuple(values)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __reduce__(self):
+        # pickle / copy reconstruisent via le constructeur, donc réinternent
+        return type(self), tuple(getattr(self, name) for name in self._fields)
+
+    def __copy__(self) -> "Expr":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Expr":
+        return self
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+    @staticmethod
+    def interned_count() -> int:
+        """Nombre d'expressions distinctes actuellement vivantes."""
+        return len(Expr._table)
+
+
+class Const(Expr):
+    __slots__ = ("value",)
+    __match_args__ = ("value",)
+    _fields = ("value",)
+    value: bool
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "Const":
+        # Const(1) et Const(True) doivent donner le même objet
+        (value,) = cls._bind(args, kwargs)
+        return super().__new__(cls, bool(value))
 
 
-@dataclass
 class Var(Expr):
+    __slots__ = ("name",)
+    __match_args__ = ("name",)
+    _fields = ("name",)
     name: str
 
 
-@dataclass
 class Not(Expr):
+    __slots__ = ("expr",)
+    __match_args__ = ("expr",)
+    _fields = ("expr",)
     expr: Expr
 
 
-@dataclass
 class And(Expr):
+    __slots__ = ("left", "right")
+    __match_args__ = ("left", "right")
+    _fields = ("left", "right")
     left: Expr
     right: Expr
 
 
-@dataclass
 class Or(Expr):
+    __slots__ = ("left", "right")
+    __match_args__ = ("left", "right")
+    _fields = ("left", "right")
     left: Expr
     right: Expr
 
 
+def chain(kind: Type[Expr], operands: Sequence[Expr]) -> Expr:
+    """
+    And / Or de plusieurs opérandes (au moins un), sous forme d'arbre
+    équilibré : une chaîne de n termes a une profondeur log2(n) au lieu de n,
+    ce qui borne la récursion des traitements (évaluation, pickle...).
+    Les opérandes restent dans l'ordre : flatten() les restitue tels quels.
+    """
+    level = list(operands)
+    while len(level) > 1:
+        paired = [kind(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
 @dataclass
 class EquationError:
     message: str
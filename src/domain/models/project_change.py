@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from .diagram import Diagram, DiagramType, Node, Connection
+
+
+class ChangeKind(str, Enum):
+    NODE_ADDED = "node_added"
+    NODE_MOVED = "node_moved"
+    CONNECTION_ADDED = "connection_added"
+
+
+@dataclass
+class ProjectChange:
+    """
+    Modification élémentaire d'un diagramme, rejouable sur un Project
+    (voir domain.services.project_changes.apply_change).
+
+    step_id est renseigné par l'étape du wizard qui remonte la modification.
+    Le nom et le type du diagramme permettent de le recréer s'il n'existe
+    pas encore dans le projet enregistré.
+    """
+
+    kind: ChangeKind
+    diagram_id: str
+    step_id: str = ""
+    diagram_name: str = ""
+    diagram_type: DiagramType = DiagramType.OTHER
+    node: Optional[Node] = None
+    connection: Optional[Connection] = None
+    node_id: str = ""
+    x: float = 0.0
+    y: float = 0.0
+
+    @staticmethod
+    def node_added(diagram: Diagram, node: Node) -> "ProjectChange":
+        return ProjectChange(
+            kind=ChangeKind.NODE_ADDED,
+            diagram_id=diagram.id,
+            diagram_name=diagram.name,
+            diagram_type=diagram.diagram_type,
+            node=node,
+        )
+
+    @staticmethod
+    def node_moved(diagram: Diagram, node: Node) -> "ProjectChange":
+        return ProjectChange(kind=ChangeKind.NODE_MOVED, diagram_id=diagram.id, node_id=node.id, x=node.x, y=node.y)
+
+    @staticmethod
+    def connection_added(diagram: Diagram, connection: Connection) -> "ProjectChange":
+        return ProjectChange(
+            kind=ChangeKind.CONNECTION_ADDED,
+            diagram_id=diagram.id,
+            diagram_name=diagram.name,
+            diagram_type=diagram.diagram_type,
+            connection=connection,
+        )
@@ -1,40 +1,344 @@
+import multiprocessing
+from enum import Enum
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
 from domain.models.project import Project
-from domain.models.diagram import NodeType
+from domain.models.project_change import ProjectChange
+from domain.models.diagram import (
+    Diagram,
+    DiagramType,
+    Node,
+    NodeType,
+    NodeAppearance,
+    NodeShape,
+    BorderStyle,
+    Connection,
+    ConnectionType,
+)
+from domain.services.diagram_graph import DiagramGraph
+from domain.services.equation_formatter import EquationFormatter
+from domain.services.equation_parser import EquationParser, EquationSyntaxError
+from domain.services.equation_simplifier import EquationSimplifier
+from domain.services.lru_cache import LruCache
+
+# Forme compacte d'un diagramme envoyée aux processus de travail :
+# (id, nom, type, styles, noeuds, connexions), uniquement des tuples de str / float / int
+PackedDiagram = Tuple[Any, ...]
+
+
+class EmissionOrder(str, Enum):
+    LIST = "list"  # ordre de diagram.nodes
+    TOPOLOGICAL = "topological"  # ordre d'évaluation déduit des connexions
 
 
 class DepsGenerator:
     """
     Transforme le Project en texte DEPS.
     L'implémentation dépendra de ton format DEPS, ici on prépare juste la structure.
+
+    Avec optimize_equations=True, chaque équation est analysée, simplifiée
+    et réécrite sous forme minimale avant d'être émise. Les équations
+    invalides sont recopiées telles quelles (validate_project les signale).
+
+    Avec incremental=True, le texte de chaque diagramme est conservé d'une
+    génération à l'autre et seuls les diagrammes signalés par invalidate()
+    sont réémis : l'appelant doit lui transmettre chaque ProjectChange (et
+    invalidate() sans argument quand le projet est remplacé ou modifié sans
+    description). Sans ce suivi, garder incremental=False (par défaut).
+
+    Avec workers > 1, les diagrammes à réémettre sont répartis sur un pool
+    de processus (créé à la première utilisation, libéré par close()). Le
+    texte produit est identique octet pour octet au mode séquentiel.
+
+    Avec order=EmissionOrder.TOPOLOGICAL, les NODE d'un diagramme sont émis
+    dans l'ordre des connexions (une source avant ses cibles), les
+    connexions FEEDBACK étant traitées comme des arcs retour : le code peut
+    alors être évalué en une seule passe. Les cycles restants sont émis
+    groupés, précédés d'une ligne "# Cycle: <ids>".
     """
 
-    def generate(self, project: Project) -> str:
-        lines: list[str] = []
-        lines.append(f"# DEPS code generated for project: {project.name}")
-        lines.append("# TODO: structurer selon le format DEPS réel")
-        lines.append("")
+    def __init__(
+        self,
+        optimize_equations: bool = False,
+        cache_size: int = 4096,
+        incremental: bool = False,
+        workers: Optional[int] = None,
+        order: EmissionOrder = EmissionOrder.LIST,
+    ):
+        self.optimize_equations = optimize_equations
+        self.order = EmissionOrder(order)
+        self.incremental = incremental
+        self.workers = workers
+        self._cache_size = cache_size
+        # (step_id, diagram_id) -> (révision du rendu, options, fragment)
+        self._fragments: Dict[Tuple[str, str], Tuple[int, Dict[str, Any], str]] = {}
+        self._revision = 0  # incrémentée par invalidate()
+        self._changed_at: Dict[Tuple[str, str], int] = {}  # dernière révision modifiant le diagramme
+        self._cleared_at = 0  # révision du dernier invalidate() global
+        self._parser = EquationParser(cache_size)
+        self._simplifier = EquationSimplifier(cache_size=cache_size)
+        self._formatter = EquationFormatter()
+        self._equation_cache: LruCache[str] = LruCache(cache_size)
+        self._executor: Optional[Executor] = None
+        self._executor_options: Optional[Dict[str, Any]] = None
+
+    def __enter__(self) -> "DepsGenerator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Arrête le pool de processus éventuel."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_options = None
+
+    @property
+    def revision(self) -> int:
+        """Révision courante, à relever au moment où le projet exporté est figé."""
+        return self._revision
+
+    def invalidate(self, change: Optional[ProjectChange] = None) -> None:
+        """Le diagramme visé par change a été modifié ; sans change, tout le projet."""
+        self._revision += 1
+        if change is None:
+            self._cleared_at = self._revision
+            self._changed_at.clear()
+            self._fragments.clear()
+        else:
+            self._changed_at[(change.step_id, change.diagram_id)] = self._revision
+
+    def generate(self, project: Project, revision: Optional[int] = None) -> str:
+        return "".join(self.iter_chunks(project, revision))
+
+    def generate_to(self, project: Project, stream: TextIO, revision: Optional[int] = None) -> None:
+        """Écrit le code DEPS dans stream au fil de la génération, sans construire le texte complet."""
+        write = stream.write
+        for chunk in self.iter_chunks(project, revision):
+            write(chunk)
+
+    def iter_chunks(self, project: Project, revision: Optional[int] = None) -> Iterator[str]:
+        """
+        Produit le code DEPS par morceaux : l'en-tête, puis l'en-tête de
+        chaque étape et un morceau par diagramme. La concaténation des
+        morceaux est exactement le résultat de generate().
+
+        revision : valeur de self.revision quand project a été figé (export
+        d'un ProjectSnapshot dans un autre thread) ; par défaut la révision
+        courante. Les modifications signalées ensuite invalident les
+        fragments rendus à partir de project.
+        """
+        if revision is None:
+            revision = self._revision
+        yield f"# DEPS code generated for project: {project.name}\n"
+        yield "# TODO: structurer selon le format DEPS réel\n"
+
+        if self.workers is not None and self.workers > 1:
+            yield from self._iter_parallel(project, revision)
+            return
 
         # Exemple : lister les noeuds et leurs équations
+        if not self.incremental:
+            for step_id, step in project.steps.items():
+                yield f"\n# Step: {step.name} ({step_id})\n"
+                for diagram in step.diagrams:
+                    yield self._render_diagram(diagram)
+            return
+
+        options = self._options()
+        fragments: Dict[Tuple[str, str], Tuple[int, Dict[str, Any], str]] = {}
+        for step_id, step in project.steps.items():
+            yield f"\n# Step: {step.name} ({step_id})\n"
+            for diagram in step.diagrams:
+                key = (step_id, diagram.id)
+                cached = self._cached_fragment(key, options)
+                if cached is None:
+                    cached = (revision, options, self._render_diagram(diagram))
+                fragments[key] = cached
+                yield cached[2]
+        # on ne garde que les diagrammes encore présents dans le projet
+        self._fragments = fragments
+
+    def _iter_parallel(self, project: Project, revision: int) -> Iterator[str]:
+        options = self._options()
+        # plan : texte déjà connu (str) ou None pour un diagramme à émettre
+        plan: List[Optional[str]] = []
+        pending: List[Tuple[Tuple[str, str], Diagram]] = []
+        fragments: Dict[Tuple[str, str], Tuple[int, Dict[str, Any], str]] = {}
         for step_id, step in project.steps.items():
-            lines.append(f"# Step: {step.name} ({step_id})")
+            plan.append(f"\n# Step: {step.name} ({step_id})\n")
             for diagram in step.diagrams:
-                lines.append(f"# Diagram: {diagram.name}")
-                for node in diagram.nodes:
-                    eq = node.properties.get("equation", "")
-                    style = node.appearance
-                    style_tokens = [
-                        f"shape={style.shape.value}",
-                        f"border={style.border.value}",
-                        f"fill={style.fill_color}",
-                        f"stroke={style.border_color}",
-                    ]
-                    properties_tokens = [f"{k}={v}" for k, v in node.properties.items() if k != "equation"]
-                    payload = " ".join(style_tokens + properties_tokens)
-                    if eq:
-                        payload = f"{payload} EQUATION '{eq}'".strip()
-                    lines.append(
-                        f"NODE {node.id} {node.type.value} {node.label} {payload}".strip()
-                    )
-            lines.append("")
+                key = (step_id, diagram.id)
+                cached = self._cached_fragment(key, options) if self.incremental else None
+                plan.append(cached[2] if cached is not None else None)
+                if cached is None:
+                    pending.append((key, diagram))
+                else:
+                    fragments[key] = cached
+
+        if len(pending) > 1:
+            executor = self._get_executor(options)
+            chunksize = max(1, len(pending) // (self.workers * 4))
+            results: Iterator[str] = executor.map(
+                _render_packed, [pack_diagram(d) for _, d in pending], chunksize=chunksize
+            )
+        else:
+            results = (self._render_diagram(d) for _, d in pending)
+
+        rendered = zip(pending, results)
+        for text in plan:
+            if text is None:
+                (key, _), text = next(rendered)
+                fragments[key] = (revision, options, text)
+            yield text
+        if self.incremental:
+            self._fragments = fragments
+
+    def clear_cache(self) -> None:
+        self.invalidate()
+        self._equation_cache.clear()
+
+    def _options(self) -> Dict[str, Any]:
+        # options qui changent le texte émis : un changement invalide les
+        # fragments, et elles configurent les processus de travail
+        return {"optimize_equations": self.optimize_equations, "order": self.order}
 
+    def _cached_fragment(
+        self, key: Tuple[str, str], options: Dict[str, Any]
+    ) -> Optional[Tuple[int, Dict[str, Any], str]]:
+        # valide si rendu après la dernière modification signalée du diagramme
+        cached = self._fragments.get(key)
+        if (
+            cached is not None
+            and cached[0] >= max(self._cleared_at, self._changed_at.get(key, 0))
+            and cached[1] == options
+        ):
+            return cached
+        return None
+
+    def _get_executor(self, options: Dict[str, Any]) -> Executor:
+        if self._executor is not None and self._executor_options != options:
+            self.close()
+        if self._executor is None:
+            # "spawn" : on ne duplique pas par fork un processus qui héberge Qt et des threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(options, self._cache_size),
+            )
+            self._executor_options = options
+        return self._executor
+
+    def _render_diagram(self, diagram: Diagram) -> str:
+        lines = [f"# Diagram: {diagram.name}"]
+        if self.order == EmissionOrder.TOPOLOGICAL:
+            graph = DiagramGraph(diagram)
+            nodes = diagram.nodes
+            for component in graph.topological_components():
+                if graph.is_cycle(component):
+                    lines.append("# Cycle: " + " ".join(graph.node_ids[i] for i in component))
+                lines.extend(self._render_node(nodes[i]) for i in component)
+        else:
+            for node in diagram.nodes:
+                lines.append(self._render_node(node))
+        lines.append("")
         return "\n".join(lines)
+
+    def _render_node(self, node: Node) -> str:
+        eq = node.properties.get("equation", "")
+        if eq and self.optimize_equations:
+            eq = self._optimized_equation(eq)
+        style = node.appearance
+        style_tokens = [
+            f"shape={style.shape.value}",
+            f"border={style.border.value}",
+            f"fill={style.fill_color}",
+            f"stroke={style.border_color}",
+        ]
+        properties_tokens = [f"{k}={v}" for k, v in node.properties.items() if k != "equation"]
+        payload = " ".join(style_tokens + properties_tokens)
+        if eq:
+            payload = f"{payload} EQUATION '{eq}'".strip()
+        return f"NODE {node.id} {node.type.value} {node.label} {payload}".strip()
+
+    def _optimized_equation(self, text: str) -> str:
+        optimized = self._equation_cache.get(text)
+        if optimized is None:
+            try:
+                expr = self._simplifier.simplify(self._parser.parse(text))
+                optimized = self._formatter.format(expr)
+            except EquationSyntaxError:
+                optimized = text
+            self._equation_cache.put(text, optimized)
+        return optimized
+
+
+def pack_diagram(diagram: Diagram) -> PackedDiagram:
+    """Sérialisation compacte d'un diagramme : table des styles + tuples de valeurs simples."""
+    styles: Dict[Tuple[str, ...], int] = {}
+    style_of: Dict[int, int] = {}  # par instance d'apparence (partagées)
+    nodes = []
+    for node in diagram.nodes:
+        a = node.appearance
+        index = style_of.get(id(a))
+        if index is None:
+            style = (a.shape.value, a.border.value, a.fill_color, a.border_color, a.text_color)
+            index = style_of[id(a)] = styles.setdefault(style, len(styles))
+        nodes.append((node.id, node.type.value, node.label, node.x, node.y, index, tuple(node.properties.items())))
+    connections = tuple(
+        (c.id, c.source_id, c.target_id, c.label, c.type.value) for c in diagram.connections
+    )
+    return diagram.id, diagram.name, diagram.diagram_type.value, tuple(styles), tuple(nodes), connections
+
+
+def unpack_diagram(packed: PackedDiagram) -> Diagram:
+    diagram_id, name, diagram_type, styles, nodes, connections = packed
+    appearances = [
+        NodeAppearance(
+            shape=NodeShape(shape),
+            border=BorderStyle(border),
+            fill_color=fill,
+            border_color=stroke,
+            text_color=text,
+        ).intern()
+        for shape, border, fill, stroke, text in styles
+    ]
+    return Diagram(
+        id=diagram_id,
+        name=name,
+        diagram_type=DiagramType(diagram_type),
+        nodes=[
+            Node(
+                id=node_id,
+                type=NodeType(node_type),
+                label=label,
+                x=x,
+                y=y,
+                appearance=appearances[style],
+                properties=dict(properties),
+            )
+            for node_id, node_type, label, x, y, style, properties in nodes
+        ],
+        connections=[
+            Connection(id=c_id, source_id=source, target_id=target, label=label, type=ConnectionType(c_type))
+            for c_id, source, target, label, c_type in connections
+        ],
+    )
+
+
+# Générateur propre à chaque processus de travail (caches d'équations compris)
+_worker_generator: Optional[DepsGenerator] = None
+
+
+def _init_worker(options: Dict[str, Any], cache_size: int) -> None:
+    global _worker_generator
+    _worker_generator = DepsGenerator(cache_size=cache_size, incremental=False, **options)
+
+
+def _render_packed(packed: PackedDiagram) -> str:
+    assert _worker_generator is not None
+    return _worker_generator._render_diagram(unpack_diagram(packed))
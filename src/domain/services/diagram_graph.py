@@ -0,0 +1,127 @@
+import heapq
+from typing import Dict, Iterable, List, Set
+
+from domain.models.diagram import Diagram, Connection, ConnectionType
+
+
+class DiagramGraph:
+    """
+    Graphe orienté d'un diagramme, construit à partir des connexions.
+
+    Les noeuds sont désignés par leur position dans diagram.nodes. Les
+    connexions de type FEEDBACK sont des arcs retour : elles sont conservées
+    à part et ne participent pas à l'ordre d'évaluation.
+    """
+
+    def __init__(self, diagram: Diagram, back_edge_types: Iterable[ConnectionType] = (ConnectionType.FEEDBACK,)):
+        back_types = set(back_edge_types)
+        self.node_ids: List[str] = [node.id for node in diagram.nodes]
+        self.index: Dict[str, int] = {}
+        for i, node_id in enumerate(self.node_ids):
+            self.index.setdefault(node_id, i)
+        self.successors: List[List[int]] = [[] for _ in self.node_ids]
+        self.back_edges: List[Connection] = []
+        self.self_loops: Set[int] = set()
+
+        for connection in diagram.connections:
+            if connection.type in back_types:
+                self.back_edges.append(connection)
+                continue
+            source = self.index.get(connection.source_id)
+            target = self.index.get(connection.target_id)
+            if source is None or target is None:
+                continue  # connexion orpheline : ignorée
+            if source == target:
+                self.self_loops.add(source)
+            self.successors[source].append(target)
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """
+        Composantes fortement connexes (Tarjan, itératif, O(V + E)).
+        Elles sont retournées en ordre topologique inverse, chacune triée
+        par position dans le diagramme.
+        """
+        count = len(self.node_ids)
+        successors = self.successors
+        order = [-1] * count
+        low = [0] * count
+        on_stack = [False] * count
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in range(count):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, 0)]
+            while work:
+                v, i = work[-1]
+                if i < len(successors[v]):
+                    work[-1] = (v, i + 1)
+                    w = successors[v][i]
+                    if order[w] == -1:
+                        order[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, 0))
+                    elif on_stack[w] and order[w] < low[v]:
+                        low[v] = order[w]
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+                if low[v] == order[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    component.sort()
+                    components.append(component)
+        return components
+
+    def topological_components(self) -> List[List[int]]:
+        """
+        Composantes dans un ordre d'évaluation (sources d'abord). Entre
+        composantes indépendantes, l'ordre du diagramme est conservé.
+        """
+        components = self.strongly_connected_components()
+        component_of = [0] * len(self.node_ids)
+        for c, component in enumerate(components):
+            for v in component:
+                component_of[v] = c
+
+        dependents: List[Set[int]] = [set() for _ in components]
+        indegree = [0] * len(components)
+        for v, targets in enumerate(self.successors):
+            cv = component_of[v]
+            for w in targets:
+                cw = component_of[w]
+                if cw != cv and cw not in dependents[cv]:
+                    dependents[cv].add(cw)
+                    indegree[cw] += 1
+
+        # Kahn, en priorisant la composante qui apparaît le plus tôt dans le diagramme
+        ready = [(components[c][0], c) for c in range(len(components)) if indegree[c] == 0]
+        heapq.heapify(ready)
+        ordered: List[List[int]] = []
+        while ready:
+            _, c = heapq.heappop(ready)
+            ordered.append(components[c])
+            for d in dependents[c]:
+                indegree[d] -= 1
+                if indegree[d] == 0:
+                    heapq.heappush(ready, (components[d][0], d))
+        return ordered
+
+    def is_cycle(self, component: List[int]) -> bool:
+        return len(component) > 1 or component[0] in self.self_loops
@@ -0,0 +1,209 @@
+from typing import Callable, Dict, Iterable, List, Mapping, Set, Tuple
+
+from domain.models.equations import Expr, Const, Var, Not, And, Or
+from domain.services.equation_formatter import flatten
+
+Env = Mapping[str, bool]
+
+
+def evaluate(expr: Expr, env: Env) -> bool:
+    """
+    Évaluation naïve par parcours de l'arbre (référence pour les tests et benchmarks).
+    Parcours itératif en post-ordre : la profondeur de l'arbre n'est pas limitée
+    par la pile Python, et un sous-arbre partagé n'est évalué qu'une fois.
+    """
+    values: Dict[Expr, bool] = {}
+    stack = [expr]
+    while stack:
+        node = stack[-1]
+        if node in values:
+            stack.pop()
+        elif isinstance(node, Var):
+            values[node] = bool(env.get(node.name, False))
+            stack.pop()
+        elif isinstance(node, Const):
+            values[node] = node.value
+            stack.pop()
+        elif isinstance(node, Not):
+            child = values.get(node.expr)
+            if child is None:
+                stack.append(node.expr)
+            else:
+                values[node] = not child
+                stack.pop()
+        elif isinstance(node, (And, Or)):
+            operands = flatten(node)
+            pending = [operand for operand in operands if operand not in values]
+            if pending:
+                stack.extend(pending)
+            else:
+                combine = all if isinstance(node, And) else any
+                values[node] = combine(values[operand] for operand in operands)
+                stack.pop()
+        else:
+            raise TypeError(f"Expression inconnue : {node!r}")
+    return values[expr]
+
+
+def variables_of(expr: Expr) -> List[str]:
+    """Noms des variables dans l'ordre de première apparition."""
+    seen: Dict[str, None] = {}
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Var):
+            seen.setdefault(node.name, None)
+        elif isinstance(node, Not):
+            stack.append(node.expr)
+        elif isinstance(node, (And, Or)):
+            stack.append(node.right)
+            stack.append(node.left)
+    return list(seen)
+
+
+class CompiledEquations:
+    """
+    Ensemble d'équations compilées en une seule fonction Python.
+    Un appel évalue toutes les équations sur une même affectation de variables.
+    """
+
+    def __init__(self, names: Tuple[str, ...], variables: Tuple[str, ...], function: Callable[[Env], Dict[str, bool]]):
+        self.names = names
+        self.variables = variables
+        self._function = function
+
+    def __call__(self, env: Env) -> Dict[str, bool]:
+        return self._function(env)
+
+
+class EquationCompiler:
+    """
+    Compile des arbres Expr en fonctions Python générées.
+
+    Chaque variable est lue une seule fois dans l'affectation, puis les
+    opérateurs sont traduits en and / or / not natifs, ce qui conserve
+    l'évaluation en court-circuit. Les chaînes associatives (A & B & C…)
+    sont aplaties pour éviter une imbrication profonde de parenthèses.
+
+    Les sous-arbres sont internés : un sous-arbre utilisé plusieurs fois
+    (dans une équation ou entre équations) est affecté à une variable locale
+    sN, calculée une seule fois avant les résultats. Ces locales sont
+    évaluées sans court-circuit.
+    """
+
+    def compile(self, expr: Expr) -> Callable[[Env], bool]:
+        compiled = self.compile_many({"result": expr})
+
+        def run(env: Env) -> bool:
+            return compiled(env)["result"]
+
+        return run
+
+    def compile_many(self, equations: Mapping[str, Expr]) -> CompiledEquations:
+        slots: Dict[str, str] = {}
+        memo: Dict[Expr, str] = {}
+        shared = self._shared_subtrees(equations.values())
+        locals_: List[Tuple[str, str]] = []
+        bodies: List[Tuple[str, str]] = []
+        try:
+            for name, expr in equations.items():
+                bodies.append((name, self._emit(expr, slots, memo, shared, locals_)))
+        except RecursionError:
+            # arbre construit hors du parseur (profondeur non bornée) : slots est incomplet
+            variables = {name: None for expr in equations.values() for name in variables_of(expr)}
+            return self._fallback(equations, tuple(variables))
+
+        lines = ["def _evaluate(env):", "    get = env.get"]
+        for var_name, slot in slots.items():
+            lines.append(f"    {slot} = get({var_name!r}, False)")
+        # post-ordre d'émission : chaque locale ne dépend que des précédentes
+        for local, text in locals_:
+            lines.append(f"    {local} = {text}")
+        lines.append("    return {")
+        for name, body in bodies:
+            lines.append(f"        {name!r}: True if {body} else False,")
+        lines.append("    }")
+
+        namespace: Dict[str, object] = {}
+        try:
+            code = compile("\n".join(lines), "<equations>", "exec")
+        except (SyntaxError, RecursionError, MemoryError):
+            # Expressions trop profondes pour le compilateur Python :
+            # on se rabat sur le parcours d'arbre.
+            return self._fallback(equations, tuple(slots))
+        exec(code, namespace)
+        return CompiledEquations(tuple(equations), tuple(slots), namespace["_evaluate"])
+
+    def _emit(
+        self,
+        expr: Expr,
+        slots: Dict[str, str],
+        memo: Dict[Expr, str],
+        shared: Set[Expr],
+        locals_: List[Tuple[str, str]],
+    ) -> str:
+        text = memo.get(expr)
+        if text is not None:
+            return text
+        if isinstance(expr, Var):
+            text = slots.get(expr.name)
+            if text is None:
+                text = slots[expr.name] = f"v{len(slots)}"
+        elif isinstance(expr, Const):
+            text = "True" if expr.value else "False"
+        elif isinstance(expr, Not):
+            text = f"(not {self._emit(expr.expr, slots, memo, shared, locals_)})"
+        elif isinstance(expr, (And, Or)):
+            keyword = " and " if isinstance(expr, And) else " or "
+            operands = [self._emit(operand, slots, memo, shared, locals_) for operand in self._operands(expr, shared)]
+            text = "(" + keyword.join(operands) + ")"
+        else:
+            raise TypeError(f"Expression inconnue : {expr!r}")
+        if expr in shared:
+            local = f"s{len(locals_)}"
+            locals_.append((local, text))
+            text = local
+        memo[expr] = text
+        return text
+
+    @staticmethod
+    def _shared_subtrees(exprs: Iterable[Expr]) -> Set[Expr]:
+        """Noeuds Not / And / Or référencés plus d'une fois dans le graphe des équations."""
+        uses: Dict[Expr, int] = {}
+        stack = list(exprs)
+        while stack:
+            node = stack.pop()
+            count = uses.get(node, 0)
+            uses[node] = count + 1
+            if count:
+                continue  # enfants déjà comptés lors de la première visite
+            if isinstance(node, Not):
+                stack.append(node.expr)
+            elif isinstance(node, (And, Or)):
+                stack.append(node.right)
+                stack.append(node.left)
+        return {node for node, count in uses.items() if count > 1 and isinstance(node, (Not, And, Or))}
+
+    @staticmethod
+    def _operands(expr: Expr, shared: Set[Expr]) -> List[Expr]:
+        """Comme flatten(), mais un maillon partagé de la chaîne reste un opérande (il a sa locale)."""
+        kind = type(expr)
+        operands: List[Expr] = []
+        stack = [expr.right, expr.left]
+        while stack:
+            node = stack.pop()
+            if type(node) is kind and node not in shared:
+                stack.append(node.right)
+                stack.append(node.left)
+            else:
+                operands.append(node)
+        return operands
+
+    @staticmethod
+    def _fallback(equations: Mapping[str, Expr], variables: Tuple[str, ...]) -> CompiledEquations:
+        items = list(equations.items())
+
+        def run(env: Env) -> Dict[str, bool]:
+            return {name: evaluate(expr, env) for name, expr in items}
+
+        return CompiledEquations(tuple(equations), variables, run)
@@ -0,0 +1,59 @@
+from typing import Dict, List
+
+from domain.models.equations import Expr, Const, Var, Not, And, Or
+
+# Précédences alignées sur EquationParser : | < & < ! / atomes
+_PRECEDENCE = {Or: 1, And: 2}
+_ATOM_PRECEDENCE = 3
+
+
+class EquationFormatter:
+    """
+    Réécrit un arbre Expr en texte relisible par EquationParser,
+    avec le minimum de parenthèses : A & B | !C, !(A | B)…
+    """
+
+    def format(self, expr: Expr) -> str:
+        return self._format(expr, {})
+
+    def _format(self, expr: Expr, memo: Dict[Expr, str]) -> str:
+        text = memo.get(expr)
+        if text is not None:
+            return text
+        if isinstance(expr, Var):
+            text = expr.name
+        elif isinstance(expr, Const):
+            text = "1" if expr.value else "0"
+        elif isinstance(expr, Not):
+            text = "!" + self._wrap(expr.expr, _ATOM_PRECEDENCE, memo)
+        elif isinstance(expr, (And, Or)):
+            precedence = _PRECEDENCE[type(expr)]
+            separator = " & " if isinstance(expr, And) else " | "
+            text = separator.join(self._wrap(operand, precedence + 1, memo) for operand in flatten(expr))
+        else:
+            raise TypeError(f"Expression inconnue : {expr!r}")
+        memo[expr] = text
+        return text
+
+    def _wrap(self, expr: Expr, min_precedence: int, memo: Dict[Expr, str]) -> str:
+        text = self._format(expr, memo)
+        if _PRECEDENCE.get(type(expr), _ATOM_PRECEDENCE) < min_precedence:
+            return f"({text})"
+        return text
+
+
+def flatten(expr: Expr) -> List[Expr]:
+    """Opérandes d'une chaîne associative de même opérateur : (A & B) & C -> [A, B, C]."""
+    kind = type(expr)
+    if kind not in _PRECEDENCE:
+        return [expr]
+    operands: List[Expr] = []
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if type(node) is kind:
+            stack.append(node.right)
+            stack.append(node.left)
+        else:
+            operands.append(node)
+    return operands
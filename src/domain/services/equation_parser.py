@@ -1,5 +1,6 @@
-from typing import Tuple, List
-from domain.models.equations import Expr, Var, Not, And, Or, EquationError
+from typing import List, NamedTuple
+from domain.models.equations import Expr, Const, Var, Not, And, Or, EquationError, chain
+from domain.services.lru_cache import LruCache
 
 
 class EquationSyntaxError(Exception):
@@ -8,21 +9,162 @@ class EquationSyntaxError(Exception):
         self.position = position
 
 
+class Token(NamedTuple):
+    kind: str  # "ident", "const", "op", "(", ")" ou "end"
+    value: str
+    position: int
+
+
+# Précédence des opérateurs binaires (plus grand = plus prioritaire)
+BINARY_PRECEDENCE = {"|": 1, "&": 2}
+
+_OPERATORS = {"&": And, "|": Or}
+
+# Imbrication maximale de "!" et de parenthèses : l'analyse est récursive
+# (environ trois appels par niveau), au-delà la pile Python déborderait
+MAX_NESTING = 200
+
+
+def tokenize(text: str) -> List[Token]:
+    tokens: List[Token] = []
+    i = 0
+    length = len(text)
+    while i < length:
+        ch = text[i]
+        if ch.isspace():
+            i += 1
+        elif ch in "!&|":
+            tokens.append(Token("op", ch, i))
+            i += 1
+        elif ch in "()":
+            tokens.append(Token(ch, ch, i))
+            i += 1
+        elif ch.isalpha() or ch == "_":
+            start = i
+            while i < length and (text[i].isalnum() or text[i] in "_."):
+                i += 1
+            tokens.append(Token("ident", text[start:i], start))
+        elif ch.isdigit():
+            start = i
+            while i < length and (text[i].isalnum() or text[i] in "_."):
+                i += 1
+            literal = text[start:i]
+            if literal not in ("0", "1"):
+                raise EquationSyntaxError(f"Constante invalide '{literal}' (0 ou 1 attendu)", position=start)
+            tokens.append(Token("const", literal, start))
+        else:
+            raise EquationSyntaxError(f"Caractère inattendu '{ch}'", position=i)
+    tokens.append(Token("end", "", length))
+    return tokens
+
+
+class _Parser:
+    """Analyse par précédence (precedence climbing) d'une liste de tokens."""
+
+    def __init__(self, tokens: List[Token]):
+        self._tokens = tokens
+        self._index = 0
+        self._depth = 0
+
+    def _peek(self) -> Token:
+        return self._tokens[self._index]
+
+    def _advance(self) -> Token:
+        token = self._tokens[self._index]
+        self._index += 1
+        return token
+
+    def parse(self) -> Expr:
+        expr = self._parse_binary(1)
+        token = self._peek()
+        if token.kind != "end":
+            raise EquationSyntaxError(f"Symbole inattendu '{token.value}'", position=token.position)
+        return expr
+
+    def _parse_binary(self, min_precedence: int) -> Expr:
+        # les suites d'un même opérateur (A & B & C...) sont regroupées puis
+        # construites en arbre équilibré : pas d'arbre de profondeur n
+        operands = [self._parse_unary()]
+        operator = None
+        while True:
+            token = self._peek()
+            precedence = BINARY_PRECEDENCE.get(token.value) if token.kind == "op" else None
+            if precedence is None or precedence < min_precedence:
+                break
+            self._advance()
+            right = self._parse_binary(precedence + 1)
+            if token.value != operator:
+                if operator is not None:
+                    operands = [chain(_OPERATORS[operator], operands)]
+                operator = token.value
+            operands.append(right)
+        return chain(_OPERATORS[operator], operands) if operator is not None else operands[0]
+
+    def _parse_unary(self) -> Expr:
+        token = self._advance()
+        if token.kind == "op" and token.value == "!":
+            self._enter(token)
+            expr = Not(self._parse_unary())
+            self._depth -= 1
+            return expr
+        if token.kind == "ident":
+            return Var(name=token.value)
+        if token.kind == "const":
+            return Const(token.value == "1")
+        if token.kind == "(":
+            self._enter(token)
+            expr = self._parse_binary(1)
+            closing = self._advance()
+            if closing.kind != ")":
+                raise EquationSyntaxError("Parenthèse fermante attendue", position=closing.position)
+            self._depth -= 1
+            return expr
+        if token.kind == "end":
+            raise EquationSyntaxError("Fin d'équation inattendue", position=token.position)
+        raise EquationSyntaxError(f"Symbole inattendu '{token.value}'", position=token.position)
+
+    def _enter(self, token: Token) -> None:
+        self._depth += 1
+        if self._depth > MAX_NESTING:
+            raise EquationSyntaxError(
+                f"Équation trop imbriquée (plus de {MAX_NESTING} niveaux de '!' ou de parenthèses)",
+                position=token.position,
+            )
+
+
 class EquationParser:
     """
-    Parser très simple pour des équations du type :
+    Parser pour des équations du type :
     A & B | !C
-    avec opérateurs : !, &, |, parenthèses.
+    avec opérateurs : ! (prioritaire), puis &, puis |, parenthèses
+    et constantes 0 / 1.
+
+    Les équations déjà analysées sont conservées dans un cache LRU indexé
+    par le texte normalisé (espaces superflus retirés). Les arbres produits
+    sont internés : une même sous-expression est un objet unique.
     """
 
+    def __init__(self, cache_size: int = 4096):
+        self._cache: LruCache[Expr] = LruCache(cache_size)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.split())
+
     def parse(self, text: str) -> Expr:
-        # TODO: implémenter un parser réel (shunting-yard ou recursive descent)
-        # Ici on met juste un stub pour la structure :
-        text = text.strip()
-        if not text:
+        key = self.normalize(text)
+        if not key:
             raise EquationSyntaxError("Équation vide", position=0)
-        # Exemple minimal : expression = une variable unique
-        return Var(name=text)
+        expr = self._cache.get(key)
+        if expr is None:
+            # On analyse le texte d'origine pour que les positions d'erreur
+            # correspondent à ce que l'utilisateur a saisi.
+            expr = _Parser(tokenize(text)).parse()
+            self._cache.put(key, expr)
+        return expr
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
 
     def validate(self, text: str) -> List[EquationError]:
         try:
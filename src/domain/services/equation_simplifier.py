@@ -0,0 +1,218 @@
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from domain.models.equations import Expr, Const, Var, Not, And, Or, chain
+from domain.services.equation_compiler import EquationCompiler, variables_of
+from domain.services.equation_formatter import flatten
+from domain.services.lru_cache import LruCache
+
+TRUE = Const(True)
+FALSE = Const(False)
+
+# Implicant de Quine–McCluskey : (valeurs des bits, masque des bits indifférents)
+Implicant = Tuple[int, int]
+
+
+class EquationSimplifier:
+    """
+    Simplification et mise sous forme canonique des équations.
+
+    1. Passage algébrique : négations poussées jusqu'aux variables (De Morgan,
+       double négation), propagation des constantes, idempotence,
+       complément (A & !A = 0) et absorption (A | A & B = A). Les opérandes
+       sont triés pour qu'une même équation donne toujours le même texte.
+    2. Pour au plus max_exact_variables variables, minimisation exacte des
+       impliquants premiers (Quine–McCluskey) avec couverture gloutonne ;
+       la forme retenue est celle qui compte le moins de littéraux.
+
+    Les résultats sont mis en cache par expression (les arbres sont internés).
+    """
+
+    def __init__(self, max_exact_variables: int = 8, cache_size: int = 4096):
+        self.max_exact_variables = max_exact_variables
+        self._cache: LruCache[Expr] = LruCache(cache_size)
+        self._compiler = EquationCompiler()
+
+    def simplify(self, expr: Expr) -> Expr:
+        result = self._cache.get(expr)
+        if result is None:
+            result = self._simplify(expr)
+            self._cache.put(expr, result)
+        return result
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def _simplify(self, expr: Expr) -> Expr:
+        algebraic = self._nnf(expr, False, {})
+        variables = sorted(variables_of(algebraic))
+        if not variables or len(variables) > self.max_exact_variables:
+            return algebraic
+        minimized = self._minimize(algebraic, variables)
+        if literal_count(minimized) < literal_count(algebraic):
+            return minimized
+        return algebraic
+
+    # -- Passage algébrique --
+
+    def _nnf(self, expr: Expr, negate: bool, memo: Dict[Tuple[Expr, bool], Expr]) -> Expr:
+        key = (expr, negate)
+        result = memo.get(key)
+        if result is not None:
+            return result
+        if isinstance(expr, Var):
+            result = Not(expr) if negate else expr
+        elif isinstance(expr, Const):
+            result = Const(expr.value != negate)
+        elif isinstance(expr, Not):
+            result = self._nnf(expr.expr, not negate, memo)
+        elif isinstance(expr, (And, Or)):
+            # De Morgan : !(A & B) = !A | !B
+            conjunction = isinstance(expr, And) != negate
+            operands = [self._nnf(operand, negate, memo) for operand in flatten(expr)]
+            result = combine(conjunction, operands)
+        else:
+            raise TypeError(f"Expression inconnue : {expr!r}")
+        memo[key] = result
+        return result
+
+    # -- Minimisation exacte --
+
+    def _minimize(self, expr: Expr, variables: List[str]) -> Expr:
+        count = len(variables)
+        function = self._compiler.compile(expr)
+        minterms = [
+            row
+            for row in range(1 << count)
+            if function({name: bool(row >> (count - 1 - i) & 1) for i, name in enumerate(variables)})
+        ]
+        if not minterms:
+            return FALSE
+        if len(minterms) == 1 << count:
+            return TRUE
+        primes = prime_implicants(minterms, count)
+        cover = select_cover(primes, minterms)
+        terms = [implicant_to_expr(implicant, variables) for implicant in cover]
+        return combine(False, terms)
+
+
+def combine(conjunction: bool, operands: Sequence[Expr]) -> Expr:
+    """
+    Construit And (conjunction=True) ou Or de plusieurs opérandes déjà
+    normalisés, en appliquant constantes, idempotence, complément et absorption.
+    """
+    kind = And if conjunction else Or
+    dual = Or if conjunction else And
+    identity, absorbing = (TRUE, FALSE) if conjunction else (FALSE, TRUE)
+
+    flat: Dict[Expr, None] = {}
+    for operand in operands:
+        for item in flatten(operand) if type(operand) is kind else (operand,):
+            if item is absorbing:
+                return absorbing
+            if item is not identity:
+                flat[item] = None
+
+    for item in flat:
+        if isinstance(item, Not) and item.expr in flat:
+            return absorbing
+
+    # absorption : A & (A | B) = A, (A | B) & (A | B | C) = A | B
+    terms = [(item, frozenset(flatten(item)) if type(item) is dual else frozenset((item,))) for item in flat]
+    kept = [
+        item
+        for item, parts in terms
+        if not any(other is not item and other_parts < parts for other, other_parts in terms)
+    ]
+
+    if not kept:
+        return identity
+    kept.sort(key=_sort_key)
+    return chain(kind, kept)
+
+
+def literal_count(expr: Expr) -> int:
+    if isinstance(expr, Var):
+        return 1
+    if isinstance(expr, Not):
+        return literal_count(expr.expr)
+    if isinstance(expr, (And, Or)):
+        return sum(literal_count(operand) for operand in flatten(expr))
+    return 0
+
+
+def _sort_key(expr: Expr) -> Tuple[int, str]:
+    # littéraux d'abord (par nom de variable), puis les termes composés
+    if isinstance(expr, Var):
+        return 0, expr.name
+    if isinstance(expr, Not) and isinstance(expr.expr, Var):
+        return 0, expr.expr.name + "\x00"
+    return 1, repr(expr)
+
+
+def prime_implicants(minterms: Sequence[int], count: int) -> List[Implicant]:
+    current: Set[Implicant] = {(m, 0) for m in minterms}
+    primes: Set[Implicant] = set()
+    while current:
+        merged: Set[Implicant] = set()
+        used: Set[Implicant] = set()
+        by_mask: Dict[int, List[Implicant]] = {}
+        for implicant in current:
+            by_mask.setdefault(implicant[1], []).append(implicant)
+        for mask, group in by_mask.items():
+            values = {value for value, _ in group}
+            for value in values:
+                for bit in range(count):
+                    flag = 1 << bit
+                    if mask & flag or value & flag:
+                        continue
+                    partner = value | flag
+                    if partner in values:
+                        merged.add((value, mask | flag))
+                        used.add((value, mask))
+                        used.add((partner, mask))
+        primes.update(current - used)
+        current = merged
+    return sorted(primes)
+
+
+def covers(implicant: Implicant, minterm: int) -> bool:
+    value, mask = implicant
+    return (minterm & ~mask) == value
+
+
+def select_cover(primes: Sequence[Implicant], minterms: Sequence[int]) -> List[Implicant]:
+    """Impliquants essentiels, puis choix glouton (plus de mintermes couverts, moins de littéraux)."""
+    remaining: Set[int] = set(minterms)
+    coverage: Dict[Implicant, FrozenSet[int]] = {p: frozenset(m for m in minterms if covers(p, m)) for p in primes}
+    chosen: List[Implicant] = []
+
+    for minterm in minterms:
+        candidates = [p for p in primes if minterm in coverage[p]]
+        if len(candidates) == 1 and candidates[0] not in chosen:
+            chosen.append(candidates[0])
+            remaining -= coverage[candidates[0]]
+
+    while remaining:
+        best: Optional[Implicant] = None
+        best_score = (0, 0)
+        for prime in primes:
+            gain = len(coverage[prime] & remaining)
+            score = (gain, bin(prime[1]).count("1"))
+            if gain and score > best_score:
+                best, best_score = prime, score
+        assert best is not None
+        chosen.append(best)
+        remaining -= coverage[best]
+    return chosen
+
+
+def implicant_to_expr(implicant: Implicant, variables: Sequence[str]) -> Expr:
+    value, mask = implicant
+    count = len(variables)
+    literals: List[Expr] = []
+    for i, name in enumerate(variables):
+        flag = 1 << (count - 1 - i)
+        if mask & flag:
+            continue
+        literals.append(Var(name) if value & flag else Not(Var(name)))
+    return combine(True, literals)
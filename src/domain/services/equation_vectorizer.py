@@ -0,0 +1,120 @@
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from domain.models.equations import Expr, Const, Var, Not, And, Or
+from domain.models.project import Project
+from domain.services.equation_compiler import variables_of
+from domain.services.equation_formatter import flatten
+from domain.services.project_service import ProjectService
+from domain.services.optional_numpy import np, require_numpy
+
+
+class VectorizedEvaluator:
+    """
+    Évalue des équations sur des colonnes booléennes NumPy.
+
+    Chaque Var est associée à une colonne (une valeur par échantillon), et
+    And / Or / Not deviennent des opérations sur tableaux : aucune boucle
+    Python par ligne. Une variable absente des colonnes vaut False.
+    """
+
+    MAX_TRUTH_TABLE_VARIABLES = 22
+
+    def __init__(self):
+        require_numpy("l'évaluation vectorisée")
+
+    def evaluate(self, expr: Expr, columns: Mapping[str, "np.ndarray"], length: Optional[int] = None) -> "np.ndarray":
+        length = self._length(columns, length)
+        return self._eval(expr, columns, length, {})
+
+    def evaluate_many(
+        self,
+        equations: Mapping[str, Expr],
+        columns: Mapping[str, "np.ndarray"],
+        length: Optional[int] = None,
+    ) -> Tuple[List[str], "np.ndarray"]:
+        """
+        Retourne (noms, matrice) où matrice[t, j] est la valeur de l'équation
+        j à l'échantillon t.
+        """
+        length = self._length(columns, length)
+        names = list(equations)
+        # ordre Fortran : chaque colonne de résultat est contiguë
+        matrix = np.empty((length, len(names)), dtype=bool, order="F")
+        memo: Dict[Expr, "np.ndarray"] = {}
+        for j, name in enumerate(names):
+            matrix[:, j] = self._eval(equations[name], columns, length, memo)
+        return names, matrix
+
+    def evaluate_project(
+        self,
+        project: Project,
+        columns: Mapping[str, "np.ndarray"],
+        length: Optional[int] = None,
+    ) -> Tuple[List[str], "np.ndarray"]:
+        """Évalue toutes les équations valides du projet ; les noms retournés sont des ids de noeuds."""
+        return self.evaluate_many(ProjectService().parse_equations(project), columns, length)
+
+    def truth_table(
+        self,
+        expr: Expr,
+        variables: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[str], "np.ndarray", "np.ndarray"]:
+        """
+        Table de vérité complète : (variables, entrées de forme (2**n, n), sorties de forme (2**n,)).
+        La première variable est le bit de poids fort.
+        """
+        names = list(variables) if variables is not None else variables_of(expr)
+        count = len(names)
+        if count > self.MAX_TRUTH_TABLE_VARIABLES:
+            raise ValueError(
+                f"Table de vérité limitée à {self.MAX_TRUTH_TABLE_VARIABLES} variables ({count} demandées)"
+            )
+        rows = np.arange(1 << count, dtype=np.uint32)
+        # une colonne booléenne par variable : pas d'intermédiaire (2**n, n) en uint32
+        inputs = np.empty((len(rows), count), dtype=bool, order="F")
+        for i in range(count):
+            np.not_equal(rows & (1 << (count - 1 - i)), 0, out=inputs[:, i])
+        columns = {name: inputs[:, i] for i, name in enumerate(names)}
+        outputs = self._eval(expr, columns, len(rows), {})
+        return names, inputs, outputs
+
+    @staticmethod
+    def _length(columns: Mapping[str, "np.ndarray"], length: Optional[int]) -> int:
+        if length is not None:
+            return length
+        for column in columns.values():
+            return len(column)
+        raise ValueError("Impossible de déterminer le nombre d'échantillons : aucune colonne fournie")
+
+    def _eval(self, expr: Expr, columns: Mapping[str, "np.ndarray"], length: int, memo: Dict[Expr, "np.ndarray"]) -> "np.ndarray":
+        cached = memo.get(expr)
+        if cached is not None:
+            return cached
+        if isinstance(expr, Var):
+            column = columns.get(expr.name)
+            if column is None:
+                result = np.zeros(length, dtype=bool)
+            else:
+                result = np.asarray(column, dtype=bool)
+                if result.shape != (length,):
+                    raise ValueError(f"Colonne '{expr.name}' de taille {result.shape}, attendu ({length},)")
+        elif isinstance(expr, Const):
+            result = np.full(length, expr.value, dtype=bool)
+        elif isinstance(expr, Not):
+            result = np.logical_not(self._eval(expr.expr, columns, length, memo))
+        elif isinstance(expr, (And, Or)):
+            # une chaîne A & B & C est combinée d'un bloc, sans descendre dans chaque noeud binaire
+            combine = np.logical_and if isinstance(expr, And) else np.logical_or
+            operands = flatten(expr)
+            result = combine(
+                self._eval(operands[0], columns, length, memo),
+                self._eval(operands[1], columns, length, memo),
+            )
+            for operand in operands[2:]:
+                combine(result, self._eval(operand, columns, length, memo), out=result)
+        else:
+            raise TypeError(f"Expression inconnue : {expr!r}")
+        # les sous-arbres sont internés : une sous-expression commune à
+        # plusieurs équations n'est calculée qu'une fois
+        memo[expr] = result
+        return result
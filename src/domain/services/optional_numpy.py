@@ -0,0 +1,19 @@
+"""
+NumPy est une dépendance optionnelle (extra "analysis") : les modules qui
+l'utilisent importent np d'ici (None si NumPy n'est pas installé) et
+appellent require_numpy() avant de s'en servir.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def require_numpy(purpose: str) -> None:
+    """Lève ImportError si NumPy manque ; purpose complète « NumPy est requis pour ... »."""
+    if np is None:
+        raise ImportError(
+            f"NumPy est requis pour {purpose} "
+            "(installer l'extra 'analysis' : pip install modeltodeps[analysis])"
+        )
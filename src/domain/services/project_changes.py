@@ -0,0 +1,44 @@
+from typing import Optional
+
+from domain.models.project import Project
+from domain.models.diagram import Diagram
+from domain.models.project_change import ChangeKind, ProjectChange
+
+
+def apply_change(project: Project, change: ProjectChange) -> bool:
+    """
+    Rejoue une modification sur le projet. Retourne False si elle ne
+    s'applique pas (étape ou noeud introuvable, ajout déjà présent).
+    """
+    step = project.steps.get(change.step_id)
+    if step is None:
+        return False
+    diagram = _find_diagram(step.diagrams, change.diagram_id)
+
+    if change.kind in (ChangeKind.NODE_ADDED, ChangeKind.CONNECTION_ADDED):
+        if diagram is None:
+            diagram = Diagram(id=change.diagram_id, name=change.diagram_name, diagram_type=change.diagram_type)
+            step.diagrams.append(diagram)
+        if change.kind == ChangeKind.NODE_ADDED:
+            if change.node is None or any(n.id == change.node.id for n in diagram.nodes):
+                return False
+            diagram.nodes.append(change.node)
+        else:
+            if change.connection is None or any(c.id == change.connection.id for c in diagram.connections):
+                return False
+            diagram.connections.append(change.connection)
+        return True
+
+    if diagram is None:
+        return False
+    node = next((n for n in diagram.nodes if n.id == change.node_id), None)
+    if node is None:
+        return False
+    if change.kind == ChangeKind.NODE_MOVED:
+        node.x = change.x
+        node.y = change.y
+    return True
+
+
+def _find_diagram(diagrams, diagram_id: str) -> Optional[Diagram]:
+    return next((d for d in diagrams if d.id == diagram_id), None)
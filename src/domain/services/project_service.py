@@ -1,7 +1,8 @@
-from typing import List
+from typing import Dict, List
+from domain.models.equations import Expr
 from domain.models.project import Project
 from domain.models.validation import ValidationIssue, Severity
-from domain.services.equation_parser import EquationParser
+from domain.services.equation_parser import EquationParser, EquationSyntaxError
 
 
 class ProjectService:
@@ -36,3 +37,21 @@ class ProjectService:
                             ))
 
         return issues
+
+    def parse_equations(self, project: Project) -> Dict[str, Expr]:
+        """
+        Retourne les équations valides du projet, indexées par id de noeud.
+        Les équations invalides sont ignorées (elles sont signalées par validate_project).
+        """
+        equations: Dict[str, Expr] = {}
+        for step in project.steps.values():
+            for diagram in step.diagrams:
+                for node in diagram.nodes:
+                    eq = node.properties.get("equation")
+                    if not eq:
+                        continue
+                    try:
+                        equations[node.id] = self._parser.parse(eq)
+                    except EquationSyntaxError:
+                        continue
+        return equations
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Union
+
+from domain.models.project import Project, StepData
+from domain.models.diagram import Diagram, LazyDiagram
+from domain.services.deps_generator import PackedDiagram, pack_diagram, unpack_diagram
+
+# Diagramme figé : forme compacte (tuples) ou LazyDiagram pas encore chargé
+FrozenDiagram = Union[PackedDiagram, LazyDiagram]
+
+
+@dataclass(frozen=True)
+class FrozenStep:
+    key: str
+    id: str
+    name: str
+    description: str
+    settings: Tuple[Tuple[str, str], ...]
+    diagrams: Tuple[FrozenDiagram, ...]
+
+
+@dataclass(frozen=True)
+class ProjectSnapshot:
+    """
+    Copie figée d'un Project à un instant donné, pour l'enregistrer ou
+    l'exporter dans un autre thread pendant que l'utilisateur continue à
+    le modifier.
+
+    capture() ne fait que recopier les valeurs dans des tuples (rapide, à
+    appeler dans le thread de l'interface) ; to_project() reconstruit les
+    objets du modèle (à appeler dans le thread de travail). Les diagrammes
+    paresseux jamais ouverts ne sont pas chargés : le snapshot en garde une
+    copie qui relit le même bloc sur disque.
+    """
+
+    id: str
+    name: str
+    description: str
+    version: str
+    steps: Tuple[FrozenStep, ...]
+
+    @staticmethod
+    def capture(project: Project) -> "ProjectSnapshot":
+        return ProjectSnapshot(
+            id=project.id,
+            name=project.name,
+            description=project.description,
+            version=project.version,
+            steps=tuple(
+                FrozenStep(
+                    key=key,
+                    id=step.id,
+                    name=step.name,
+                    description=step.description,
+                    settings=tuple(step.settings.items()),
+                    diagrams=tuple(_freeze(d) for d in step.diagrams),
+                )
+                for key, step in project.steps.items()
+            ),
+        )
+
+    def to_project(self) -> Project:
+        steps: Dict[str, StepData] = {}
+        for step in self.steps:
+            diagrams: List[Diagram] = [_thaw(d) for d in step.diagrams]
+            steps[step.key] = StepData(
+                id=step.id,
+                name=step.name,
+                description=step.description,
+                settings=dict(step.settings),
+                diagrams=diagrams,
+            )
+        return Project(
+            id=self.id,
+            name=self.name,
+            description=self.description,
+            version=self.version,
+            steps=steps,
+        )
+
+
+def _freeze(diagram: Diagram) -> FrozenDiagram:
+    if isinstance(diagram, LazyDiagram) and not diagram.is_loaded:
+        # nouvelle instance sur le même chargeur : charger l'original ne touche pas le snapshot
+        return LazyDiagram(diagram.id, diagram.name, diagram.diagram_type, diagram.loader, diagram.node_count)
+    return pack_diagram(diagram)
+
+
+def _thaw(frozen: FrozenDiagram) -> Diagram:
+    if isinstance(frozen, LazyDiagram):
+        return frozen
+    return unpack_diagram(frozen)
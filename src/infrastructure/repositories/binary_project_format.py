@@ -0,0 +1,729 @@
+"""
+Format binaire des projets (.depsbin).
+
+Structure du fichier (entiers little-endian) :
+
+    en-tête fixe (32 octets)
+        magic "DEPSBIN\\0", u16 version, u16 flags, u32 réservé,
+        u64 offset de l'index, u64 taille de l'index
+    un bloc par diagramme (compressé par zlib si FLAG_COMPRESSED), chacun
+        commençant à un offset multiple de 8
+    index : JSON utf-8 (compressé de la même façon) décrivant le projet,
+        les étapes et, pour chaque diagramme, l'offset et la taille de son bloc
+
+Bloc d'un diagramme :
+
+    u32[8]   n_strings, blob_len, n_nodes, n_props, n_conns, n_styles, flags, 0
+    u32      offsets des chaînes dans blob (n_strings + 1)
+    u32      node_ids, node_types, node_labels, node_styles, node_prop_counts (n_nodes chacun)
+    u32      styles (n_styles x 5 : shape, border, fill, stroke, text)
+    u32      props (n_props x 2 : clé, valeur)
+    u32      conn_ids, conn_sources, conn_targets, conn_labels, conn_types (n_conns chacun)
+    (bourrage jusqu'à un multiple de 8)
+    f64      xs, ys (n_nodes chacun)
+    blob     chaînes utf-8 concaténées
+
+Toutes les chaînes (ids, libellés, couleurs, valeurs d'énumérations) passent
+par la table du bloc : une chaîne répétée n'est stockée qu'une fois. Un
+diagramme est décodable indépendamment des autres à partir de l'index.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from domain.models.project import Project, StepData
+from domain.models.diagram import (
+    Diagram,
+    LazyDiagram,
+    Node,
+    Connection,
+    DiagramType,
+    NodeType,
+    NodeAppearance,
+    NodeShape,
+    BorderStyle,
+    ConnectionType,
+)
+from domain.models.diagram_store import DiagramStore
+from infrastructure.storage.json_stream import ProgressCallback
+
+MAGIC = b"DEPSBIN\x00"
+VERSION = 1
+FLAG_COMPRESSED = 0x1
+HEADER = struct.Struct("<8sHHIQQ")
+
+BLOCK_COUNTS = struct.Struct("<8I")
+BLOCK_FLAG_NUL_SEPARATED = 0x1  # chaînes séparées par \0 : décodage en un seul split
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+@dataclass
+class DiagramEntry:
+    """Entrée d'index : en-tête d'un diagramme et emplacement de son bloc."""
+
+    id: str
+    name: str
+    diagram_type: str
+    offset: int
+    length: int
+    nodes: int = 0
+    connections: int = 0
+    hash: str = ""  # empreinte du bloc décompressé (blake2b), vide dans les fichiers plus anciens
+
+
+@dataclass
+class ProjectIndex:
+    version: int
+    flags: int
+    project: Dict[str, Any]
+    steps: List[Dict[str, Any]]  # chaque étape : id, name, description, settings, key, diagrams: List[DiagramEntry]
+
+    @property
+    def compressed(self) -> bool:
+        return bool(self.flags & FLAG_COMPRESSED)
+
+
+def _align(stream: BinaryIO, start: int) -> int:
+    """Bourrage jusqu'à un multiple de 8 : les colonnes f64 d'un bloc restent alignées dans le fichier."""
+    offset = stream.tell() - start
+    if offset % 8:
+        stream.write(b"\x00" * (8 - offset % 8))
+        offset += 8 - offset % 8
+    return offset
+
+
+def block_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def is_binary_project(head: bytes) -> bool:
+    return head.startswith(MAGIC)
+
+
+def index_digest(stream: BinaryIO) -> str:
+    """
+    Empreinte de l'en-tête et de l'index actifs : elle ne change qu'une fois
+    un enregistrement validé (réécriture de l'en-tête), pas quand un
+    enregistrement différentiel interrompu laisse des blocs en fin de fichier.
+    """
+    stream.seek(0)
+    head = stream.read(HEADER.size)
+    if len(head) < HEADER.size or not is_binary_project(head):
+        raise ValueError("Fichier projet binaire invalide (en-tête)")
+    index_offset, index_length = HEADER.unpack(head)[4:]
+    stream.seek(index_offset)
+    return block_hash(head + stream.read(index_length))
+
+
+class _StringTable:
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+
+    def __call__(self, value: str) -> int:
+        i = self.index.get(value)
+        if i is None:
+            i = self.index[value] = len(self.index)
+        return i
+
+
+def _u32(values=()) -> array:
+    return array("I", values)
+
+
+def _to_bytes(arr: array) -> bytes:
+    if _BIG_ENDIAN:
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_bytes(typecode: str, data) -> array:
+    arr = array(typecode)
+    arr.frombytes(data)
+    if _BIG_ENDIAN:
+        arr.byteswap()
+    return arr
+
+
+def encode_diagram(diagram: Diagram) -> bytes:
+    strings = _StringTable()
+    nodes = diagram.nodes
+    connections = diagram.connections
+
+    styles: Dict[Tuple[int, ...], int] = {}
+    # apparences partagées : une seule résolution par instance
+    style_of: Dict[int, int] = {}
+    node_ids = _u32(strings(n.id) for n in nodes)
+    node_types = _u32(strings(n.type.value) for n in nodes)
+    node_labels = _u32(strings(n.label) for n in nodes)
+    node_styles = _u32()
+    prop_counts = _u32()
+    props = _u32()
+    for node in nodes:
+        a = node.appearance
+        index = style_of.get(id(a))
+        if index is None:
+            style = (
+                strings(a.shape.value),
+                strings(a.border.value),
+                strings(a.fill_color),
+                strings(a.border_color),
+                strings(a.text_color),
+            )
+            index = style_of[id(a)] = styles.setdefault(style, len(styles))
+        node_styles.append(index)
+        prop_counts.append(len(node.properties))
+        for key, value in node.properties.items():
+            props.append(strings(key))
+            props.append(strings(value))
+    style_table = _u32(v for style in styles for v in style)
+
+    conn_ids = _u32(strings(c.id) for c in connections)
+    conn_sources = _u32(strings(c.source_id) for c in connections)
+    conn_targets = _u32(strings(c.target_id) for c in connections)
+    conn_labels = _u32(strings(c.label) for c in connections)
+    conn_types = _u32(strings(c.type.value) for c in connections)
+
+    table = list(strings.index)
+    flags = 0
+    if not any("\x00" in s for s in table):
+        flags |= BLOCK_FLAG_NUL_SEPARATED
+        blob = "\x00".join(table).encode("utf-8")
+        offsets = _u32([0])
+        position = 0
+        for s in table:
+            position += len(s.encode("utf-8")) + 1
+            offsets.append(position)
+    else:
+        encoded = [s.encode("utf-8") for s in table]
+        blob = b"".join(encoded)
+        offsets = _u32([0])
+        position = 0
+        for chunk in encoded:
+            position += len(chunk)
+            offsets.append(position)
+
+    parts = [
+        BLOCK_COUNTS.pack(len(table), len(blob), len(nodes), len(props) // 2, len(connections), len(styles), flags, 0),
+        _to_bytes(offsets),
+        _to_bytes(node_ids),
+        _to_bytes(node_types),
+        _to_bytes(node_labels),
+        _to_bytes(node_styles),
+        _to_bytes(prop_counts),
+        _to_bytes(style_table),
+        _to_bytes(props),
+        _to_bytes(conn_ids),
+        _to_bytes(conn_sources),
+        _to_bytes(conn_targets),
+        _to_bytes(conn_labels),
+        _to_bytes(conn_types),
+    ]
+    size = sum(len(p) for p in parts)
+    if size % 8:
+        parts.append(b"\x00" * (8 - size % 8))
+    parts.append(_to_bytes(array("d", (n.x for n in nodes))))
+    parts.append(_to_bytes(array("d", (n.y for n in nodes))))
+    parts.append(blob)
+    return b"".join(parts)
+
+
+@dataclass
+class BlockLayout:
+    """Positions (en octets) des tableaux d'un bloc non compressé."""
+
+    n_strings: int
+    blob_len: int
+    n_nodes: int
+    n_props: int
+    n_conns: int
+    n_styles: int
+    flags: int
+    offsets: int
+    node_ids: int
+    node_types: int
+    node_labels: int
+    node_styles: int
+    node_prop_counts: int
+    styles: int
+    props: int
+    conn_ids: int
+    conn_sources: int
+    conn_targets: int
+    conn_labels: int
+    conn_types: int
+    xs: int
+    ys: int
+    blob: int
+
+
+def block_layout(data) -> BlockLayout:
+    n_strings, blob_len, n_nodes, n_props, n_conns, n_styles, flags, _ = BLOCK_COUNTS.unpack_from(data, 0)
+    position = BLOCK_COUNTS.size
+    positions: List[int] = []
+    for count in (
+        n_strings + 1,
+        n_nodes, n_nodes, n_nodes, n_nodes, n_nodes,
+        n_styles * 5,
+        n_props * 2,
+        n_conns, n_conns, n_conns, n_conns, n_conns,
+    ):
+        positions.append(position)
+        position += 4 * count
+    if position % 8:
+        position += 8 - position % 8
+    xs = position
+    ys = xs + 8 * n_nodes
+    blob = ys + 8 * n_nodes
+    return BlockLayout(n_strings, blob_len, n_nodes, n_props, n_conns, n_styles, flags, *positions, xs, ys, blob)
+
+
+def decode_strings(data, layout: BlockLayout) -> List[str]:
+    view = memoryview(data)
+    blob = bytes(view[layout.blob:layout.blob + layout.blob_len])
+    if layout.n_strings == 0:
+        return []
+    if layout.flags & BLOCK_FLAG_NUL_SEPARATED:
+        return blob.decode("utf-8").split("\x00")
+    offsets = _from_bytes("I", view[layout.offsets:layout.offsets + 4 * (layout.n_strings + 1)])
+    return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(layout.n_strings)]
+
+
+def decode_diagram_content(data, compact: bool = False) -> Tuple[List[Node], List[Connection]]:
+    """
+    Décode les noeuds et connexions d'un bloc (déjà décompressé). Avec
+    compact=True, les noeuds sont rangés dans un DiagramStore (colonnes,
+    styles partagés) et la liste retournée est sa NodeList.
+    """
+    layout = block_layout(data)
+    view = memoryview(data)
+    strings = decode_strings(data, layout)
+
+    def u32(position: int, count: int) -> List[int]:
+        return _from_bytes("I", view[position:position + 4 * count]).tolist()
+
+    def f64(position: int, count: int) -> List[float]:
+        return _from_bytes("d", view[position:position + 8 * count]).tolist()
+
+    n = layout.n_nodes
+    style_values = u32(layout.styles, layout.n_styles * 5)
+    appearances = [
+        NodeAppearance(
+            shape=NodeShape(strings[style_values[i]]),
+            border=BorderStyle(strings[style_values[i + 1]]),
+            fill_color=strings[style_values[i + 2]],
+            border_color=strings[style_values[i + 3]],
+            text_color=strings[style_values[i + 4]],
+        ).intern()
+        for i in range(0, len(style_values), 5)
+    ]
+    node_types = {value: NodeType(value) for value in (strings[i] for i in set(u32(layout.node_types, n)))}
+    props = u32(layout.props, layout.n_props * 2)
+    prop_counts = u32(layout.node_prop_counts, n)
+
+    if compact:
+        node_properties: List[Optional[Dict[str, str]]] = []
+        cursor = 0
+        for count in prop_counts:
+            node_properties.append(
+                {strings[props[i]]: strings[props[i + 1]] for i in range(cursor, cursor + 2 * count, 2)}
+                if count else None
+            )
+            cursor += 2 * count
+        store = DiagramStore.from_columns(
+            ids=[strings[i] for i in u32(layout.node_ids, n)],
+            types=[node_types[strings[i]] for i in u32(layout.node_types, n)],
+            labels=[strings[i] for i in u32(layout.node_labels, n)],
+            xs=_from_bytes("d", view[layout.xs:layout.xs + 8 * n]),
+            ys=_from_bytes("d", view[layout.ys:layout.ys + 8 * n]),
+            styles=appearances,
+            style_index=_from_bytes("I", view[layout.node_styles:layout.node_styles + 4 * n]),
+            properties=node_properties,
+        )
+        return store.nodes(), _decode_connections(view, layout, strings)
+
+    nodes: List[Node] = []
+    cursor = 0
+    for node_id, node_type, label, style, count, x, y in zip(
+        u32(layout.node_ids, n),
+        u32(layout.node_types, n),
+        u32(layout.node_labels, n),
+        u32(layout.node_styles, n),
+        prop_counts,
+        f64(layout.xs, n),
+        f64(layout.ys, n),
+    ):
+        properties = {strings[props[i]]: strings[props[i + 1]] for i in range(cursor, cursor + 2 * count, 2)}
+        cursor += 2 * count
+        nodes.append(
+            Node(
+                id=strings[node_id],
+                type=node_types[strings[node_type]],
+                label=strings[label],
+                x=x,
+                y=y,
+                appearance=appearances[style],
+                properties=properties,
+            )
+        )
+
+    return nodes, _decode_connections(view, layout, strings)
+
+
+def _decode_connections(view: memoryview, layout: BlockLayout, strings: List[str]) -> List[Connection]:
+    def u32(position: int, count: int) -> List[int]:
+        return _from_bytes("I", view[position:position + 4 * count]).tolist()
+
+    m = layout.n_conns
+    return [
+        Connection(
+            id=strings[c_id],
+            source_id=strings[source],
+            target_id=strings[target],
+            label=strings[label],
+            type=ConnectionType(strings[c_type]),
+        )
+        for c_id, source, target, label, c_type in zip(
+            u32(layout.conn_ids, m),
+            u32(layout.conn_sources, m),
+            u32(layout.conn_targets, m),
+            u32(layout.conn_labels, m),
+            u32(layout.conn_types, m),
+        )
+    ]
+
+
+class BinaryDiagramSource:
+    """
+    Chargeur d'un LazyDiagram : relit le bloc du diagramme dans le fichier
+    .depsbin au premier accès. Le fichier ne doit pas être remplacé entre-temps
+    (même inode, taille non réduite) ; detach() copie le bloc en mémoire
+    avant que le fichier ne soit remplacé. Une source peut être partagée
+    (LazyDiagram d'un ProjectSnapshot) : un bloc détaché est donc conservé
+    après chargement, le fichier n'étant plus là pour le relire.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        entry: DiagramEntry,
+        compressed: bool,
+        stamp: Tuple[int, int, int],
+        compact: bool = False,
+    ):
+        self.path = path
+        self.entry = entry
+        self.compressed = compressed
+        self.stamp = stamp
+        self.compact = compact
+        self._raw: Optional[bytes] = None
+        self._detached = False
+
+    def read_raw(self) -> bytes:
+        """Bloc tel qu'il est stocké dans le fichier (compressé ou non)."""
+        if self._raw is not None:
+            return self._raw
+        inode, size, _ = file_stamp(self.path)
+        # un enregistrement différentiel ne fait qu'ajouter en fin de fichier ;
+        # toute autre réécriture passe par un nouveau fichier (autre inode)
+        if inode != self.stamp[0] or size < self.stamp[1]:
+            raise ValueError(f"Le fichier {self.path} a été remplacé depuis son ouverture")
+        with self.path.open("rb") as f:
+            f.seek(self.entry.offset)
+            data = f.read(self.entry.length)
+        if len(data) != self.entry.length:
+            raise ValueError(f"Bloc du diagramme {self.entry.id} tronqué")
+        return data
+
+    def detach(self) -> None:
+        self._raw = self.read_raw()
+        self._detached = True
+
+    def __call__(self) -> Tuple[List[Node], List[Connection]]:
+        data = self.read_raw()
+        if not self._detached:
+            self._raw = None
+        return decode_diagram_content(zlib.decompress(data) if self.compressed else data, self.compact)
+
+
+def file_stamp(path: Path) -> Tuple[int, int, int]:
+    st = os.stat(path)
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def unloaded_source(diagram: Diagram) -> Optional[BinaryDiagramSource]:
+    """Source binaire d'un diagramme pas encore chargé, None sinon."""
+    if isinstance(diagram, LazyDiagram) and not diagram.is_loaded and isinstance(diagram.loader, BinaryDiagramSource):
+        return diagram.loader
+    return None
+
+
+class BinaryProjectCodec:
+    """Écriture et lecture d'un Project au format .depsbin."""
+
+    def __init__(
+        self,
+        compress: bool = False,
+        compression_level: int = 1,
+        max_garbage_ratio: float = 1.0,
+        compact_nodes: bool = False,
+    ):
+        self.compress = compress
+        self.compression_level = compression_level
+        # update() refuse au-delà de max_garbage_ratio octets périmés par octet utile
+        self.max_garbage_ratio = max_garbage_ratio
+        # lecture : noeuds en DiagramStore (voir decode_diagram_content)
+        self.compact_nodes = compact_nodes
+
+    # -- Écriture --
+
+    def write(self, project: Project, stream: BinaryIO) -> None:
+        flags = FLAG_COMPRESSED if self.compress else 0
+        start = stream.tell()
+        stream.write(HEADER.pack(MAGIC, VERSION, flags, 0, 0, 0))
+        steps = []
+        for step_key, step in project.steps.items():
+            entries = []
+            for diagram in step.diagrams:
+                block, counts, digest = self._block(diagram)
+                offset = _align(stream, start)
+                stream.write(block)
+                entries.append(self._entry_dict(diagram, offset, len(block), counts, digest))
+            steps.append(self._step_dict(step_key, step, entries))
+        self._write_index_and_header(project, steps, stream, start, flags)
+
+    def update(self, project: Project, stream: BinaryIO, path: Path, sync: Callable[[], None]) -> bool:
+        """
+        Enregistrement différentiel dans un fichier .depsbin existant
+        (stream ouvert en lecture/écriture) : seuls les diagrammes dont
+        l'empreinte a changé sont ajoutés en fin de fichier, suivis d'un
+        nouvel index ; l'en-tête est réécrit en dernier (après sync), ce qui
+        valide l'ensemble. Une interruption avant laisse l'ancien index actif.
+        Les blocs existants ne sont jamais réécrits.
+
+        Retourne False (rien n'est écrit) si le fichier ne s'y prête pas :
+        autre compression, en-tête illisible, ou trop de blocs périmés
+        (max_garbage_ratio) ; il faut alors un enregistrement complet.
+        """
+        try:
+            old = self.read_index(stream)
+        except (ValueError, KeyError, TypeError):
+            return False
+        if old.compressed != self.compress:
+            return False
+        end = stream.seek(0, 2)
+        previous = {(s["key"], e.id): e for s in old.steps for e in s["diagrams"]}
+        live = HEADER.size + sum(e.length for e in previous.values())
+        if end - live > self.max_garbage_ratio * live:
+            return False
+
+        same_file = path.resolve()
+        steps = []
+        for step_key, step in project.steps.items():
+            entries = []
+            for diagram in step.diagrams:
+                entry = previous.get((step_key, diagram.id))
+                source = unloaded_source(diagram)
+                if (
+                    entry is not None
+                    and source is not None
+                    and source.entry.offset == entry.offset
+                    and source.path.resolve() == same_file
+                ):
+                    # jamais ouvert depuis ce fichier : le bloc en place est à jour
+                    entries.append(self._reused_entry_dict(diagram, entry))
+                    continue
+                block, counts, digest = self._block(diagram)
+                if entry is not None and entry.hash and entry.hash == digest:
+                    entries.append(self._reused_entry_dict(diagram, entry))
+                    continue
+                stream.seek(0, 2)
+                offset = _align(stream, 0)
+                stream.write(block)
+                entries.append(self._entry_dict(diagram, offset, len(block), counts, digest))
+            steps.append(self._step_dict(step_key, step, entries))
+        stream.seek(0, 2)
+        self._write_index_and_header(project, steps, stream, 0, old.flags, sync)
+        return True
+
+    def _block(self, diagram: Diagram) -> Tuple[bytes, Tuple[int, int], str]:
+        """Bloc stocké (compressé si besoin), (nb noeuds, nb connexions), empreinte du contenu."""
+        source = unloaded_source(diagram)
+        if source is not None and source.compressed == self.compress:
+            # diagramme jamais ouvert : son bloc est recopié sans être décodé
+            block = source.read_raw()
+            digest = source.entry.hash or block_hash(zlib.decompress(block) if source.compressed else block)
+            return block, (source.entry.nodes, source.entry.connections), digest
+        data = encode_diagram(diagram)
+        return self._pack(data), (len(diagram.nodes), len(diagram.connections)), block_hash(data)
+
+    def _write_index_and_header(
+        self,
+        project: Project,
+        steps: List[Dict[str, Any]],
+        stream: BinaryIO,
+        start: int,
+        flags: int,
+        sync: Optional[Callable[[], None]] = None,
+    ) -> None:
+        index = self._pack(json.dumps(
+            {"project": self._project_dict(project), "steps": steps},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8"))
+        index_offset = stream.tell() - start
+        stream.write(index)
+        end = stream.tell()
+        if sync is not None:
+            sync()  # blocs et index sur disque avant de les référencer
+        stream.seek(start)
+        stream.write(HEADER.pack(MAGIC, VERSION, flags, 0, index_offset, len(index)))
+        if sync is not None:
+            sync()
+        stream.seek(end)
+
+    def _pack(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.compression_level) if self.compress else data
+
+    @staticmethod
+    def _project_dict(project: Project) -> Dict[str, Any]:
+        return {
+            "id": project.id,
+            "name": project.name,
+            "description": project.description,
+            "version": project.version,
+        }
+
+    @staticmethod
+    def _step_dict(key: str, step: StepData, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "key": key,
+            "id": step.id,
+            "name": step.name,
+            "description": step.description,
+            "settings": step.settings,
+            "diagrams": entries,
+        }
+
+    @staticmethod
+    def _reused_entry_dict(diagram: Diagram, entry: DiagramEntry) -> Dict[str, Any]:
+        return BinaryProjectCodec._entry_dict(
+            diagram, entry.offset, entry.length, (entry.nodes, entry.connections), entry.hash
+        )
+
+    @staticmethod
+    def _entry_dict(
+        diagram: Diagram, offset: int, length: int, counts: Tuple[int, int], digest: str
+    ) -> Dict[str, Any]:
+        return {
+            "id": diagram.id,
+            "name": diagram.name,
+            "diagram_type": diagram.diagram_type.value,
+            "offset": offset,
+            "length": length,
+            "nodes": counts[0],
+            "connections": counts[1],
+            "hash": digest,
+        }
+
+    # -- Lecture --
+
+    def read(self, stream: BinaryIO, progress: Optional[ProgressCallback] = None) -> Project:
+        index = self.read_index(stream)
+        total = stream.seek(0, 2)
+        steps: Dict[str, StepData] = {}
+        for s in index.steps:
+            diagrams = []
+            for entry in s["diagrams"]:
+                nodes, connections = decode_diagram_content(self.read_block(stream, index, entry), self.compact_nodes)
+                diagrams.append(
+                    Diagram(
+                        id=entry.id,
+                        name=entry.name,
+                        diagram_type=DiagramType(entry.diagram_type),
+                        nodes=nodes,
+                        connections=connections,
+                    )
+                )
+                if progress is not None:
+                    progress(entry.offset + entry.length, total)
+            steps[s["key"]] = self._step_from_dict(s, diagrams)
+        return self._project_from_index(index, steps)
+
+    def read_lazy(self, stream: BinaryIO, path: Path) -> Project:
+        """
+        Lit seulement l'index : étapes et en-têtes de diagrammes. Chaque
+        diagramme est un LazyDiagram qui relit son bloc dans path au premier
+        accès à ses noeuds ou connexions.
+        """
+        index = self.read_index(stream)
+        stamp = file_stamp(path)
+        steps: Dict[str, StepData] = {}
+        for s in index.steps:
+            diagrams: List[Diagram] = [
+                LazyDiagram(
+                    id=entry.id,
+                    name=entry.name,
+                    diagram_type=DiagramType(entry.diagram_type),
+                    loader=BinaryDiagramSource(path, entry, index.compressed, stamp, self.compact_nodes),
+                    node_count=entry.nodes,
+                )
+                for entry in s["diagrams"]
+            ]
+            steps[s["key"]] = self._step_from_dict(s, diagrams)
+        return self._project_from_index(index, steps)
+
+    def read_index(self, stream: BinaryIO) -> ProjectIndex:
+        stream.seek(0)
+        head = stream.read(HEADER.size)
+        if len(head) < HEADER.size or not is_binary_project(head):
+            raise ValueError("Fichier projet binaire invalide (en-tête)")
+        _, version, flags, _, index_offset, index_length = HEADER.unpack(head)
+        if version > VERSION:
+            raise ValueError(f"Version de format binaire non supportée : {version}")
+        stream.seek(index_offset)
+        raw = stream.read(index_length)
+        if flags & FLAG_COMPRESSED:
+            raw = zlib.decompress(raw)
+        data = json.loads(raw.decode("utf-8"))
+        for step in data["steps"]:
+            step["diagrams"] = [DiagramEntry(**entry) for entry in step["diagrams"]]
+        return ProjectIndex(version=version, flags=flags, project=data["project"], steps=data["steps"])
+
+    @staticmethod
+    def read_block(stream: BinaryIO, index: ProjectIndex, entry: DiagramEntry) -> bytes:
+        stream.seek(entry.offset)
+        data = stream.read(entry.length)
+        if len(data) != entry.length:
+            raise ValueError(f"Bloc du diagramme {entry.id} tronqué")
+        return zlib.decompress(data) if index.compressed else data
+
+    @staticmethod
+    def _step_from_dict(s: Dict[str, Any], diagrams: List[Diagram]) -> StepData:
+        return StepData(
+            id=s["id"],
+            name=s["name"],
+            description=s.get("description", ""),
+            settings=s.get("settings", {}),
+            diagrams=diagrams,
+        )
+
+    @staticmethod
+    def _project_from_index(index: ProjectIndex, steps: Dict[str, StepData]) -> Project:
+        p = index.project
+        return Project(
+            id=p["id"],
+            name=p["name"],
+            description=p.get("description", ""),
+            version=p.get("version", "1.0"),
+            steps=steps,
+        )
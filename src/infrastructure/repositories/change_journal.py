@@ -0,0 +1,238 @@
+"""
+Journal des modifications d'un projet enregistré (<projet>.journal).
+
+Chaque modification du modèle (ProjectChange) est ajoutée en fin de
+fichier sous forme d'une ligne JSON ; la première ligne est un en-tête qui
+identifie la version du fichier projet sur laquelle le journal s'applique
+(empreinte de l'index actif d'un .depsbin, voir ChangeJournal._base) :
+
+    {"journal":2,"base":["index","<empreinte>"]}
+    {"rev":3,"kind":"node_added","step":"step_01_system","diagram":"logic_main",...}
+    {"rev":4,"kind":"node_moved",...}
+
+À l'ouverture, le journal est rejoué sur le projet chargé s'il correspond
+au fichier. Après un enregistrement complet, il est réécrit (compaction)
+avec les seules modifications postérieures au snapshot enregistré.
+Une dernière ligne incomplète (arrêt brutal pendant l'écriture) est ignorée,
+et le journal réécrit sans elle avant tout nouvel ajout.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from domain.models.project import Project
+from domain.models.diagram import DiagramType
+from domain.models.project_change import ChangeKind, ProjectChange
+from domain.services.project_changes import apply_change
+from infrastructure.repositories.binary_project_format import MAGIC, index_digest, is_binary_project
+from infrastructure.repositories.project_repository import (
+    connection_from_dict,
+    connection_to_dict,
+    node_from_dict,
+    node_to_dict,
+)
+from infrastructure.storage.file_storage import FileStorage
+
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_VERSION = 2
+
+
+def journal_path(project_path: Path) -> Path:
+    return project_path.with_name(project_path.name + JOURNAL_SUFFIX)
+
+
+def change_to_dict(revision: int, change: ProjectChange) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "rev": revision,
+        "kind": change.kind.value,
+        "step": change.step_id,
+        "diagram": change.diagram_id,
+    }
+    if change.kind == ChangeKind.NODE_ADDED:
+        data.update(name=change.diagram_name, type=change.diagram_type.value, node=node_to_dict(change.node))
+    elif change.kind == ChangeKind.CONNECTION_ADDED:
+        data.update(
+            name=change.diagram_name,
+            type=change.diagram_type.value,
+            connection=connection_to_dict(change.connection),
+        )
+    elif change.kind == ChangeKind.NODE_MOVED:
+        data.update(node=change.node_id, x=change.x, y=change.y)
+    return data
+
+
+def change_from_dict(data: Dict[str, Any]) -> ProjectChange:
+    kind = ChangeKind(data["kind"])
+    change = ProjectChange(kind=kind, diagram_id=data["diagram"], step_id=data["step"])
+    if kind == ChangeKind.NODE_ADDED:
+        change.node = node_from_dict(data["node"])
+    elif kind == ChangeKind.CONNECTION_ADDED:
+        change.connection = connection_from_dict(data["connection"])
+    else:
+        change.node_id = data["node"]
+    if kind in (ChangeKind.NODE_ADDED, ChangeKind.CONNECTION_ADDED):
+        change.diagram_name = data.get("name", "")
+        change.diagram_type = DiagramType(data.get("type", DiagramType.OTHER.value))
+    elif kind == ChangeKind.NODE_MOVED:
+        change.x = data["x"]
+        change.y = data["y"]
+    return change
+
+
+class ChangeJournal:
+    """
+    Journal d'un fichier projet. record() met les modifications en tampon
+    (tous les déplacements d'un même noeud en attente n'en font qu'un), flush()
+    les ajoute au fichier. Les enregistrements restent aussi en mémoire
+    pour la compaction (rebase).
+    """
+
+    def __init__(self, project_path: Path, max_records: int = 5000):
+        self.project_path = project_path
+        self.path = journal_path(project_path)
+        self.max_records = max_records
+        self.storage = FileStorage()
+        self._records: List[Dict[str, Any]] = []  # depuis le dernier enregistrement complet
+        self._unflushed = 0  # derniers éléments de _records pas encore écrits
+        # (étape, diagramme, noeud) -> indice dans _records du déplacement en attente
+        self._pending_moves: Dict[Tuple[str, str, str], int] = {}
+        self._header_written = False
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def needs_compaction(self) -> bool:
+        return len(self._records) >= self.max_records
+
+    def record(self, revision: int, change: ProjectChange) -> None:
+        data = change_to_dict(revision, change)
+        if data["kind"] == ChangeKind.NODE_MOVED.value:
+            # glisser une sélection entrelace les noeuds : on fusionne avec le
+            # déplacement en attente du même noeud, où qu'il soit dans le tampon
+            # (seule la dernière position compte, l'ordre relatif est sans effet)
+            key = (data["step"], data["diagram"], data["node"])
+            index = self._pending_moves.get(key)
+            if index is not None:
+                self._records[index] = data
+                return
+            self._pending_moves[key] = len(self._records)
+        self._records.append(data)
+        self._unflushed += 1
+
+    def flush(self) -> None:
+        if not self._unflushed:
+            return
+        if not self._header_written:
+            # pas encore de journal valide pour ce fichier : on repart de zéro
+            self._rewrite(self._records)
+            return
+        lines = "".join(self._line(r) for r in self._records[-self._unflushed:])
+        with self.path.open("ab") as f:
+            f.write(lines.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        self._unflushed = 0
+        self._pending_moves.clear()
+
+    def replay(self, project: Project) -> int:
+        """
+        Rejoue sur project (chargé depuis project_path) les modifications
+        d'un journal valide. Retourne le nombre de modifications appliquées.
+        """
+        records, complete = self._read_valid_records()
+        applied = 0
+        for data in records:
+            try:
+                if apply_change(project, change_from_dict(data)):
+                    applied += 1
+            except (KeyError, ValueError, TypeError):
+                continue
+            # déjà dans le fichier ou pas, ces modifications font partie de l'état courant :
+            # révision 0 = incluses dans le prochain enregistrement
+            data["rev"] = 0
+            self._records.append(data)
+        if records and not complete:
+            # fin tronquée : réécrit le journal sans elle, sinon les prochains
+            # ajouts suivraient la ligne incomplète et seraient perdus à la lecture
+            self._rewrite(self._records)
+        else:
+            self._header_written = bool(records)
+        return applied
+
+    def rebase(self, saved_revision: int) -> None:
+        """
+        Le fichier projet vient d'être réécrit avec l'état de saved_revision :
+        le journal repart de cette version et ne garde que les modifications
+        plus récentes.
+        """
+        self._rewrite([r for r in self._records if r["rev"] > saved_revision])
+
+    def relocate(self, project_path: Path) -> None:
+        """Le projet est désormais enregistré sous project_path (Enregistrer sous)."""
+        self.path.unlink(missing_ok=True)
+        self.project_path = project_path
+        self.path = journal_path(project_path)
+        self._header_written = False
+
+    def discard(self) -> None:
+        self._records.clear()
+        self._unflushed = 0
+        self._pending_moves.clear()
+        self._header_written = False
+        self.path.unlink(missing_ok=True)
+
+    def _rewrite(self, records: List[Dict[str, Any]]) -> None:
+        self._records = list(records)
+        self._unflushed = 0
+        self._pending_moves.clear()
+        if not self._records:
+            self.path.unlink(missing_ok=True)
+            self._header_written = False
+            return
+        header = {"journal": JOURNAL_VERSION, "base": self._base()}
+        payload = self._line(header) + "".join(self._line(r) for r in self._records)
+        with self.storage.atomic_write(self.path) as f:
+            f.write(payload.encode("utf-8"))
+        self._header_written = True
+
+    def _base(self) -> List[Any]:
+        """
+        Version enregistrée du projet sur laquelle le journal s'applique. Un
+        .depsbin est modifié en place, et un enregistrement interrompu y
+        ajoute des blocs : il est identifié par son index actif, qui ne change
+        qu'une fois l'enregistrement validé. Un JSON, toujours remplacé en
+        entier, par (inode, taille, date de modification).
+        """
+        if is_binary_project(self.storage.read_head(self.project_path, len(MAGIC))):
+            return ["index", self.storage.read_binary(self.project_path, index_digest)]
+        return ["stamp", *self.storage.stamp(self.project_path)]
+
+    def _read_valid_records(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """Enregistrements valides, et False si le fichier se termine par une ligne incomplète."""
+        try:
+            raw = self.path.read_bytes()
+        except FileNotFoundError:
+            return [], True
+        lines = raw.decode("utf-8", errors="replace").split("\n")
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return [], True
+        if header.get("journal") != JOURNAL_VERSION or header.get("base") != self._base():
+            return [], True  # journal d'une autre version du fichier : périmé
+        records = []
+        for line in lines[1:]:
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                return records, False  # fin tronquée
+        return records, True
+
+    @staticmethod
+    def _line(data: Dict[str, Any]) -> str:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
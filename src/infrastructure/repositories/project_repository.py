@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from domain.models.project import Project, StepData
 from domain.models.diagram import (
@@ -11,12 +11,114 @@ from domain.models.diagram import (
     NodeAppearance,
     ConnectionType,
 )
+from infrastructure.repositories.binary_project_format import (
+    BinaryProjectCodec,
+    MAGIC,
+    is_binary_project,
+    unloaded_source,
+)
 from infrastructure.storage.file_storage import FileStorage
+from infrastructure.storage.json_stream import JsonStreamReader, ProgressCallback
+
+JSON_SUFFIX = ".depsproj"
+BINARY_SUFFIX = ".depsbin"
+
+
+def node_to_dict(n: Node, styles: Optional[Dict[NodeAppearance, int]] = None) -> Dict[str, Any]:
+    """
+    Avec styles (table d'un diagramme, complétée au besoin), l'apparence est
+    écrite comme indice "style" dans cette table au lieu d'être recopiée.
+    """
+    data: Dict[str, Any] = {
+        "id": n.id,
+        "type": n.type.value,
+        "label": n.label,
+        "x": n.x,
+        "y": n.y,
+    }
+    if styles is None:
+        data["appearance"] = n.appearance.to_dict()
+    else:
+        data["style"] = styles.setdefault(n.appearance, len(styles))
+    properties = n.properties
+    # NodeView sans propriétés : vue vide en lecture seule, à recopier pour la sérialisation
+    data["properties"] = properties if isinstance(properties, dict) else dict(properties)
+    return data
+
+
+def node_from_dict(n: Dict[str, Any], styles: Optional[List[NodeAppearance]] = None) -> Node:
+    style = n.get("style")
+    if style is not None and (styles is None or not 0 <= style < len(styles)):
+        raise ValueError(f"Noeud {n.get('id')} : style {style} absent de la table \"styles\" du diagramme")
+    return Node(
+        id=n["id"],
+        type=NodeType(n["type"]),
+        label=n["label"],
+        x=n["x"],
+        y=n["y"],
+        appearance=styles[style] if style is not None else NodeAppearance.from_dict(n.get("appearance")),
+        properties=n.get("properties", {}),
+    )
+
+
+def diagram_to_dict(d: Diagram) -> Dict[str, Any]:
+    styles: Dict[NodeAppearance, int] = {}
+    nodes = [node_to_dict(n, styles) for n in d.nodes]
+    # la table des styles précède les noeuds : la lecture en flux la connaît déjà
+    return {
+        "id": d.id,
+        "name": d.name,
+        "diagram_type": d.diagram_type.value,
+        "styles": [a.to_dict() for a in styles],
+        "nodes": nodes,
+        "connections": [connection_to_dict(c) for c in d.connections],
+    }
+
+
+def connection_to_dict(c: Connection) -> Dict[str, Any]:
+    return {
+        "id": c.id,
+        "source_id": c.source_id,
+        "target_id": c.target_id,
+        "label": c.label,
+        "type": c.type.value,
+    }
+
+
+def connection_from_dict(c: Dict[str, Any]) -> Connection:
+    return Connection(
+        id=c["id"],
+        source_id=c["source_id"],
+        target_id=c["target_id"],
+        label=c.get("label", ""),
+        type=ConnectionType(c.get("type", ConnectionType.DEFAULT.value)),
+    )
 
 
 class ProjectRepository:
-    def __init__(self):
+    """
+    Enregistre et charge les projets en JSON (.depsproj) ou au format
+    binaire compact (.depsbin). À l'enregistrement, le format suit
+    l'extension du fichier ; au chargement, il est reconnu à l'en-tête.
+
+    compact_nodes : les noeuds des fichiers .depsbin sont chargés dans un
+    DiagramStore (colonnes) plutôt qu'en objets Node, pour les très gros
+    projets parcourus surtout en lecture (CLI, analyse).
+    """
+
+    def __init__(
+        self,
+        compress_binary: bool = False,
+        streaming_threshold: int = 16 << 20,
+        pretty_json: bool = False,
+        delta_saves: bool = True,
+        compact_nodes: bool = False,
+    ):
         self.storage = FileStorage()
+        self.pretty_json = pretty_json
+        self.delta_saves = delta_saves
+        self.streaming_threshold = streaming_threshold
+        self.binary_codec = BinaryProjectCodec(compress=compress_binary, compact_nodes=compact_nodes)
 
     def _project_to_dict(self, project: Project) -> Dict[str, Any]:
         return {
@@ -30,36 +132,7 @@ class ProjectRepository:
                     "name": step.name,
                     "description": step.description,
                     "settings": step.settings,
-                    "diagrams": [
-                        {
-                            "id": d.id,
-                            "name": d.name,
-                            "diagram_type": d.diagram_type.value,
-                            "nodes": [
-                                {
-                                    "id": n.id,
-                                    "type": n.type.value,
-                                    "label": n.label,
-                                    "x": n.x,
-                                    "y": n.y,
-                                    "appearance": n.appearance.to_dict(),
-                                    "properties": n.properties,
-                                }
-                                for n in d.nodes
-                            ],
-                            "connections": [
-                                {
-                                    "id": c.id,
-                                    "source_id": c.source_id,
-                                    "target_id": c.target_id,
-                                    "label": c.label,
-                                    "type": c.type.value,
-                                }
-                                for c in d.connections
-                            ],
-                        }
-                        for d in step.diagrams
-                    ],
+                    "diagrams": [diagram_to_dict(d) for d in step.diagrams],
                 }
                 for step_id, step in project.steps.items()
             },
@@ -70,28 +143,9 @@ class ProjectRepository:
         for step_id, s in data.get("steps", {}).items():
             diagrams: List[Diagram] = []
             for d in s.get("diagrams", []):
-                nodes = [
-                    Node(
-                        id=n["id"],
-                        type=NodeType(n["type"]),
-                        label=n["label"],
-                        x=n["x"],
-                        y=n["y"],
-                        appearance=NodeAppearance.from_dict(n.get("appearance")),
-                        properties=n.get("properties", {}),
-                    )
-                    for n in d.get("nodes", [])
-                ]
-                conns = [
-                    Connection(
-                        id=c["id"],
-                        source_id=c["source_id"],
-                        target_id=c["target_id"],
-                        label=c.get("label", ""),
-                        type=ConnectionType(c.get("type", ConnectionType.DEFAULT.value)),
-                    )
-                    for c in d.get("connections", [])
-                ]
+                styles = [NodeAppearance.from_dict(a) for a in d.get("styles", [])]
+                nodes = [node_from_dict(n, styles) for n in d.get("nodes", [])]
+                conns = [connection_from_dict(c) for c in d.get("connections", [])]
                 diagrams.append(
                     Diagram(
                         id=d["id"],
@@ -119,10 +173,134 @@ class ProjectRepository:
         )
         return project
 
+    def _project_from_stream(self, reader: JsonStreamReader) -> Project:
+        """
+        Même résultat que _project_from_dict(json.load(...)), mais le
+        document est lu au fil de l'eau : chaque noeud et chaque connexion
+        est converti dès qu'il est lu, sans construire l'arbre JSON complet.
+        """
+        fields: Dict[str, Any] = {}
+        steps: Dict[str, StepData] = {}
+        for key in reader.iter_object():
+            if key == "steps":
+                for step_id in reader.iter_object():
+                    steps[step_id] = self._step_from_stream(reader)
+            else:
+                fields[key] = reader.read_value()
+        return Project(
+            id=fields["id"],
+            name=fields["name"],
+            description=fields.get("description", ""),
+            version=fields.get("version", "1.0"),
+            steps=steps,
+        )
+
+    def _step_from_stream(self, reader: JsonStreamReader) -> StepData:
+        fields: Dict[str, Any] = {}
+        diagrams: List[Diagram] = []
+        for key in reader.iter_object():
+            if key == "diagrams":
+                for _ in reader.iter_array():
+                    diagrams.append(self._diagram_from_stream(reader))
+            else:
+                fields[key] = reader.read_value()
+        return StepData(
+            id=fields["id"],
+            name=fields["name"],
+            description=fields.get("description", ""),
+            settings=fields.get("settings", {}),
+            diagrams=diagrams,
+        )
+
+    def _diagram_from_stream(self, reader: JsonStreamReader) -> Diagram:
+        fields: Dict[str, Any] = {}
+        nodes: List[Node] = []
+        conns: List[Connection] = []
+        styles: Optional[List[NodeAppearance]] = None
+        pending: List[Dict[str, Any]] = []  # noeuds lus avant la table des styles
+        for key in reader.iter_object():
+            if key == "styles":
+                styles = [NodeAppearance.from_dict(a) for a in reader.read_value()]
+                nodes.extend(node_from_dict(n, styles) for n in pending)
+                pending.clear()
+            elif key == "nodes":
+                for _ in reader.iter_array():
+                    data = reader.read_value()
+                    if pending or (styles is None and "style" in data):
+                        pending.append(data)
+                    else:
+                        nodes.append(node_from_dict(data, styles))
+            elif key == "connections":
+                for _ in reader.iter_array():
+                    conns.append(connection_from_dict(reader.read_value()))
+            else:
+                fields[key] = reader.read_value()
+        if pending:
+            raise ValueError(f"Diagramme {fields.get('id')} : noeuds avec un indice de style mais pas de table \"styles\"")
+        return Diagram(
+            id=fields["id"],
+            name=fields["name"],
+            diagram_type=DiagramType(fields.get("diagram_type", "other")),
+            nodes=nodes,
+            connections=conns,
+        )
+
     def save(self, project: Project, path: Path) -> None:
+        """
+        Un fichier .depsbin existant est mis à jour de façon différentielle
+        (seuls les diagrammes modifiés sont écrits, voir
+        BinaryProjectCodec.update) ; sinon le fichier est réécrit en entier.
+        """
+        if path.suffix.lower() == BINARY_SUFFIX:
+            if (
+                self.delta_saves
+                and path.exists()
+                and is_binary_project(self.storage.read_head(path, len(MAGIC)))
+                and self.storage.update_binary(path, lambda f, sync: self.binary_codec.update(project, f, path, sync))
+            ):
+                return
+            self._detach_sources(project, path)
+            self.storage.write_binary(path, lambda f: self.binary_codec.write(project, f))
+            return
+        self._detach_sources(project, path)
         payload = self._project_to_dict(project)
-        self.storage.write_json(path, payload)
+        self.storage.write_json(path, payload, pretty=self.pretty_json)
 
-    def load(self, path: Path) -> Project:
+    @staticmethod
+    def _detach_sources(project: Project, path: Path) -> None:
+        # les diagrammes paresseux lus depuis ce fichier doivent être copiés
+        # en mémoire avant qu'il ne soit remplacé
+        if not path.exists():
+            return
+        target = path.resolve()
+        for step in project.steps.values():
+            for diagram in step.diagrams:
+                source = unloaded_source(diagram)
+                if source is not None and source.path.resolve() == target:
+                    source.detach()
+
+    def load(self, path: Path, progress: Optional[ProgressCallback] = None, lazy: bool = False) -> Project:
+        """
+        progress(octets lus, taille totale) est appelé pendant la lecture.
+        Les fichiers JSON de plus de streaming_threshold octets sont lus en
+        flux pour borner la mémoire ; les plus petits passent par json.load,
+        plus rapide.
+
+        Avec lazy=True, un fichier binaire n'est lu que pour son index : les
+        diagrammes sont chargés au premier accès (LazyDiagram). Un fichier
+        JSON, qui n'a pas d'index, est toujours chargé en entier.
+        """
+        if is_binary_project(self.storage.read_head(path, len(MAGIC))):
+            if lazy:
+                return self.storage.read_binary(path, lambda f: self.binary_codec.read_lazy(f, path))
+            return self.storage.read_binary(path, lambda f: self.binary_codec.read(f, progress))
+        size = self.storage.size(path)
+        if size >= self.streaming_threshold:
+            return self.storage.read_binary(
+                path,
+                lambda f: self._project_from_stream(JsonStreamReader(f, total_size=size, progress=progress)),
+            )
         data = self.storage.read_json(path)
+        if progress is not None:
+            progress(size, size)
         return self._project_from_dict(data)
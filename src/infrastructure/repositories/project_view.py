@@ -0,0 +1,213 @@
+"""
+Accès en lecture seule, sans décodage, aux projets .depsbin.
+
+Le fichier est projeté en mémoire (mmap) et les colonnes de chaque bloc de
+diagramme (types, positions, extrémités des connexions...) sont exposées
+comme des memoryview ou des tableaux NumPy qui pointent directement dans
+la projection : seules les pages effectivement lues sont chargées.
+
+    with ProjectView.open(path) as view:
+        for diagram in view.diagrams:
+            xs = diagram.xs               # memoryview f64, sans copie
+            sources, targets = diagram.edge_endpoints()   # NumPy (extra "analysis")
+
+Réservé aux fichiers non compressés (ProjectRepository(compress_binary=False),
+le défaut). Les vues restent valides tant que le ProjectView est ouvert.
+"""
+
+import mmap
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from infrastructure.repositories.binary_project_format import (
+    BinaryProjectCodec,
+    BlockLayout,
+    DiagramEntry,
+    ProjectIndex,
+    BLOCK_FLAG_NUL_SEPARATED,
+    block_layout,
+)
+from domain.services.optional_numpy import np, require_numpy
+
+
+class DiagramColumns:
+    """Colonnes d'un diagramme, lues directement dans le fichier projeté."""
+
+    def __init__(self, step_key: str, entry: DiagramEntry, block: memoryview):
+        self.step_key = step_key
+        self.id = entry.id
+        self.name = entry.name
+        self.diagram_type = entry.diagram_type
+        self._block = block
+        self.layout: BlockLayout = block_layout(block)
+        self._string_offsets: Optional[memoryview] = None
+
+    @property
+    def node_count(self) -> int:
+        return self.layout.n_nodes
+
+    @property
+    def connection_count(self) -> int:
+        return self.layout.n_conns
+
+    # -- Colonnes brutes (memoryview, sans copie) --
+
+    def _u32(self, position: int, count: int) -> memoryview:
+        return self._block[position:position + 4 * count].cast("I")
+
+    def _f64(self, position: int, count: int) -> memoryview:
+        return self._block[position:position + 8 * count].cast("d")
+
+    @property
+    def xs(self) -> memoryview:
+        return self._f64(self.layout.xs, self.layout.n_nodes)
+
+    @property
+    def ys(self) -> memoryview:
+        return self._f64(self.layout.ys, self.layout.n_nodes)
+
+    @property
+    def node_ids(self) -> memoryview:
+        """Indices dans la table des chaînes (voir string())."""
+        return self._u32(self.layout.node_ids, self.layout.n_nodes)
+
+    @property
+    def node_types(self) -> memoryview:
+        """Indices dans la table des chaînes : string(i) donne la valeur de NodeType."""
+        return self._u32(self.layout.node_types, self.layout.n_nodes)
+
+    @property
+    def node_styles(self) -> memoryview:
+        return self._u32(self.layout.node_styles, self.layout.n_nodes)
+
+    @property
+    def connection_sources(self) -> memoryview:
+        """Indices de chaîne des ids source (mêmes indices que node_ids)."""
+        return self._u32(self.layout.conn_sources, self.layout.n_conns)
+
+    @property
+    def connection_targets(self) -> memoryview:
+        return self._u32(self.layout.conn_targets, self.layout.n_conns)
+
+    @property
+    def connection_types(self) -> memoryview:
+        return self._u32(self.layout.conn_types, self.layout.n_conns)
+
+    # -- Chaînes --
+
+    def string(self, index: int) -> str:
+        """Décode une seule chaîne de la table, sans lire les autres."""
+        if self._string_offsets is None:
+            self._string_offsets = self._u32(self.layout.offsets, self.layout.n_strings + 1)
+        start = self._string_offsets[index]
+        end = self._string_offsets[index + 1]
+        if self.layout.flags & BLOCK_FLAG_NUL_SEPARATED:
+            end -= 1  # séparateur \0
+        blob = self.layout.blob
+        return str(self._block[blob + start:blob + end], "utf-8")
+
+    def node_type_names(self) -> List[str]:
+        codes = self.node_types
+        names: Dict[int, str] = {}
+        return [names.get(c) or names.setdefault(c, self.string(c)) for c in codes]
+
+    def properties(self, key: str) -> Dict[int, str]:
+        """Valeurs de la propriété key (ex: "equation"), par position de noeud."""
+        layout = self.layout
+        counts = self._u32(layout.node_prop_counts, layout.n_nodes)
+        props = self._u32(layout.props, 2 * layout.n_props)
+        found: Dict[int, str] = {}
+        key_index: Optional[int] = None
+        cursor = 0
+        for node, count in enumerate(counts):
+            for i in range(cursor, cursor + 2 * count, 2):
+                k = props[i]
+                if key_index is None:
+                    if self.string(k) != key:
+                        continue
+                    key_index = k  # table sans doublon : un seul indice par chaîne
+                elif k != key_index:
+                    continue
+                found[node] = self.string(props[i + 1])
+            cursor += 2 * count
+        return found
+
+    def equations(self) -> Dict[int, str]:
+        return self.properties("equation")
+
+    # -- NumPy --
+
+    def coordinates(self) -> "tuple[np.ndarray, np.ndarray]":
+        """Tableaux NumPy x et y des noeuds, sans copie (vues sur le fichier)."""
+        require_numpy("les tableaux de colonnes")
+        layout = self.layout
+        xs = np.frombuffer(self._block, dtype="<f8", count=layout.n_nodes, offset=layout.xs)
+        ys = np.frombuffer(self._block, dtype="<f8", count=layout.n_nodes, offset=layout.ys)
+        return xs, ys
+
+    def column(self, name: str) -> "np.ndarray":
+        """Colonne u32 brute (node_ids, node_types, conn_sources...) en tableau NumPy sans copie."""
+        require_numpy("les tableaux de colonnes")
+        layout = self.layout
+        count = layout.n_conns if name.startswith("conn_") else layout.n_nodes
+        return np.frombuffer(self._block, dtype="<u4", count=count, offset=getattr(layout, name))
+
+    def edge_endpoints(self) -> "tuple[np.ndarray, np.ndarray]":
+        """Positions (dans l'ordre des noeuds) des extrémités de chaque connexion, -1 si orpheline."""
+        require_numpy("les tableaux de colonnes")
+        lookup = np.full(self.layout.n_strings, -1, dtype=np.int64)
+        node_ids = self.column("node_ids")
+        # en cas d'id en double, la première occurrence gagne (comme DiagramGraph)
+        lookup[node_ids[::-1]] = np.arange(len(node_ids) - 1, -1, -1)
+        return lookup[self.column("conn_sources")], lookup[self.column("conn_targets")]
+
+
+class ProjectView:
+    """Projet .depsbin projeté en mémoire, en lecture seule."""
+
+    def __init__(self, path: Path, index: ProjectIndex, mapped: mmap.mmap, file):
+        self.path = path
+        self.index = index
+        self._mmap = mapped
+        self._file = file
+        self._buffer = memoryview(mapped)
+        self.diagrams: List[DiagramColumns] = [
+            DiagramColumns(step["key"], entry, self._buffer[entry.offset:entry.offset + entry.length])
+            for step in index.steps
+            for entry in step["diagrams"]
+        ]
+
+    @staticmethod
+    def open(path: Path) -> "ProjectView":
+        if sys.byteorder != "little":
+            raise ValueError("Les vues sans copie supposent une machine little-endian")
+        f = path.open("rb")
+        try:
+            index = BinaryProjectCodec().read_index(f)
+            if index.compressed:
+                raise ValueError(f"{path} est compressé : lecture sans copie impossible")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            f.close()
+            raise
+        return ProjectView(path, index, mapped, f)
+
+    @property
+    def name(self) -> str:
+        return self.index.project["name"]
+
+    def close(self) -> None:
+        self.diagrams = []
+        self._buffer.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # des vues sont encore utilisées : la projection sera libérée avec elles
+        self._file.close()
+
+    def __enter__(self) -> "ProjectView":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
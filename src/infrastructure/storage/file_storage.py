@@ -1,14 +1,135 @@
+from contextlib import contextmanager
 from pathlib import Path
+import io
 import json
-from typing import Any
+import os
+import stat
+import tempfile
+from typing import Any, BinaryIO, Callable, Iterator, TextIO, Tuple
+
+try:  # sérialiseur optionnel (extra "fast"), bien plus rapide que json
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _read_umask() -> int:
+    # os.umask ne sait que remplacer le masque : on le lit une seule fois, à
+    # l'import, plutôt qu'à chaque écriture (course avec les autres threads)
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+# droits d'un fichier créé normalement (mkstemp crée en 0600)
+_DEFAULT_FILE_MODE = 0o666 & ~_read_umask()
 
 
 class FileStorage:
+    """
+    Accès aux fichiers. Les écritures sont atomiques : le contenu est écrit
+    dans un fichier temporaire du même dossier, synchronisé sur disque puis
+    renommé sur la cible. Une interruption laisse l'ancien fichier intact.
+    update_binary() est réservé aux formats qui garantissent eux-mêmes
+    cette propriété (ajout en fin de fichier validé par l'en-tête).
+    """
+
     def read_json(self, path: Path) -> Any:
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
         with path.open("r", encoding="utf-8") as f:
             return json.load(f)
 
-    def write_json(self, path: Path, data: Any) -> None:
+    def write_json(self, path: Path, data: Any, pretty: bool = False) -> None:
+        """JSON compact par défaut, indenté avec pretty=True."""
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+        elif pretty:
+            payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        else:
+            payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        with self.atomic_write(path) as f:
+            f.write(payload)
+
+    def size(self, path: Path) -> int:
+        return path.stat().st_size
+
+    def stamp(self, path: Path) -> Tuple[int, int, int]:
+        """Identifie une version d'un fichier (inode, taille, date de modification)."""
+        st = path.stat()
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def read_head(self, path: Path, size: int) -> bytes:
+        with path.open("rb") as f:
+            return f.read(size)
+
+    def read_binary(self, path: Path, reader: Callable[[BinaryIO], Any]) -> Any:
+        with path.open("rb") as f:
+            return reader(f)
+
+    def write_binary(self, path: Path, writer: Callable[[BinaryIO], None]) -> None:
+        with self.atomic_write(path) as f:
+            writer(f)
+
+    def write_text(self, path: Path, writer: Callable[[TextIO], None], encoding: str = "utf-8") -> None:
+        """Comme write_binary, pour un writer qui écrit du texte au fil de l'eau."""
+        with self.atomic_write(path) as f:
+            text = io.TextIOWrapper(f, encoding=encoding, newline="")
+            writer(text)
+            text.flush()
+            text.detach()  # f est fermé par atomic_write
+
+    def update_binary(self, path: Path, updater: Callable[[BinaryIO, Callable[[], None]], Any]) -> Any:
+        """
+        Modification en place (mode r+b) pour les formats qui ajoutent en fin
+        de fichier puis valident par l'en-tête. updater reçoit le flux et
+        sync(), qui force l'écriture sur disque des données déjà écrites.
+        """
+        with path.open("r+b") as f:
+            def sync() -> None:
+                f.flush()
+                os.fsync(f.fileno())
+
+            return updater(f, sync)
+
+    @contextmanager
+    def atomic_write(self, path: Path) -> Iterator[BinaryIO]:
+        """
+        Flux binaire vers un fichier temporaire qui remplace path à la
+        sortie du bloc (fsync puis os.replace). En cas d'exception, le
+        fichier temporaire est supprimé et path n'est pas modifié.
+        """
         path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        tmp = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp, self._file_mode(path))
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        self._sync_directory(path.parent)
+
+    @staticmethod
+    def _file_mode(path: Path) -> int:
+        # mkstemp crée le fichier en 0600 : on garde les droits de la cible,
+        # ou ceux qu'aurait un fichier créé normalement
+        try:
+            return stat.S_IMODE(path.stat().st_mode)
+        except FileNotFoundError:
+            return _DEFAULT_FILE_MODE
+
+    @staticmethod
+    def _sync_directory(directory: Path) -> None:
+        # le renommage n'est durable qu'une fois le dossier synchronisé (POSIX)
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -0,0 +1,134 @@
+import codecs
+import json
+from typing import Any, BinaryIO, Callable, Iterator, Optional
+
+ProgressCallback = Callable[[int, int], None]  # (octets lus, taille totale)
+
+
+class JsonStreamReader:
+    """
+    Lecture incrémentale d'un document JSON depuis un flux binaire utf-8.
+
+    Le document est parcouru structure par structure : iter_object() et
+    iter_array() avancent dans les objets et tableaux sans les construire,
+    read_value() décode une valeur complète (un noeud, un paramètre...).
+    Seul un tampon de quelques blocs est gardé en mémoire.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        chunk_size: int = 1 << 16,
+        total_size: int = 0,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+        self.total_size = total_size
+        self._progress = progress
+
+    # -- Tampon --
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        data = self._stream.read(self._chunk_size)
+        self.bytes_read += len(data)
+        if self._progress is not None:
+            self._progress(self.bytes_read, self.total_size)
+        if not data:
+            self._eof = True
+            self._buffer = self._buffer[self._pos:] + self._decoder.decode(b"", final=True)
+        else:
+            self._buffer = self._buffer[self._pos:] + self._decoder.decode(data)
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Premier caractère significatif (chaîne vide en fin de flux)."""
+        while True:
+            buffer = self._buffer
+            pos = self._pos
+            length = len(buffer)
+            while pos < length and buffer[pos] in " \t\n\r":
+                pos += 1
+            self._pos = pos
+            if pos < length:
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"JSON invalide : '{char}' attendu, '{found}' trouvé")
+        self._pos += 1
+
+    # -- Lecture --
+
+    def read_value(self) -> Any:
+        """Décode la valeur suivante en entier."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # un nombre ou un littéral en bord de tampon peut continuer dans le bloc suivant
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def skip_value(self) -> None:
+        if self._peek() == "{":
+            for _ in self.iter_object():
+                self.skip_value()
+        elif self._peek() == "[":
+            for _ in self.iter_array():
+                self.skip_value()
+        else:
+            self.read_value()
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Parcourt un objet : produit chaque clé, l'appelant doit alors
+        consommer la valeur associée (read_value, skip_value, iter_*...).
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError("JSON invalide : clé d'objet attendue")
+            self._expect(":")
+            yield key
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("}")
+            return
+
+    def iter_array(self) -> Iterator[None]:
+        """Parcourt un tableau : l'appelant consomme un élément à chaque itération."""
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("]")
+            return
@@ -0,0 +1,32 @@
+import csv
+from pathlib import Path
+from typing import Dict
+
+from domain.services.optional_numpy import np, require_numpy
+
+
+class TraceStorage:
+    """
+    Lecture de traces de capteurs enregistrées.
+
+    Format CSV attendu : une ligne d'en-tête avec les noms des variables,
+    puis une ligne par échantillon avec des valeurs 0 / 1.
+    """
+
+    def read_csv(self, path: Path, delimiter: str = ",") -> Dict[str, "np.ndarray"]:
+        require_numpy("lire les traces")
+        with path.open("r", encoding="utf-8", newline="") as f:
+            header = next(csv.reader(f, delimiter=delimiter), None)
+            if not header:
+                return {}
+            names = [name.strip() for name in header]
+            # lecture des valeurs en C par NumPy, sans boucle Python par ligne
+            values = np.loadtxt(f, delimiter=delimiter, dtype=np.uint8, ndmin=2)
+        if values.size == 0:
+            return {name: np.zeros(0, dtype=bool) for name in names}
+        if values.shape[1] != len(names):
+            raise ValueError(
+                f"{path} : {values.shape[1]} colonnes de valeurs pour {len(names)} noms dans l'en-tête"
+            )
+        matrix = np.asfortranarray(values.astype(bool))
+        return {name: matrix[:, i] for i, name in enumerate(names)}
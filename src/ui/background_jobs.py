@@ -0,0 +1,67 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal
+
+Job = Callable[[], Any]
+Callback = Callable[[Any], None]
+ErrorCallback = Callable[[BaseException], None]
+
+
+class BackgroundJobRunner(QObject):
+    """
+    Exécute des tâches (enregistrement, export) dans un thread de travail
+    et rappelle on_done / on_error dans le thread de l'interface.
+
+    Les tâches d'une même clé sont regroupées : une seule tourne à la fois,
+    et si d'autres sont soumises entre-temps seule la dernière est exécutée
+    ensuite (des enregistrements rapprochés n'écrivent qu'une fois de plus).
+    """
+
+    _job_finished = Signal(str, object, object)  # clé, résultat, exception
+
+    def __init__(self, max_workers: int = 2, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="background-job")
+        self._running: Dict[str, Tuple[Callback, ErrorCallback]] = {}
+        self._pending: Dict[str, Tuple[Job, Callback, ErrorCallback]] = {}
+        self._job_finished.connect(self._on_job_finished)
+
+    def submit(self, key: str, job: Job, on_done: Callback, on_error: ErrorCallback) -> None:
+        if key in self._running:
+            self._pending[key] = (job, on_done, on_error)
+            return
+        self._start(key, job, on_done, on_error)
+
+    def is_busy(self, key: Optional[str] = None) -> bool:
+        if key is None:
+            return bool(self._running)
+        return key in self._running
+
+    def shutdown(self) -> None:
+        """Attend la fin des tâches en cours puis exécute les tâches en attente (à la fermeture)."""
+        self._executor.shutdown(wait=True)
+        for job, _, _ in self._pending.values():
+            job()
+        self._pending.clear()
+
+    def _start(self, key: str, job: Job, on_done: Callback, on_error: ErrorCallback) -> None:
+        self._running[key] = (on_done, on_error)
+        future = self._executor.submit(job)
+
+        def finished(f: Future) -> None:
+            # appelé dans le thread de travail : le signal ramène le résultat dans le thread de l'interface
+            error = f.exception()
+            self._job_finished.emit(key, None if error else f.result(), error)
+
+        future.add_done_callback(finished)
+
+    def _on_job_finished(self, key: str, result: Any, error: Optional[BaseException]) -> None:
+        on_done, on_error = self._running.pop(key)
+        if error is not None:
+            on_error(error)
+        else:
+            on_done(result)
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            self._start(key, *pending)
@@ -1,17 +1,23 @@
 from pathlib import Path
+from typing import Optional
 
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
-    QMainWindow, QStackedWidget, QFileDialog, QStatusBar
+    QMainWindow, QStackedWidget, QFileDialog, QStatusBar, QProgressDialog, QApplication
 )
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import QMessageBox
 
 from app.app_context import AppContext
 from domain.models.project import Project
+from domain.models.project_change import ProjectChange
 from domain.services.project_service import ProjectService
 from domain.services.deps_generator import DepsGenerator
+from domain.services.project_snapshot import ProjectSnapshot
+from infrastructure.repositories.change_journal import ChangeJournal
 from infrastructure.repositories.project_repository import ProjectRepository
 
+from ui.background_jobs import BackgroundJobRunner
 from ui.pages.start_page import StartPage
 from ui.pages.wizard.wizard_page import WizardPage
 
@@ -22,7 +28,16 @@ class MainWindow(QMainWindow):
         self.context = context
         self.project_service = ProjectService()
         self.project_repository = ProjectRepository()
-        self.deps_generator = DepsGenerator()
+        # export incrémental : chaque modification est signalée par on_project_changed
+        self.deps_generator = DepsGenerator(incremental=True)
+        # enregistrements et exports hors du thread de l'interface
+        self.background_jobs = BackgroundJobRunner(parent=self)
+        # journal des modifications du projet ouvert (None tant qu'il n'a pas de fichier)
+        self.journal: Optional[ChangeJournal] = None
+        self.journal_timer = QTimer(self)
+        self.journal_timer.setInterval(1000)
+        self.journal_timer.timeout.connect(self.flush_journal)
+        self.journal_timer.start()
 
         self.setWindowTitle("Model To Deps")
         self.resize(1200, 800)
@@ -115,7 +130,9 @@ class MainWindow(QMainWindow):
 
     def new_project(self):
         project = Project.create(name="Nouveau projet")
+        self.journal = None
         self.context.set_project(project, path=None)
+        self.deps_generator.invalidate()
         self.wizard_page.set_project(project)
         self.stack.setCurrentWidget(self.wizard_page)
         self.update_status_bar()
@@ -125,16 +142,42 @@ class MainWindow(QMainWindow):
             self,
             "Ouvrir un projet",
             "",
-            "Projet DEPS (*.depsproj);;Tous les fichiers (*.*)",
+            "Projet DEPS (*.depsproj *.depsbin);;Tous les fichiers (*.*)",
         )
         if not path_str:
             return
         path = Path(path_str)
-        project = self.project_repository.load(path)
+        project = self.load_project_with_progress(path)
+        # modifications non enregistrées d'une session précédente (arrêt brutal...)
+        self.journal = ChangeJournal(path)
+        recovered = self.journal.replay(project)
         self.context.set_project(project, path)
+        self.deps_generator.invalidate()
         self.wizard_page.set_project(project)
         self.stack.setCurrentWidget(self.wizard_page)
+        if recovered:
+            self.context.mark_dirty()
         self.update_status_bar()
+        if recovered:
+            self.status_bar.showMessage(f"{recovered} modification(s) non enregistrée(s) récupérée(s) du journal", 5000)
+
+    def load_project_with_progress(self, path: Path) -> Project:
+        dialog = QProgressDialog(f"Chargement de {path.name}…", "", 0, 1000, self)
+        dialog.setWindowTitle("Ouvrir un projet")
+        dialog.setCancelButton(None)
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(300)
+
+        def progress(done: int, total: int) -> None:
+            dialog.setValue(int(1000 * done / total) if total else 0)
+            QApplication.processEvents()
+
+        try:
+            # .depsbin : seul l'index est lu, chaque diagramme est chargé à
+            # l'ouverture de son étape ; un .depsproj (sans index) est lu en entier
+            return self.project_repository.load(path, progress=progress, lazy=True)
+        finally:
+            dialog.close()
 
     def save_project(self):
         if self.context.current_project is None:
@@ -142,28 +185,53 @@ class MainWindow(QMainWindow):
         if self.context.current_path is None:
             self.save_project_as()
             return
-        self.project_repository.save(self.context.current_project, self.context.current_path)
-        self.context.is_dirty = False
-        self.update_status_bar()
+        self.save_in_background(self.context.current_path)
 
     def save_project_as(self):
         if self.context.current_project is None:
             return
-        path_str, _ = QFileDialog.getSaveFileName(
+        path_str, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Enregistrer le projet sous…",
             "",
-            "Projet DEPS (*.depsproj)",
+            "Projet DEPS (*.depsproj);;Projet DEPS binaire (*.depsbin)",
         )
         if not path_str:
             return
         path = Path(path_str)
-        if path.suffix != ".depsproj":
-            path = path.with_suffix(".depsproj")
-
-        self.project_repository.save(self.context.current_project, path)
-        self.context.set_project(self.context.current_project, path)
-        self.update_status_bar()
+        suffix = ".depsbin" if "depsbin" in selected_filter else ".depsproj"
+        if path.suffix.lower() not in (".depsproj", ".depsbin"):
+            path = path.with_suffix(suffix)
+
+        # current_path ne change qu'une fois le fichier écrit (voir on_done)
+        self.save_in_background(path)
+
+    def save_in_background(self, path: Path):
+        """
+        Fige le projet (rapide) puis l'enregistre dans un thread de travail.
+        Des demandes rapprochées sont regroupées : seule la dernière est
+        écrite après l'enregistrement en cours.
+        """
+        snapshot = ProjectSnapshot.capture(self.context.current_project)
+        revision = self.context.revision
+
+        def on_done(_):
+            self.context.current_path = path
+            self.context.mark_saved(revision)
+            self.rebase_journal(path, revision)
+            self.update_status_bar()
+
+        def on_error(error: BaseException):
+            self.update_status_bar()
+            QMessageBox.critical(self, "Enregistrement", f"Échec de l'enregistrement de {path} :\n{error}")
+
+        self.background_jobs.submit(
+            "save",
+            lambda: self.project_repository.save(snapshot.to_project(), path),
+            on_done,
+            on_error,
+        )
+        self.status_bar.showMessage(f"Enregistrement de {path}…")
 
     def export_deps(self):
         if self.context.current_project is None:
@@ -180,11 +248,22 @@ class MainWindow(QMainWindow):
         if path.suffix == "":
             path = path.with_suffix(".deps")
 
-        code = self.deps_generator.generate(self.context.current_project)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(code, encoding="utf-8")
+        snapshot = ProjectSnapshot.capture(self.context.current_project)
+        revision = self.deps_generator.revision
 
-        self.status_bar.showMessage(f"Code DEPS exporté vers {path}", 5000)
+        def export():
+            # écriture au fil de l'eau (le texte complet n'est jamais en
+            # mémoire) dans un fichier temporaire qui remplace la cible
+            project = snapshot.to_project()
+            self.project_repository.storage.write_text(path, lambda f: self.deps_generator.generate_to(project, f, revision))
+
+        self.background_jobs.submit(
+            "export",
+            export,
+            lambda _: self.status_bar.showMessage(f"Code DEPS exporté vers {path}", 5000),
+            lambda error: QMessageBox.critical(self, "Export DEPS", f"Échec de l'export vers {path} :\n{error}"),
+        )
+        self.status_bar.showMessage(f"Export du code DEPS vers {path}…")
 
     def validate_project(self):
         if self.context.current_project is None:
@@ -198,10 +277,43 @@ class MainWindow(QMainWindow):
             )
             QMessageBox.warning(self, "Validation", msg)
 
-    def on_project_changed(self):
-        self.context.mark_dirty()
+    def on_project_changed(self, change: Optional[ProjectChange] = None):
+        # sans change, simple notification (statut des étapes...) : le projet
+        # n'est pas modifié, ni marqué à enregistrer, ni à réexporter
+        if change is not None:
+            self.context.mark_dirty()
+            self.deps_generator.invalidate(change)
+            if self.journal is not None:
+                self.journal.record(self.context.revision, change)
         self.update_status_bar()
 
+    def flush_journal(self):
+        """Écrit le journal (toutes les secondes) et le compacte par un enregistrement complet s'il a trop grossi."""
+        if self.journal is None:
+            return
+        try:
+            self.journal.flush()
+        except OSError as exc:
+            self.status_bar.showMessage(f"Journal des modifications indisponible : {exc}", 5000)
+            return
+        if self.journal.needs_compaction and not self.background_jobs.is_busy("save"):
+            self.save_in_background(self.journal.project_path)
+
+    def rebase_journal(self, path: Path, revision: int):
+        """Après un enregistrement complet de path : le journal repart de ce fichier."""
+        if self.journal is not None and self.journal.project_path != path:
+            self.journal.relocate(path)
+        if self.journal is None:
+            self.journal = ChangeJournal(path)
+        self.journal.rebase(revision)
+
+    def closeEvent(self, event):
+        # ne pas quitter au milieu d'une écriture
+        self.background_jobs.shutdown()
+        self.flush_journal()
+        self.deps_generator.close()
+        super().closeEvent(event)
+
     def update_status_bar(self):
         if self.context.current_project is None:
             self.status_bar.showMessage("Aucun projet chargé.")
@@ -209,6 +321,8 @@ class MainWindow(QMainWindow):
 
         path_text = str(self.context.current_path) if self.context.current_path else "(non enregistré)"
         dirty = "Modifié" if self.context.is_dirty else "Sauvegardé"
+        if self.background_jobs.is_busy("save"):
+            dirty = "Enregistrement…"
         self.status_bar.showMessage(
             f"Projet : {self.context.current_project.name} | {dirty} | Fichier : {path_text}"
         )
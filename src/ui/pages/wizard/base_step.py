@@ -3,22 +3,39 @@
 from typing import Optional, Callable
 from PySide6.QtWidgets import QWidget
 from domain.models.project import StepData
+from domain.models.project_change import ProjectChange
 from .step_status import StepStatus
 
 
 class BaseWizardStep(QWidget):
-    def __init__(self, step_id: str, on_changed: Callable[[], None], parent=None):
+    def __init__(self, step_id: str, on_changed: Callable[[Optional[ProjectChange]], None], parent=None):
         super().__init__(parent)
         self.step_id = step_id
         self._on_changed = on_changed
         self._step_data: Optional[StepData] = None
+        self._view_stale = False  # données chargées mais pas encore affichées
 
     def load_from_step(self, step: StepData) -> None:
         """
         Chargement des données métier pour cette étape.
         À surcharger si besoin dans les sous-classes (mais appeler super()).
+        Ne doit pas accéder au contenu des diagrammes (chargés à la demande
+        depuis un .depsbin) : l'affichage est fait par refresh_view().
         """
         self._step_data = step
+        self._view_stale = True
+
+    def show_step(self) -> None:
+        """Appelé quand l'étape devient visible : affiche les données au premier affichage."""
+        if self._view_stale:
+            self._view_stale = False
+            self.refresh_view()
+
+    def refresh_view(self) -> None:
+        """
+        Affiche les données chargées par load_from_step (diagrammes...).
+        À surcharger dans les sous-classes.
+        """
 
     def get_status(self) -> StepStatus:
         """
@@ -28,9 +45,13 @@ class BaseWizardStep(QWidget):
         """
         return StepStatus.INCOMPLETE
 
-    def mark_changed(self) -> None:
+    def mark_changed(self, change: Optional[ProjectChange] = None) -> None:
         """
         À appeler quand l'utilisateur modifie quelque chose.
         Notifie le wizard (MainWindow sera prévenu via le callback).
+        change décrit la modification (journal, export incrémental) ; sans
+        change, le projet n'est pas considéré comme modifié.
         """
-        self._on_changed()
+        if change is not None:
+            change.step_id = self.step_id
+        self._on_changed(change)
@@ -10,6 +10,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 
 from domain.models.project import StepData
+from domain.models.project_change import ProjectChange
 from domain.models.diagram import (
     Diagram,
     DiagramType,
@@ -91,6 +92,8 @@ class Step02Observer(BaseWizardStep):
                 )
             )
         self._diagram = step.diagrams[0]
+
+    def refresh_view(self) -> None:
         self.diagram_view.set_diagram(self._diagram)
 
     # -- Palette -> diagramme --
@@ -109,7 +112,7 @@ class Step02Observer(BaseWizardStep):
         )
         self._diagram.nodes.append(node)
         self.diagram_view.add_node(node)
-        self.mark_changed()
+        self.mark_changed(ProjectChange.node_added(self._diagram, node))
 
     def _connect_selected(self):
         if not self._diagram:
@@ -120,11 +123,11 @@ class Step02Observer(BaseWizardStep):
         connection = Connection.create(selected[0], selected[1])
         self._diagram.connections.append(connection)
         self.diagram_view.add_connection(connection)
-        self.mark_changed()
+        self.mark_changed(ProjectChange.connection_added(self._diagram, connection))
 
-    def _on_diagram_changed(self):
+    def _on_diagram_changed(self, change: ProjectChange | None = None):
         # appelé par DiagramView quand un node bouge etc.
-        self.mark_changed()
+        self.mark_changed(change)
 
     # -- Statut de l'étape --
 
@@ -134,6 +137,6 @@ class Step02Observer(BaseWizardStep):
         sinon INCOMPLETE.
         Plus tard, tu remplacerais ça par une vraie validation métier.
         """
-        if self._diagram and self._diagram.nodes:
+        if self._diagram and not self._diagram.is_empty():
             return StepStatus.VALID
         return StepStatus.INCOMPLETE
@@ -10,6 +10,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 
 from domain.models.project import StepData
+from domain.models.project_change import ProjectChange
 from domain.models.diagram import Diagram, DiagramType, Node, NodeType
 from ui.widgets.diagram_view import DiagramView
 from ui.widgets.component_library import ComponentLibraryWidget
@@ -81,6 +82,8 @@ class Step05InterTask(BaseWizardStep):
                 )
             )
         self._diagram = step.diagrams[0]
+
+    def refresh_view(self) -> None:
         self.diagram_view.set_diagram(self._diagram)
 
     # -- Palette -> diagramme --
@@ -98,11 +101,11 @@ class Step05InterTask(BaseWizardStep):
         )
         self._diagram.nodes.append(node)
         self.diagram_view.add_node(node)
-        self.mark_changed()
+        self.mark_changed(ProjectChange.node_added(self._diagram, node))
 
-    def _on_diagram_changed(self):
+    def _on_diagram_changed(self, change: ProjectChange | None = None):
         # appelé par DiagramView quand un node bouge etc.
-        self.mark_changed()
+        self.mark_changed(change)
 
     # -- Statut de l'étape --
 
@@ -112,6 +115,6 @@ class Step05InterTask(BaseWizardStep):
         sinon INCOMPLETE.
         Plus tard, tu remplacerais ça par une vraie validation métier.
         """
-        if self._diagram and self._diagram.nodes:
+        if self._diagram and not self._diagram.is_empty():
             return StepStatus.VALID
         return StepStatus.INCOMPLETE
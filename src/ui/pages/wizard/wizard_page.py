@@ -15,6 +15,7 @@ from PySide6.QtWidgets import (
 
 from app.app_context import AppContext
 from domain.models.project import Project
+from domain.models.project_change import ProjectChange
 
 from .base_step import BaseWizardStep
 from .step_status import StepStatus
@@ -37,7 +38,12 @@ class StepMeta:
 
 
 class WizardPage(QWidget):
-    def __init__(self, app_context: AppContext, on_project_changed: Callable[[], None], parent=None):
+    def __init__(
+        self,
+        app_context: AppContext,
+        on_project_changed: Callable[[Optional[ProjectChange]], None],
+        parent=None,
+    ):
         super().__init__(parent)
         self.app_context = app_context
         self.on_project_changed = on_project_changed
@@ -110,7 +116,8 @@ class WizardPage(QWidget):
     def set_project(self, project: Project):
         self.current_project = project
 
-        # Propager les données vers chaque step
+        # Propager les données vers chaque step ; chaque étape n'affiche (et
+        # ne charge) ses diagrammes qu'à sa première apparition
         for meta in self.steps:
             step_data = project.steps.get(meta.id)
             if step_data:
@@ -127,6 +134,7 @@ class WizardPage(QWidget):
             return
 
         self.stack.setCurrentIndex(index)
+        self.steps[index].widget.show_step()
         self._update_step_buttons_checked(index)
 
     def _update_step_buttons_checked(self, current_index: int):
@@ -200,9 +208,9 @@ class WizardPage(QWidget):
     # Modifications
     # -----------------------------------------------------
 
-    def _on_step_changed(self):
+    def _on_step_changed(self, change: Optional[ProjectChange] = None):
         """
         Appelé par les steps quand l'utilisateur modifie quelque chose.
         """
         self.update_step_statuses()
-        self.on_project_changed()
+        self.on_project_changed(change)
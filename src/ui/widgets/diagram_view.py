@@ -2,28 +2,34 @@
 
 from __future__ import annotations
 
+import math
 from typing import Optional, Callable, Dict, Iterable, Any
 from uuid import uuid4
 
-from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem
-from PySide6.QtGui import QPen, QBrush, QColor, QPainter, QWheelEvent, QPainterPath
-from PySide6.QtCore import Qt, QPointF, QRectF, QMimeData
+from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem, QStyle
+from PySide6.QtGui import QPen, QColor, QPainter, QWheelEvent, QPainterPath, QPainterPathStroker, QPolygonF
+from PySide6.QtCore import Qt, QPointF, QRectF, QLineF, QMimeData, QTimer
 
 from domain.models.diagram import (
     Diagram,
     Connection,
     Node,
     NodeAppearance,
-    NodeShape,
-    BorderStyle,
     NodeType,
     ConnectionType,
 )
+from domain.models.project_change import ProjectChange
+from ui.widgets.node_renderer import node_renderer, style_tools
 
 
 NODE_WIDTH = 140
 NODE_HEIGHT = 70
+# niveaux de détail (échelle noeud -> écran, voir NodeGraphicsItem.paint)
+LOD_FULL = 0.4  # au-dessus : libellé et double bordure (noeud >= 56 px de large)
+LOD_SHAPE = 0.1  # au-dessus : forme seule ; en dessous : simple rectangle plein
 COMPONENT_MIME_TYPE = "application/x-diagram-component"
+SCENE_MARGIN = 2000  # marge minimale autour des éléments (voir _ensure_scene_rect)
+_ARROW_HEAD_ANGLE = math.radians(150)  # branches de la pointe, par rapport au trait
 
 CONNECTION_COLORS: dict[ConnectionType, str] = {
     ConnectionType.DEFAULT: "#555555",
@@ -42,41 +48,36 @@ class NodeGraphicsItem(QGraphicsItem):
         super().__init__()
         self.node = node
         self.on_moved = on_moved
+        # positionné avant d'activer les notifications de géométrie
+        self.setPos(node.x, node.y)
         self.setFlags(
             QGraphicsItem.ItemIsMovable
             | QGraphicsItem.ItemIsSelectable
             | QGraphicsItem.ItemSendsGeometryChanges
         )
-        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        # pas de cache par élément : les tuiles sont partagées (node_renderer)
         self.setZValue(1)
 
+    # appelé plusieurs fois par noeud et par image : construit une seule fois
+    _BOUNDS = QRectF(-NODE_WIDTH / 2 - 6, -NODE_HEIGHT / 2 - 6, NODE_WIDTH + 12, NODE_HEIGHT + 12)
+    _RECT = QRectF(-NODE_WIDTH / 2, -NODE_HEIGHT / 2, NODE_WIDTH, NODE_HEIGHT)
+
     def boundingRect(self) -> QRectF:
-        margin = 6
-        return QRectF(-NODE_WIDTH / 2 - margin, -NODE_HEIGHT / 2 - margin, NODE_WIDTH + 2 * margin, NODE_HEIGHT + 2 * margin)
+        return self._BOUNDS
 
     def paint(self, painter: QPainter, option, widget=None):
         appearance: NodeAppearance = self.node.appearance
-        pen = QPen(QColor(appearance.border_color))
-        pen.setWidth(2)
-        painter.setPen(pen)
-        painter.setBrush(QBrush(QColor(appearance.fill_color)))
-
-        rect = QRectF(-NODE_WIDTH / 2, -NODE_HEIGHT / 2, NODE_WIDTH, NODE_HEIGHT)
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
 
-        if appearance.shape == NodeShape.ELLIPSE:
-            painter.drawEllipse(rect)
-            if appearance.border == BorderStyle.DOUBLE:
-                inset = 6
-                painter.drawEllipse(rect.adjusted(inset, inset, -inset, -inset))
-        else:
-            painter.drawRoundedRect(rect, 8, 8)
-            if appearance.border == BorderStyle.DOUBLE:
-                inset = 6
-                painter.drawRoundedRect(rect.adjusted(inset, inset, -inset, -inset), 8, 8)
+        if lod < LOD_SHAPE:
+            # quelques pixels à l'écran : un rectangle de la couleur du noeud
+            painter.fillRect(self._RECT, style_tools(appearance)[1])
+            return
 
-        # libellé
-        painter.setPen(QPen(QColor(appearance.text_color)))
-        painter.drawText(rect, Qt.AlignCenter | Qt.TextWordWrap, self.node.label)
+        # libellé illisible en dessous de LOD_FULL : forme seule
+        label = self.node.label if lod >= LOD_FULL else None
+        selected = bool(option.state & QStyle.State_Selected)
+        node_renderer().paint(painter, self._BOUNDS, self._RECT, appearance, label, selected, lod)
 
     def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value):
         if change == QGraphicsItem.ItemPositionHasChanged:
@@ -84,10 +85,33 @@ class NodeGraphicsItem(QGraphicsItem):
         return super().itemChange(change, value)
 
     def center(self) -> QPointF:
-        return self.scenePos()
+        return self.pos()  # élément de premier niveau : pos() == scenePos(), en moins cher
+
+
+_CONNECTION_PENS: Dict[ConnectionType, QPen] = {}
+
+
+def connection_pen(connection_type: ConnectionType) -> QPen:
+    """Crayon partagé par toutes les flèches d'un même type."""
+    pen = _CONNECTION_PENS.get(connection_type)
+    if pen is None:
+        color = CONNECTION_COLORS.get(connection_type, CONNECTION_COLORS[ConnectionType.DEFAULT])
+        pen = QPen(QColor(color))
+        pen.setWidth(2)
+        _CONNECTION_PENS[connection_type] = pen
+    return pen
 
 
 class ArrowItem(QGraphicsItem):
+    """
+    Flèche entre deux noeuds. Sa géométrie (trait, pointe, rectangle englobant,
+    forme pour la sélection) est calculée par update_geometry() quand une
+    extrémité bouge, pas à chaque appel de paint() ou boundingRect().
+    """
+
+    ARROW_SIZE = 10
+    HIT_WIDTH = 8  # largeur de la zone cliquable autour du trait
+
     def __init__(
         self,
         source: NodeGraphicsItem,
@@ -98,50 +122,80 @@ class ArrowItem(QGraphicsItem):
         self.source = source
         self.target = target
         self.setZValue(0)
-        color = CONNECTION_COLORS.get(connection_type, CONNECTION_COLORS[ConnectionType.DEFAULT])
-        self.pen = QPen(QColor(color))
-        self.pen.setWidth(2)
+        self.pen = connection_pen(connection_type)
+        self._line = QLineF()
+        self._head = QPolygonF()
+        self._shape: Optional[QPainterPath] = None
+        self._bounds = QRectF()
+        self.update_geometry()
+
+    def update_geometry(self) -> None:
+        """À appeler quand source ou target a bougé."""
+        line = QLineF(self.source.center(), self.target.center())
+        head = QPolygonF()
+        if line.length() > 0:
+            # pointe de flèche
+            p2 = line.p2()
+            angle = math.radians(line.angle())
+            size = self.ARROW_SIZE
+            # repère Qt : y vers le bas, angle de QLineF compté dans le sens trigonométrique
+            for delta in (_ARROW_HEAD_ANGLE, -_ARROW_HEAD_ANGLE):
+                head.append(p2 + QPointF(size * math.cos(angle + delta), -size * math.sin(angle + delta)))
+            head.insert(1, p2)
+        margin = max(self.HIT_WIDTH / 2, self.ARROW_SIZE)
+        self.prepareGeometryChange()
+        self._line = line
+        self._head = head
+        self._shape = None  # calculée à la première sélection / détection de clic
+        self._bounds = QRectF(line.p1(), line.p2()).normalized().adjusted(-margin, -margin, margin, margin)
 
     def boundingRect(self) -> QRectF:
-        p1 = self.source.center()
-        p2 = self.target.center()
-        return QRectF(p1, p2).normalized().adjusted(-10, -10, 10, 10)
+        return self._bounds
+
+    def shape(self) -> QPainterPath:
+        if self._shape is None:
+            path = QPainterPath(self._line.p1())
+            path.lineTo(self._line.p2())
+            path.addPolygon(self._head)
+            stroker = QPainterPathStroker()
+            stroker.setWidth(max(self.HIT_WIDTH, self.pen.widthF()))
+            self._shape = stroker.createStroke(path)
+        return self._shape
 
     def paint(self, painter: QPainter, option, widget=None):
-        p1 = self.source.center()
-        p2 = self.target.center()
+        # trait et pointe tracés directement : bien moins coûteux qu'un drawPath
         painter.setPen(self.pen)
-        painter.drawLine(p1, p2)
-
-        # flèche
-        line = p2 - p1
-        if line.manhattanLength() == 0:
-            return
-        angle = line.angle()
-        arrow_size = 10
-        direction = QPointF.fromPolar(arrow_size, angle + 30)
-        direction2 = QPointF.fromPolar(arrow_size, angle - 30)
-        path = QPainterPath()
-        path.moveTo(p2)
-        path.lineTo(p2 - direction)
-        path.moveTo(p2)
-        path.lineTo(p2 - direction2)
-        painter.drawPath(path)
+        painter.drawLine(self._line)
+        if self._head.isEmpty() or option.levelOfDetailFromTransform(painter.worldTransform()) < LOD_SHAPE:
+            return  # pointe réduite à un pixel ou moins
+        painter.drawPolyline(self._head)
 
 
 class DiagramView(QGraphicsView):
-    def __init__(self, on_changed: Optional[Callable[[], None]] = None, parent=None):
+    def __init__(self, on_changed: Optional[Callable[..., None]] = None, parent=None, bsp_index: bool = True):
         super().__init__(parent)
         self.scene = QGraphicsScene(self)
         self.setScene(self.scene)
+        self.set_bsp_index(bsp_index)
 
         self.diagram: Optional[Diagram] = None
-        self.on_changed = on_changed or (lambda: None)
+        # on_changed(change=None) : change décrit la modification quand elle est connue
+        self.on_changed = on_changed or (lambda change=None: None)
         self.node_items: Dict[str, NodeGraphicsItem] = {}
         self.connection_items: Dict[str, ArrowItem] = {}
+        # id de noeud -> flèches qui le touchent (ordre d'insertion, sans doublon)
+        self._incident_arrows: Dict[str, Dict[ArrowItem, None]] = {}
+        # flèches à redessiner, traitées en une fois au prochain tour de boucle
+        self._dirty_arrows: Dict[ArrowItem, None] = {}
+        self._arrow_refresh = QTimer(self)
+        self._arrow_refresh.setSingleShot(True)
+        self._arrow_refresh.setInterval(0)
+        self._arrow_refresh.timeout.connect(self._flush_arrow_updates)
 
         self._add_component_callback: Optional[Callable[[str, QPointF], None]] = None
         self._active_component_id: Optional[str] = None
+        self._bulk_loading = False
+        self._scene_rect_fixed = False
 
         self.setRenderHint(QPainter.Antialiasing)
         self.setDragMode(QGraphicsView.RubberBandDrag)
@@ -177,6 +231,17 @@ class DiagramView(QGraphicsView):
         if self.scene.items():
             self.centerOn(self.scene.itemsBoundingRect().center())
 
+    def set_bsp_index(self, enabled: bool) -> None:
+        """
+        Index BSP de la scène (défaut) : recherche rapide des éléments
+        visibles, donc défilement et zoom fluides sur les grands diagrammes.
+        Sans index (NoIndex), déplacer beaucoup d'éléments coûte moins cher
+        mais chaque rafraîchissement parcourt toute la scène.
+        """
+        self.scene.setItemIndexMethod(
+            QGraphicsScene.ItemIndexMethod.BspTreeIndex if enabled else QGraphicsScene.ItemIndexMethod.NoIndex
+        )
+
     def set_component_adder(self, callback: Callable[[str, QPointF], None]):
         self._add_component_callback = callback
 
@@ -184,21 +249,65 @@ class DiagramView(QGraphicsView):
         self._active_component_id = component_id
 
     def set_diagram(self, diagram: "Diagram | None") -> None:
+        """
+        Chargement groupé : pendant la création des éléments, la scène n'a
+        pas d'index (l'index BSP est construit une seule fois à la fin) et la
+        vue n'est pas redessinée. Afficher un diagramme n'est pas une
+        modification : on_changed n'est pas appelé.
+        """
         self.diagram = diagram
-        self.scene.clear()
-        self.node_items.clear()
-        self.connection_items.clear()
-
-        if not diagram:
+        index_method = self.scene.itemIndexMethod()
+        self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        self.setUpdatesEnabled(False)
+        try:
+            self.scene.clear()
+            self.scene.setSceneRect(QRectF())  # recalculé pour le nouveau diagramme
+            self._scene_rect_fixed = False
+            self.node_items.clear()
+            self.connection_items.clear()
+            self._incident_arrows.clear()
+            self._dirty_arrows.clear()
+            if diagram:
+                self._bulk_loading = True
+                try:
+                    self._populate(diagram)
+                finally:
+                    self._bulk_loading = False
+                self._ensure_scene_rect(self.scene.itemsBoundingRect())
+        finally:
+            self.scene.setItemIndexMethod(index_method)
+            self.setUpdatesEnabled(True)
+
+        if diagram:
+            self.reset_view()
+
+    def _ensure_scene_rect(self, rect: QRectF) -> None:
+        """
+        Fixe le rectangle de la scène avec une marge : sinon il suit les
+        éléments déplacés et chaque agrandissement reconstruit tout l'index BSP.
+        """
+        if rect.isEmpty():
+            return
+        current = self.scene.sceneRect()
+        if self._scene_rect_fixed and current.contains(rect):
             return
+        target = current.united(rect) if self._scene_rect_fixed else rect
+        margin = max(SCENE_MARGIN, target.width() / 2, target.height() / 2)
+        self.scene.setSceneRect(target.adjusted(-margin, -margin, margin, margin))
+        self._scene_rect_fixed = True
 
+    def _populate(self, diagram: Diagram) -> None:
+        """Crée les éléments du diagramme."""
         normalized_nodes = []
+        changed = False
         for node in getattr(diagram, "nodes", []):
             normalized = self._normalize_node(node)
+            changed = changed or normalized is not node
             if normalized:
                 normalized_nodes.append(normalized)
                 self.add_node(normalized)
-        diagram.nodes = normalized_nodes
+        if changed:
+            diagram.nodes = normalized_nodes  # sinon, conserve la séquence d'origine (DiagramStore...)
 
         normalized_connections = []
         for conn in getattr(diagram, "connections", []):
@@ -208,8 +317,6 @@ class DiagramView(QGraphicsView):
                 self.add_connection(normalized)
         diagram.connections = normalized_connections
 
-        self.reset_view()
-
     def _normalize_node(self, node: Any) -> Optional[Node]:
         if isinstance(node, Node):
             return node
@@ -258,14 +365,19 @@ class DiagramView(QGraphicsView):
     # -- Node management --
     def add_node(self, node: Node) -> None:
         def on_moved(item: NodeGraphicsItem):
-            node.x = item.scenePos().x()
-            node.y = item.scenePos().y()
+            pos = item.scenePos()
+            if pos.x() == node.x and pos.y() == node.y:
+                return  # placement initial (setPos) : rien n'a changé
+            node.x = pos.x()
+            node.y = pos.y()
+            self._ensure_scene_rect(item.sceneBoundingRect())
             self._refresh_connections_for(node.id)
-            self.on_changed()
+            self.on_changed(ProjectChange.node_moved(self.diagram, node) if self.diagram else None)
 
         item = NodeGraphicsItem(node=node, on_moved=on_moved)
-        item.setPos(QPointF(node.x, node.y))
         self.scene.addItem(item)
+        if not self._bulk_loading:
+            self._ensure_scene_rect(item.sceneBoundingRect())
         self.node_items[node.id] = item
 
     def get_selected_node_ids(self) -> Iterable[str]:
@@ -279,18 +391,40 @@ class DiagramView(QGraphicsView):
         target_item = self.node_items.get(connection.target_id)
         if not source_item or not target_item:
             return
+        previous = self.connection_items.pop(connection.id, None)
+        if previous is not None:
+            self._unindex_arrow(previous)
+            self.scene.removeItem(previous)
         arrow = ArrowItem(source_item, target_item, connection.type)
         self.scene.addItem(arrow)
         self.connection_items[connection.id] = arrow
-        self.on_changed()
+        self._incident_arrows.setdefault(connection.source_id, {})[arrow] = None
+        self._incident_arrows.setdefault(connection.target_id, {})[arrow] = None
+
+    def _unindex_arrow(self, arrow: ArrowItem) -> None:
+        for node_id in (arrow.source.node.id, arrow.target.node.id):
+            arrows = self._incident_arrows.get(node_id)
+            if arrows is not None:
+                arrows.pop(arrow, None)
+        self._dirty_arrows.pop(arrow, None)
 
     def _refresh_connections_for(self, node_id: str):
-        for conn_id, arrow in self.connection_items.items():
-            if (
-                arrow.source.node.id == node_id
-                or arrow.target.node.id == node_id
-            ):
-                arrow.update()
+        """
+        Marque les flèches du noeud ; elles sont redessinées une seule fois
+        après le traitement de l'événement en cours (glisser une sélection
+        déplace tous ses noeuds avant la mise à jour).
+        """
+        arrows = self._incident_arrows.get(node_id)
+        if not arrows:
+            return
+        self._dirty_arrows.update(arrows)
+        if not self._arrow_refresh.isActive():
+            self._arrow_refresh.start()
+
+    def _flush_arrow_updates(self) -> None:
+        dirty, self._dirty_arrows = self._dirty_arrows, {}
+        for arrow in dirty:
+            arrow.update_geometry()
 
     # -- Interactions --
     def _can_accept_drop(self, mime_data: QMimeData) -> bool:
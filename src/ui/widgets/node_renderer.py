@@ -0,0 +1,191 @@
+"""
+Rendu partagé des noeuds de diagramme.
+
+Des milliers de noeuds partagent la même NodeAppearance, souvent avec le
+même libellé : plutôt qu'un cache pixmap par élément (DeviceCoordinateCache),
+les noeuds sont dessinés à partir de tuiles communes, rangées dans le
+QPixmapCache global et indexées par (apparence, libellé, palier de zoom,
+sélection). Les libellés sont mis en forme une seule fois (QStaticText).
+"""
+
+import math
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QPainter,
+    QPen,
+    QPixmap,
+    QPixmapCache,
+    QStaticText,
+    QTextOption,
+)
+
+from domain.models.diagram import BorderStyle, NodeAppearance, NodeShape
+
+ZOOM_STEPS_PER_OCTAVE = 4  # paliers de zoom : tuile à ±9 % de l'échelle d'affichage
+MAX_TILE_SCALE = 4.0  # au-delà, dessin direct : les tuiles seraient trop grandes
+PIXMAP_CACHE_KB = 64 * 1024
+SELECTION_COLOR = "#0d99ff"
+
+# crayons et pinceaux par apparence : les apparences étant partagées et
+# immuables, ils ne sont construits qu'une fois par style
+_STYLE_TOOLS: Dict[NodeAppearance, Tuple[QPen, QBrush, QPen]] = {}
+
+
+def style_tools(appearance: NodeAppearance) -> Tuple[QPen, QBrush, QPen]:
+    """(contour, remplissage, texte) pour une apparence."""
+    tools = _STYLE_TOOLS.get(appearance)
+    if tools is None:
+        border = QPen(QColor(appearance.border_color))
+        border.setWidth(2)
+        tools = (border, QBrush(QColor(appearance.fill_color)), QPen(QColor(appearance.text_color)))
+        _STYLE_TOOLS[appearance] = tools
+    return tools
+
+
+def draw_node(
+    painter: QPainter,
+    appearance: NodeAppearance,
+    body: QRectF,
+    label: Optional[QStaticText],
+    detailed: bool,
+    selected: bool,
+) -> None:
+    """Dessin vectoriel d'un noeud ; detailed : double bordure (et libellé s'il est fourni)."""
+    border_pen, fill_brush, text_pen = style_tools(appearance)
+    painter.setPen(border_pen)
+    painter.setBrush(fill_brush)
+    double = detailed and appearance.border == BorderStyle.DOUBLE
+    inset = 6
+    if appearance.shape == NodeShape.ELLIPSE:
+        painter.drawEllipse(body)
+        if double:
+            painter.drawEllipse(body.adjusted(inset, inset, -inset, -inset))
+    else:
+        painter.drawRoundedRect(body, 8, 8)
+        if double:
+            painter.drawRoundedRect(body.adjusted(inset, inset, -inset, -inset), 8, 8)
+
+    if label is not None:
+        painter.setPen(text_pen)
+        size = label.size()
+        painter.drawStaticText(QPointF(body.left(), body.center().y() - size.height() / 2), label)
+
+    if selected:
+        pen = QPen(QColor(SELECTION_COLOR), 1, Qt.DashLine)
+        painter.setPen(pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(body.adjusted(-3, -3, 3, 3))
+
+
+class NodeRenderer:
+    """
+    Dessine les noeuds à partir de tuiles partagées. Une tuile est rendue
+    une fois par combinaison (apparence, libellé, palier de zoom, sélection)
+    puis copiée, mise à l'échelle exacte, pour chaque noeud qui l'utilise.
+    """
+
+    def __init__(self, max_labels: int = 10000):
+        self.max_labels = max_labels
+        self._style_ids: Dict[NodeAppearance, int] = {}
+        self._labels: "OrderedDict[Tuple[str, float], QStaticText]" = OrderedDict()
+        if QPixmapCache.cacheLimit() < PIXMAP_CACHE_KB:
+            QPixmapCache.setCacheLimit(PIXMAP_CACHE_KB)
+
+    def static_text(self, label: str, width: float) -> QStaticText:
+        """Libellé centré et coupé à la largeur width, mis en forme une seule fois."""
+        key = (label, width)
+        text = self._labels.get(key)
+        if text is not None:
+            self._labels.move_to_end(key)
+            return text
+        text = QStaticText(label)
+        text.setTextWidth(width)
+        option = QTextOption(Qt.AlignCenter)
+        option.setWrapMode(QTextOption.WordWrap)
+        text.setTextOption(option)
+        text.setPerformanceHint(QStaticText.AggressiveCaching)
+        self._labels[key] = text
+        if len(self._labels) > self.max_labels:
+            self._labels.popitem(last=False)
+        return text
+
+    def paint(
+        self,
+        painter: QPainter,
+        bounds: QRectF,
+        body: QRectF,
+        appearance: NodeAppearance,
+        label: Optional[str],
+        selected: bool,
+        scale: float,
+    ) -> None:
+        """
+        bounds : zone de la tuile (rectangle englobant de l'élément), body :
+        forme du noeud ; label None = forme seule ; scale : échelle élément ->
+        pixels de l'écran.
+        """
+        detailed = label is not None
+        scale *= painter.device().devicePixelRatioF()
+        if scale > MAX_TILE_SCALE:
+            text = self.static_text(label, body.width()) if detailed else None
+            draw_node(painter, appearance, body, text, detailed, selected)
+            return
+
+        bucket = round(math.log2(max(scale, 1e-3)) * ZOOM_STEPS_PER_OCTAVE)
+        key = "deps-node:%d:%d:%d:%gx%g:%s" % (
+            self._style_id(appearance),
+            bucket,
+            selected,
+            bounds.width(),
+            bounds.height(),
+            "\x00" if label is None else label,
+        )
+        tile = QPixmapCache.find(key)
+        if tile is None:
+            tile = self._render_tile(bounds, body, appearance, label, selected, 2 ** (bucket / ZOOM_STEPS_PER_OCTAVE))
+            QPixmapCache.insert(key, tile)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawPixmap(bounds, tile, QRectF(tile.rect()))
+
+    def _style_id(self, appearance: NodeAppearance) -> int:
+        style_id = self._style_ids.get(appearance)
+        if style_id is None:
+            style_id = self._style_ids[appearance] = len(self._style_ids)
+        return style_id
+
+    def _render_tile(
+        self,
+        bounds: QRectF,
+        body: QRectF,
+        appearance: NodeAppearance,
+        label: Optional[str],
+        selected: bool,
+        scale: float,
+    ) -> QPixmap:
+        tile = QPixmap(max(1, math.ceil(bounds.width() * scale)), max(1, math.ceil(bounds.height() * scale)))
+        tile.fill(Qt.transparent)
+        painter = QPainter(tile)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.scale(tile.width() / bounds.width(), tile.height() / bounds.height())
+        painter.translate(-bounds.topLeft())
+        text = self.static_text(label, body.width()) if label is not None else None
+        draw_node(painter, appearance, body, text, label is not None, selected)
+        painter.end()
+        return tile
+
+
+_renderer: Optional[NodeRenderer] = None
+
+
+def node_renderer() -> NodeRenderer:
+    """Renderer partagé par toutes les vues de diagramme."""
+    global _renderer
+    if _renderer is None:
+        _renderer = NodeRenderer()
+    return _renderer
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from domain.models.diagram import (
+    Connection,
+    ConnectionType,
+    Diagram,
+    DiagramType,
+    Node,
+    NodeAppearance,
+    NodeShape,
+    NodeType,
+)
+from domain.models.equations import And, Const, Expr, Not, Or, Var
+from domain.models.project import Project
+
+
+def build_project(diagrams_per_step: int = 2, nodes_per_diagram: int = 20, seed: int = 0) -> Project:
+    """Projet aléatoire mais reproductible : styles, propriétés et connexions variés."""
+    rng = random.Random(seed)
+    project = Project.create("Projet de test", "é ü")
+    for step_id, step in project.steps.items():
+        for j in range(diagrams_per_step):
+            diagram = Diagram(id=f"{step_id}_d{j}", name=f"Diagramme {j} é", diagram_type=DiagramType.LOGIC)
+            for n in range(nodes_per_diagram):
+                diagram.nodes.append(
+                    Node.create(
+                        node_type=rng.choice(list(NodeType)),
+                        label=f"Noeud {n} ü",
+                        x=rng.random() * 1000,
+                        y=n * 1.5,
+                        appearance=NodeAppearance(shape=rng.choice(list(NodeShape))),
+                        properties={"equation": f"A{n % 7} & !B{n % 5}"} if n % 2 else {},
+                    )
+                )
+            for _ in range(nodes_per_diagram):
+                source, target = rng.choice(diagram.nodes), rng.choice(diagram.nodes)
+                diagram.connections.append(
+                    Connection.create(source.id, target.id, "l", rng.choice(list(ConnectionType)))
+                )
+            step.diagrams.append(diagram)
+    return project
+
+
+def random_expr(rng: random.Random, variables, depth: int = 4) -> Expr:
+    """Expression aléatoire sur variables (sous-arbres partagés fréquents : peu de variables)."""
+    if depth == 0 or rng.random() < 0.2:
+        return Const(rng.random() < 0.5) if rng.random() < 0.05 else Var(rng.choice(variables))
+    roll = rng.random()
+    if roll < 0.2:
+        return Not(random_expr(rng, variables, depth - 1))
+    kind = And if roll < 0.6 else Or
+    return kind(random_expr(rng, variables, depth - 1), random_expr(rng, variables, depth - 1))
+
+
+def assignments(variables):
+    """Toutes les affectations des variables."""
+    for row in range(1 << len(variables)):
+        yield {name: bool(row >> i & 1) for i, name in enumerate(variables)}
+
+
+@pytest.fixture
+def project() -> Project:
+    return build_project()
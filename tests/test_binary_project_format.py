@@ -0,0 +1,112 @@
+import pytest
+
+from domain.models.diagram import LazyDiagram
+from domain.models.diagram_store import NodeList
+from infrastructure.repositories.binary_project_format import HEADER, BinaryProjectCodec
+from infrastructure.repositories.project_repository import ProjectRepository
+
+from conftest import build_project
+
+
+class Interrupted(Exception):
+    pass
+
+
+def first_diagram(project):
+    return next(iter(project.steps.values())).diagrams[0]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip(tmp_path, project, compress):
+    path = tmp_path / "projet.depsbin"
+    repository = ProjectRepository(compress_binary=compress)
+    repository.save(project, path)
+
+    assert repository.load(path) == project
+
+
+def test_compact_nodes_round_trip(tmp_path, project):
+    path = tmp_path / "projet.depsbin"
+    ProjectRepository().save(project, path)
+
+    loaded = ProjectRepository(compact_nodes=True).load(path)
+
+    assert isinstance(first_diagram(loaded).nodes, NodeList)
+    assert loaded == project
+
+
+def test_lazy_load_reads_diagrams_on_first_access(tmp_path, project):
+    path = tmp_path / "projet.depsbin"
+    repository = ProjectRepository()
+    repository.save(project, path)
+
+    loaded = repository.load(path, lazy=True)
+    diagram = first_diagram(loaded)
+
+    assert isinstance(diagram, LazyDiagram) and not diagram.is_loaded
+    assert not diagram.is_empty() and not diagram.is_loaded
+    assert diagram.nodes == first_diagram(project).nodes
+    assert diagram.is_loaded
+    assert loaded == project
+
+
+def test_lazy_diagrams_survive_full_rewrite_of_their_file(tmp_path, project):
+    path = tmp_path / "projet.depsbin"
+    ProjectRepository().save(project, path)
+    loaded = ProjectRepository().load(path, lazy=True)
+
+    # enregistrement complet : le fichier est remplacé, les blocs non lus sont recopiés avant
+    ProjectRepository(delta_saves=False).save(loaded, path)
+
+    assert loaded == project
+    assert ProjectRepository().load(path) == project
+
+
+def test_delta_save_appends_only_changed_diagrams(tmp_path, project):
+    path = tmp_path / "projet.depsbin"
+    repository = ProjectRepository()
+    repository.save(project, path)
+    size = path.stat().st_size
+
+    first_diagram(project).nodes[0].label = "modifié"
+    repository.save(project, path)
+
+    grown = path.stat().st_size - size
+    assert 0 < grown < size / 2
+    assert repository.load(path) == project
+
+
+def test_delta_save_keeps_unopened_lazy_diagrams(tmp_path, project):
+    path = tmp_path / "projet.depsbin"
+    repository = ProjectRepository()
+    repository.save(project, path)
+
+    loaded = repository.load(path, lazy=True)
+    first_diagram(loaded).nodes[0].x = -1.0
+    first_diagram(project).nodes[0].x = -1.0
+    repository.save(loaded, path)
+
+    assert repository.load(path) == project
+
+
+def test_interrupted_delta_save_keeps_previous_version(tmp_path, project):
+    path = tmp_path / "projet.depsbin"
+    repository = ProjectRepository()
+    repository.save(project, path)
+    header = path.read_bytes()[: HEADER.size]
+
+    changed = build_project()
+    first_diagram(changed).nodes[0].label = "jamais validé"
+
+    def crash(*_):
+        raise Interrupted  # arrêt brutal avant la réécriture de l'en-tête
+
+    with path.open("r+b") as f, pytest.raises(Interrupted):
+        BinaryProjectCodec().update(changed, f, path, crash)
+
+    assert path.read_bytes()[: HEADER.size] == header
+    assert repository.load(path) == project
+
+    # l'enregistrement suivant repart de l'ancien index et ignore les blocs orphelins
+    repository.save(changed, path)
+    assert repository.load(path) == changed
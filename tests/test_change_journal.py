@@ -0,0 +1,150 @@
+import pytest
+
+from domain.models.project_change import ProjectChange
+from infrastructure.repositories.binary_project_format import BinaryProjectCodec
+from infrastructure.repositories.change_journal import ChangeJournal, journal_path
+from infrastructure.repositories.project_repository import ProjectRepository
+
+from conftest import build_project
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def saved(tmp_path, project):
+    path = tmp_path / "projet.depsbin"
+    ProjectRepository().save(project, path)
+    return project, path
+
+
+def moved(step_id, diagram, node, x, y):
+    node.x, node.y = x, y
+    change = ProjectChange.node_moved(diagram, node)
+    change.step_id = step_id
+    return change
+
+
+def first_diagram(project):
+    step_id, step = next(iter(project.steps.items()))
+    return step_id, step.diagrams[0]
+
+
+def test_replay_restores_unsaved_changes(saved):
+    project, path = saved
+    step_id, diagram = first_diagram(project)
+    journal = ChangeJournal(path)
+    for revision, node in enumerate(diagram.nodes[:3], start=1):
+        journal.record(revision, moved(step_id, diagram, node, revision * 10.0, -1.0))
+    journal.flush()
+
+    reloaded = ProjectRepository().load(path)
+    assert ChangeJournal(path).replay(reloaded) == 3
+    assert reloaded == project
+
+
+def test_interleaved_moves_are_merged_per_node(saved):
+    project, path = saved
+    step_id, diagram = first_diagram(project)
+    journal = ChangeJournal(path)
+    revision = 0
+    for step in range(50):  # glisser une sélection : les noeuds alternent
+        for node in diagram.nodes[:5]:
+            revision += 1
+            journal.record(revision, moved(step_id, diagram, node, float(step), float(step)))
+
+    assert len(journal) == 5
+    journal.flush()
+    reloaded = ProjectRepository().load(path)
+    ChangeJournal(path).replay(reloaded)
+    assert reloaded == project
+
+
+def test_torn_tail_is_dropped_before_new_records(saved):
+    project, path = saved
+    step_id, diagram = first_diagram(project)
+    journal = ChangeJournal(path)
+    journal.record(1, moved(step_id, diagram, diagram.nodes[0], 1.0, 1.0))
+    journal.flush()
+    journal.record(2, moved(step_id, diagram, diagram.nodes[1], 2.0, 2.0))
+    journal.flush()
+    # arrêt brutal au milieu de l'écriture de la dernière ligne
+    data = journal_path(path).read_bytes()
+    journal_path(path).write_bytes(data[:-10])
+
+    reloaded = ProjectRepository().load(path)
+    recovered = ChangeJournal(path)
+    assert recovered.replay(reloaded) == 1
+    recovered.record(3, moved(step_id, diagram, diagram.nodes[2], 3.0, 3.0))
+    recovered.flush()
+
+    expected = ProjectRepository().load(path)
+    ChangeJournal(path).replay(expected)
+    _, expected_diagram = first_diagram(expected)
+    assert (expected_diagram.nodes[0].x, expected_diagram.nodes[2].x) == (1.0, 3.0)
+
+
+@pytest.mark.parametrize("delta_saves", [False, True])
+def test_journal_of_another_file_version_is_ignored(saved, delta_saves):
+    project, path = saved
+    step_id, diagram = first_diagram(project)
+    journal = ChangeJournal(path)
+    journal.record(1, moved(step_id, diagram, diagram.nodes[0], 5.0, 5.0))
+    journal.flush()
+
+    ProjectRepository(delta_saves=delta_saves).save(build_project(seed=1), path)
+
+    assert ChangeJournal(path).replay(ProjectRepository().load(path)) == 0
+
+
+def test_journal_survives_an_interrupted_save(saved):
+    project, path = saved
+    step_id, diagram = first_diagram(project)
+    journal = ChangeJournal(path)
+    journal.record(1, moved(step_id, diagram, diagram.nodes[0], 5.0, 5.0))
+    journal.flush()
+
+    def crash(*_):
+        raise Interrupted  # blocs ajoutés en fin de fichier, en-tête pas encore réécrit
+
+    with path.open("r+b") as f, pytest.raises(Interrupted):
+        BinaryProjectCodec().update(project, f, path, crash)
+
+    reloaded = ProjectRepository().load(path)
+    assert ChangeJournal(path).replay(reloaded) == 1
+    assert reloaded == project
+
+
+def test_journal_of_json_project(tmp_path, project):
+    path = tmp_path / "projet.depsproj"
+    ProjectRepository().save(project, path)
+    step_id, diagram = first_diagram(project)
+    journal = ChangeJournal(path)
+    journal.record(1, moved(step_id, diagram, diagram.nodes[0], 5.0, 5.0))
+    journal.flush()
+
+    reloaded = ProjectRepository().load(path)
+    assert ChangeJournal(path).replay(reloaded) == 1
+    assert reloaded == project
+
+
+def test_rebase_keeps_only_changes_after_the_save(saved):
+    project, path = saved
+    step_id, diagram = first_diagram(project)
+    journal = ChangeJournal(path)
+    journal.record(1, moved(step_id, diagram, diagram.nodes[0], 1.0, 1.0))
+    journal.record(2, moved(step_id, diagram, diagram.nodes[1], 2.0, 2.0))
+    journal.flush()
+
+    # enregistrement de l'état à la révision 1 (le premier déplacement seulement)
+    saved_state = ProjectRepository().load(path)
+    saved_node = first_diagram(saved_state)[1].nodes[0]
+    saved_node.x = saved_node.y = 1.0
+    ProjectRepository().save(saved_state, path)
+    journal.rebase(1)
+
+    assert len(journal) == 1
+    reloaded = ProjectRepository().load(path)
+    assert ChangeJournal(path).replay(reloaded) == 1
+    assert reloaded == project
@@ -0,0 +1,75 @@
+from app.cli import duplicate_targets, expand_inputs, main, target_path
+from domain.services.deps_generator import DepsGenerator
+from infrastructure.repositories.project_repository import ProjectRepository
+
+from conftest import build_project
+
+
+def _save(path, seed=0):
+    project = build_project(seed=seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ProjectRepository().save(project, path)
+    return project
+
+
+def test_exports_every_project_found(tmp_path, capsys):
+    first = _save(tmp_path / "a" / "un.depsproj", seed=1)
+    second = _save(tmp_path / "b" / "deux.depsbin", seed=2)
+    output = tmp_path / "out"
+
+    status = main([str(tmp_path), "--output-dir", str(output), "--workers", "1"])
+
+    assert status == 0
+    assert (output / "un.deps").read_text(encoding="utf-8") == DepsGenerator().generate(first)
+    assert (output / "deux.deps").read_text(encoding="utf-8") == DepsGenerator().generate(second)
+    assert "2/2" in capsys.readouterr().out
+
+
+def test_parallel_export_matches_serial(tmp_path):
+    for i in range(3):
+        _save(tmp_path / f"p{i}.depsproj", seed=i)
+
+    assert main([str(tmp_path / "*.depsproj"), "-o", str(tmp_path / "serial"), "-j", "1", "--order", "topological"]) == 0
+    assert main([str(tmp_path / "*.depsproj"), "-o", str(tmp_path / "parallel"), "-j", "2", "--order", "topological"]) == 0
+
+    for i in range(3):
+        assert (tmp_path / "parallel" / f"p{i}.deps").read_bytes() == (tmp_path / "serial" / f"p{i}.deps").read_bytes()
+
+
+def test_duplicate_targets_are_refused_before_export(tmp_path, capsys):
+    _save(tmp_path / "p.depsproj")
+    _save(tmp_path / "p.depsbin")
+
+    assert main([str(tmp_path), "-j", "1"]) == 2
+    assert not (tmp_path / "p.deps").exists()
+    assert "p.deps" in capsys.readouterr().err
+
+
+def test_duplicate_targets_with_output_dir(tmp_path):
+    jobs = [(source, target_path(source, tmp_path / "out")) for source in (tmp_path / "a" / "x.depsproj", tmp_path / "b" / "x.depsbin")]
+
+    assert list(duplicate_targets(jobs).values()) == [[source for source, _ in jobs]]
+
+
+def test_expand_inputs_removes_duplicates(tmp_path):
+    _save(tmp_path / "p.depsproj")
+
+    assert expand_inputs([str(tmp_path), str(tmp_path / "*.depsproj"), str(tmp_path / "p.depsproj")]) == [
+        tmp_path / "p.depsproj"
+    ]
+
+
+def test_strict_skips_projects_with_errors(tmp_path, capsys):
+    project = build_project()
+    node = next(iter(project.steps.values())).diagrams[0].nodes[1]
+    node.properties["equation"] = "A & (B"
+    ProjectRepository().save(project, tmp_path / "p.depsproj")
+
+    assert main([str(tmp_path), "-j", "1", "--strict"]) == 1
+    assert not (tmp_path / "p.deps").exists()
+    assert main([str(tmp_path), "-j", "1"]) == 0
+    assert (tmp_path / "p.deps").exists()
+
+
+def test_no_input_found(tmp_path, capsys):
+    assert main([str(tmp_path / "*.depsproj")]) == 2
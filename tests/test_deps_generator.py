@@ -0,0 +1,133 @@
+import copy
+import io
+
+import pytest
+
+from domain.models.diagram import Node, NodeType
+from domain.models.project_change import ProjectChange
+from domain.services.deps_generator import DepsGenerator, pack_diagram, unpack_diagram
+from domain.services.project_changes import apply_change
+
+from conftest import build_project
+
+
+@pytest.mark.parametrize("optimize_equations", [False, True])
+def test_streamed_output_matches_generate(project, optimize_equations):
+    generator = DepsGenerator(optimize_equations=optimize_equations)
+    stream = io.StringIO()
+
+    generator.generate_to(project, stream)
+
+    assert stream.getvalue() == generator.generate(project)
+
+
+def test_one_chunk_per_diagram(project):
+    chunks = list(DepsGenerator().iter_chunks(project))
+
+    diagrams = [d for step in project.steps.values() for d in step.diagrams]
+    assert len(chunks) == 2 + len(project.steps) + len(diagrams)
+    diagram_chunks = [c for c in chunks if c.startswith("# Diagram: ")]
+    assert [c.splitlines()[1].split()[1] for c in diagram_chunks] == [d.nodes[0].id for d in diagrams]
+
+
+def test_empty_project_has_only_the_header():
+    project = build_project(diagrams_per_step=0)
+
+    text = DepsGenerator().generate(project)
+
+    assert text.startswith(f"# DEPS code generated for project: {project.name}\n")
+    assert "NODE" not in text
+
+
+def _counting_renders(generator, monkeypatch):
+    rendered = []
+    render = generator._render_diagram
+
+    def counting(diagram):
+        rendered.append(diagram.id)
+        return render(diagram)
+
+    monkeypatch.setattr(generator, "_render_diagram", counting)
+    return rendered
+
+
+def _add_node(project, step_id, diagram):
+    node = Node.create(node_type=NodeType.CONDITION, label="Ajout", x=0.0, y=0.0, properties={"equation": "A & B"})
+    change = ProjectChange.node_added(diagram, node)
+    change.step_id = step_id
+    assert apply_change(project, change)
+    return change
+
+
+def test_incremental_generation_reuses_unchanged_diagrams(project, monkeypatch):
+    generator = DepsGenerator(incremental=True)
+    rendered = _counting_renders(generator, monkeypatch)
+    first = generator.generate(project)
+    rendered.clear()
+
+    step_id, step = next(iter(project.steps.items()))
+    change = _add_node(project, step_id, step.diagrams[0])
+    assert generator.generate(project) == first
+    generator.invalidate(change)
+    text = generator.generate(project)
+
+    assert rendered == [step.diagrams[0].id]
+    assert text == DepsGenerator().generate(project)
+
+
+def test_edit_after_snapshot_revision_is_not_lost(project):
+    generator = DepsGenerator(incremental=True)
+    generator.generate(project)
+    revision = generator.revision
+    snapshot = copy.deepcopy(project)
+
+    step_id, step = next(iter(project.steps.items()))
+    generator.invalidate(_add_node(project, step_id, step.diagrams[0]))
+    # export du snapshot terminé après la modification
+    assert generator.generate(snapshot, revision) == DepsGenerator().generate(snapshot)
+
+    assert generator.generate(project) == DepsGenerator().generate(project)
+
+
+def test_option_change_rerenders_everything(project, monkeypatch):
+    generator = DepsGenerator(incremental=True)
+    rendered = _counting_renders(generator, monkeypatch)
+    generator.generate(project)
+    rendered.clear()
+
+    generator.optimize_equations = True
+    text = generator.generate(project)
+
+    assert len(rendered) == sum(len(step.diagrams) for step in project.steps.values())
+    assert text == DepsGenerator(optimize_equations=True).generate(project)
+
+
+def test_global_invalidate_rerenders_everything(project, monkeypatch):
+    generator = DepsGenerator(incremental=True)
+    rendered = _counting_renders(generator, monkeypatch)
+    generator.generate(project)
+    rendered.clear()
+
+    generator.invalidate()
+    generator.generate(project)
+
+    assert len(rendered) == sum(len(step.diagrams) for step in project.steps.values())
+
+
+def test_pack_round_trip_renders_the_same_text(project):
+    generator = DepsGenerator()
+    for step in project.steps.values():
+        for diagram in step.diagrams:
+            assert generator._render_diagram(unpack_diagram(pack_diagram(diagram))) == generator._render_diagram(diagram)
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_parallel_output_matches_serial(incremental):
+    project = build_project(diagrams_per_step=3, nodes_per_diagram=15, seed=4)
+    serial = DepsGenerator(optimize_equations=True).generate(project)
+
+    with DepsGenerator(optimize_equations=True, incremental=incremental, workers=2) as generator:
+        assert generator.generate(project) == serial
+        step_id, step = next(iter(project.steps.items()))
+        generator.invalidate(_add_node(project, step_id, step.diagrams[1]))
+        assert generator.generate(project) == DepsGenerator(optimize_equations=True).generate(project)
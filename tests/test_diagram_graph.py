@@ -0,0 +1,65 @@
+from domain.models.diagram import Connection, ConnectionType, Diagram, DiagramType, Node, NodeType
+from domain.services.deps_generator import DepsGenerator, EmissionOrder
+from domain.services.diagram_graph import DiagramGraph
+
+
+def _diagram(count, edges, feedback=()):
+    diagram = Diagram(id="d", name="Graphe", diagram_type=DiagramType.LOGIC)
+    diagram.nodes = [Node.create(NodeType.CONDITION, f"n{i}", 0.0, 0.0) for i in range(count)]
+    ids = [node.id for node in diagram.nodes]
+    for source, target in edges:
+        diagram.connections.append(Connection.create(ids[source], ids[target]))
+    for source, target in feedback:
+        diagram.connections.append(Connection.create(ids[source], ids[target], "", ConnectionType.FEEDBACK))
+    return diagram
+
+
+def _position(order):
+    return {v: i for i, component in enumerate(order) for v in component}
+
+
+def test_acyclic_graph_orders_sources_first():
+    edges = [(3, 1), (1, 0), (2, 0), (4, 2)]
+    graph = DiagramGraph(_diagram(5, edges))
+
+    order = graph.topological_components()
+
+    position = _position(order)
+    assert all(len(component) == 1 for component in order)
+    assert all(position[s] < position[t] for s, t in edges)
+    # entre noeuds indépendants, l'ordre du diagramme est conservé
+    assert order == [[3], [1], [4], [2], [0]]
+
+
+def test_cycles_are_grouped_into_one_component():
+    graph = DiagramGraph(_diagram(6, [(0, 1), (1, 2), (2, 1), (2, 3), (3, 4), (4, 2), (4, 5), (5, 5)]))
+
+    order = graph.topological_components()
+
+    assert order == [[0], [1, 2, 3, 4], [5]]
+    assert [graph.is_cycle(component) for component in order] == [False, True, True]
+
+
+def test_feedback_connections_do_not_create_cycles():
+    graph = DiagramGraph(_diagram(3, [(0, 1), (1, 2)], feedback=[(2, 0)]))
+
+    assert graph.topological_components() == [[0], [1], [2]]
+    assert len(graph.back_edges) == 1
+
+
+def test_long_chain_is_handled_iteratively():
+    count = 20000
+    graph = DiagramGraph(_diagram(count, [(i + 1, i) for i in range(count - 1)] + [(0, count - 1)]))
+
+    assert graph.strongly_connected_components() == [list(range(count))]
+
+
+def test_topological_output_marks_cycles():
+    diagram = _diagram(3, [(1, 0), (0, 2), (2, 0)])
+
+    lines = DepsGenerator(order=EmissionOrder.TOPOLOGICAL)._render_diagram(diagram).splitlines()
+
+    ids = [node.id for node in diagram.nodes]
+    assert lines[1].split()[1] == ids[1]
+    assert lines[2] == f"# Cycle: {ids[0]} {ids[2]}"
+    assert [line.split()[1] for line in lines[3:5]] == [ids[0], ids[2]]
@@ -0,0 +1,76 @@
+import pytest
+
+from domain.models.diagram import Node, NodeType
+from domain.models.diagram_store import DiagramStore
+from infrastructure.repositories.project_repository import ProjectRepository, node_from_dict, node_to_dict
+
+from conftest import build_project
+
+
+@pytest.fixture
+def nodes():
+    return list(next(iter(build_project().steps.values())).diagrams[0].nodes)
+
+
+def test_views_equal_the_original_nodes(nodes):
+    store = DiagramStore.from_nodes(nodes)
+
+    assert store.nodes() == nodes
+    assert [node_from_dict(node_to_dict(view)) for view in store.nodes()] == nodes
+
+
+def test_reading_empty_properties_does_not_allocate(nodes):
+    store = DiagramStore.from_nodes(nodes)
+    empty = [i for i, node in enumerate(nodes) if not node.properties]
+
+    for i in empty:
+        view = store.view(i)
+        assert view.properties == {}
+        assert "equation" not in view.properties
+        with pytest.raises(TypeError):
+            view.properties["k"] = "v"
+
+    assert all(store.properties[i] is None for i in empty)
+
+
+def test_set_property_allocates_on_first_write_and_frees_on_last_removal(nodes):
+    store = DiagramStore.from_nodes(nodes)
+    i = next(i for i, node in enumerate(nodes) if not node.properties)
+    view = store.view(i)
+
+    view.set_property("tag", "T1")
+    assert store.properties[i] == {"tag": "T1"} and view.properties == {"tag": "T1"}
+
+    view.set_property("tag", None)
+    assert store.properties[i] is None
+
+
+def test_set_property_on_plain_node():
+    node = Node.create(NodeType.CONDITION, "n", 0.0, 0.0)
+
+    node.set_property("equation", "A & B")
+    node.set_property("tag", None)
+
+    assert node.properties == {"equation": "A & B"}
+
+
+def test_insert_and_delete_shift_following_views(nodes):
+    store = DiagramStore.from_nodes(nodes[:3])
+    node_list = store.nodes()
+
+    node_list.insert(1, nodes[5])
+    assert [n.id for n in node_list] == [nodes[0].id, nodes[5].id, nodes[1].id, nodes[2].id]
+    del node_list[0]
+    assert node_list == [nodes[5], nodes[1], nodes[2]]
+
+    node_list[0].x = 42.0
+    assert store.xs[0] == 42.0
+
+
+def test_compact_project_saves_as_json(tmp_path, project):
+    ProjectRepository().save(project, tmp_path / "p.depsbin")
+    compact = ProjectRepository(compact_nodes=True).load(tmp_path / "p.depsbin")
+
+    ProjectRepository().save(compact, tmp_path / "p.depsproj")
+
+    assert ProjectRepository().load(tmp_path / "p.depsproj") == project
@@ -0,0 +1,148 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QApplication, QStyleOptionGraphicsItem
+
+from domain.models.diagram import Connection, Diagram, DiagramType, Node, NodeType
+from domain.models.project_change import ChangeKind
+from ui.widgets import diagram_view
+from ui.widgets.diagram_view import DiagramView
+
+from conftest import build_project
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_showing_a_diagram_is_not_a_change(app):
+    changes = []
+    view = DiagramView(on_changed=lambda change=None: changes.append(change))
+    diagram = next(iter(build_project(1, 30).steps.values())).diagrams[0]
+
+    view.set_diagram(diagram)
+
+    assert len(view.node_items) == 30 and view.connection_items
+    assert changes == []
+
+
+def test_moving_a_node_reports_the_move(app):
+    changes = []
+    view = DiagramView(on_changed=lambda change=None: changes.append(change))
+    diagram = next(iter(build_project(1, 5).steps.values())).diagrams[0]
+    view.set_diagram(diagram)
+    node = diagram.nodes[0]
+
+    view.node_items[node.id].setPos(node.x + 10, node.y)
+
+    assert [c.kind for c in changes] == [ChangeKind.NODE_MOVED]
+    assert changes[0].node_id == node.id
+
+
+def _connected_view(nodes, edges):
+    diagram = Diagram(id="d", name="Vue", diagram_type=DiagramType.LOGIC)
+    diagram.nodes = [Node.create(NodeType.CONDITION, f"n{i}", i * 200.0, 0.0) for i in range(nodes)]
+    diagram.connections = [Connection.create(diagram.nodes[s].id, diagram.nodes[t].id) for s, t in edges]
+    view = DiagramView()
+    view.set_diagram(diagram)
+    return view, diagram
+
+
+def test_moving_a_node_updates_only_its_arrows(app):
+    view, diagram = _connected_view(4, [(0, 1), (1, 2), (2, 3), (3, 0)])
+    arrows = [view.connection_items[c.id] for c in diagram.connections]
+    before = [arrow.boundingRect() for arrow in arrows]
+
+    view.node_items[diagram.nodes[1].id].setPos(200.0, 300.0)
+    view.node_items[diagram.nodes[1].id].setPos(200.0, 400.0)
+
+    assert list(view._dirty_arrows) == arrows[:2]
+    view._flush_arrow_updates()
+    assert not view._dirty_arrows
+    assert arrows[0].boundingRect() != before[0] and arrows[1].boundingRect() != before[1]
+    assert [arrow.boundingRect() for arrow in arrows[2:]] == before[2:]
+
+
+def test_replacing_a_connection_unindexes_the_old_arrow(app):
+    view, diagram = _connected_view(2, [(0, 1)])
+    connection = diagram.connections[0]
+    old = view.connection_items[connection.id]
+
+    view.add_connection(connection)
+
+    new = view.connection_items[connection.id]
+    assert new is not old
+    assert list(view._incident_arrows[diagram.nodes[0].id]) == [new]
+    assert list(view._incident_arrows[diagram.nodes[1].id]) == [new]
+
+
+def test_arrow_geometry_follows_its_endpoints(app):
+    view, diagram = _connected_view(2, [(0, 1)])
+    arrow = view.connection_items[diagram.connections[0].id]
+    target = view.node_items[diagram.nodes[1].id]
+
+    bounds = arrow.boundingRect()
+    assert bounds.contains(QPointF(0.0, 0.0)) and bounds.contains(QPointF(200.0, 0.0))
+    assert arrow._head.count() == 3 and arrow._head[1] == QPointF(200.0, 0.0)
+    assert all(bounds.contains(point) for point in arrow._head)
+    assert arrow._shape is None  # calculée seulement à la demande
+
+    shape = arrow.shape()
+    assert arrow.shape() is shape and shape.contains(QPointF(100.0, 2.0))
+
+    target.setPos(0.0, 300.0)
+    assert arrow.boundingRect() == bounds  # pas de recalcul avant le prochain tour de boucle
+    view._flush_arrow_updates()
+    assert arrow.boundingRect().contains(QPointF(0.0, 300.0))
+    assert arrow._shape is None
+
+
+def test_arrow_between_overlapping_nodes_has_no_head(app):
+    view, diagram = _connected_view(2, [(0, 1)])
+    view.node_items[diagram.nodes[1].id].setPos(0.0, 0.0)
+    view._flush_arrow_updates()
+
+    arrow = view.connection_items[diagram.connections[0].id]
+    assert arrow._head.isEmpty()
+    assert not arrow.boundingRect().isEmpty()
+
+
+class _RecordingRenderer:
+    def __init__(self):
+        self.calls = []
+
+    def paint(self, painter, bounds, body, appearance, label, selected, scale):
+        self.calls.append((label, selected, round(scale, 3)))
+
+
+@pytest.mark.parametrize(
+    "scale, expected",
+    [
+        (1.0, [("Libellé", False, 1.0)]),
+        (0.3, [(None, False, 0.3)]),
+        (0.05, []),  # rectangle plein, sans passer par le renderer
+    ],
+)
+def test_node_level_of_detail(app, monkeypatch, scale, expected):
+    renderer = _RecordingRenderer()
+    monkeypatch.setattr(diagram_view, "node_renderer", lambda: renderer)
+    item = diagram_view.NodeGraphicsItem(Node.create(NodeType.CONDITION, "Libellé", 0.0, 0.0), lambda item: None)
+    image = QImage(400, 400, QImage.Format_ARGB32)
+    image.fill(0)
+
+    painter = QPainter(image)
+    painter.translate(200, 200)
+    painter.scale(scale, scale)
+    item.paint(painter, QStyleOptionGraphicsItem())
+    painter.end()
+
+    assert renderer.calls == expected
+    if not expected:
+        assert image.pixelColor(200, 200).alpha() == 255
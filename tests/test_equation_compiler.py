@@ -0,0 +1,33 @@
+import random
+
+from domain.models.equations import And, Not, Var
+from domain.services.equation_compiler import EquationCompiler, evaluate, variables_of
+
+from conftest import assignments, random_expr
+
+VARIABLES = ["A", "B", "C", "D"]
+
+
+def test_compiled_equations_match_tree_evaluation():
+    rng = random.Random(2)
+    equations = {f"eq{i}": random_expr(rng, VARIABLES, depth=5) for i in range(40)}
+
+    compiled = EquationCompiler().compile_many(equations)
+
+    assert compiled.names == tuple(equations)
+    for env in assignments(VARIABLES):
+        expected = {name: evaluate(expr, env) for name, expr in equations.items()}
+        assert compiled(env) == expected
+
+
+def test_missing_variables_are_false():
+    run = EquationCompiler().compile(And(Var("A"), Not(Var("B"))))
+
+    assert run({"A": True}) is True
+    assert run({}) is False
+
+
+def test_variables_in_order_of_first_appearance():
+    expr = And(Var("B"), And(Not(Var("A")), Var("B")))
+
+    assert variables_of(expr) == ["B", "A"]
@@ -0,0 +1,41 @@
+import copy
+import pickle
+
+from domain.models.equations import And, Not, Or, Var
+from domain.services.equation_compiler import EquationCompiler, evaluate
+
+from conftest import assignments
+
+
+def test_structurally_equal_expressions_are_the_same_object():
+    assert Var("A") is Var("A")
+    assert And(Var("A"), Not(Var("B"))) is And(Var("A"), Not(Var("B")))
+    assert And(Var("A"), Var("B")) is not Or(Var("A"), Var("B"))
+
+
+def test_pickle_and_copy_reintern():
+    expr = Or(And(Var("A"), Var("B")), Not(Var("C")))
+
+    assert pickle.loads(pickle.dumps(expr)) is expr
+    assert copy.deepcopy(expr) is expr
+
+
+def test_shared_subexpression_gets_a_single_local():
+    shared = Or(And(Var("A"), Var("B")), Not(Var("C")))
+    equations = {"x": And(shared, Var("D")), "y": Or(Not(shared), Var("A")), "z": shared}
+
+    compiled = EquationCompiler().compile_many(equations)
+
+    local_names = [name for name in compiled._function.__code__.co_varnames if name.startswith("s")]
+    assert local_names == ["s0"]
+    for env in assignments(["A", "B", "C", "D"]):
+        assert compiled(env) == {name: evaluate(expr, env) for name, expr in equations.items()}
+
+
+def test_deep_not_chain_falls_back_to_iterative_evaluation():
+    expr = Var("A")
+    for _ in range(20000):
+        expr = Not(expr)
+
+    assert evaluate(expr, {"A": True}) is True
+    assert EquationCompiler().compile(expr)({"A": False}) is False
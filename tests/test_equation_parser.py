@@ -0,0 +1,69 @@
+import pickle
+
+import pytest
+
+from domain.models.equations import And, Const, Not, Or, Var
+from domain.services.equation_compiler import evaluate
+from domain.services.equation_formatter import EquationFormatter, flatten
+from domain.services.equation_parser import MAX_NESTING, EquationParser, EquationSyntaxError
+
+
+def depth(expr) -> int:
+    result, stack = 0, [(expr, 1)]
+    while stack:
+        node, level = stack.pop()
+        result = max(result, level)
+        stack.extend((child, level + 1) for child in (getattr(node, name) for name in node._fields) if hasattr(child, "_fields"))
+    return result
+
+
+@pytest.fixture
+def parser():
+    return EquationParser()
+
+
+def test_precedence_not_and_or(parser):
+    assert parser.parse("!A & B | C") is Or(And(Not(Var("A")), Var("B")), Var("C"))
+    assert parser.parse("A | B & C") is Or(Var("A"), And(Var("B"), Var("C")))
+    assert parser.parse("(A | B) & 1") is And(Or(Var("A"), Var("B")), Const(True))
+
+
+def test_identifiers_with_dots_and_underscores(parser):
+    assert parser.parse("io.in_1 & _x") is And(Var("io.in_1"), Var("_x"))
+
+
+@pytest.mark.parametrize(
+    "text, position",
+    [("A &", 3), ("A & (B | C", 10), ("A # B", 2), ("A & 2", 4), ("A B", 2), ("", 0)],
+)
+def test_syntax_errors_report_position(parser, text, position):
+    with pytest.raises(EquationSyntaxError) as error:
+        parser.parse(text)
+    assert error.value.position == position
+
+
+def test_cache_is_keyed_by_normalized_text(parser):
+    assert parser.parse("A  &   B") is parser.parse("A & B")
+
+
+def test_deep_nesting_is_a_syntax_error(parser):
+    for text in ("(" * 5000 + "A" + ")" * 5000, "!" * 5000 + "A"):
+        (error,) = parser.validate(text)
+        assert "imbriquée" in error.message
+    assert parser.validate("(" * MAX_NESTING + "A" + ")" * MAX_NESTING) == []
+
+
+def test_long_chains_build_shallow_trees(parser):
+    names = [f"v{i}" for i in range(3000)]
+    conjunction = parser.parse(" & ".join(names))
+    disjunction = parser.parse(" | ".join(names) + " | a & b & c")
+
+    assert depth(conjunction) <= 13
+    assert [v.name for v in flatten(conjunction)] == names
+    assert len(flatten(disjunction)) == 3001
+    # les traitements récursifs et le pickle (génération parallèle) tiennent
+    assert evaluate(conjunction, dict.fromkeys(names, True))
+    assert not evaluate(conjunction, {})
+    assert pickle.loads(pickle.dumps(conjunction)) is conjunction
+    text = EquationFormatter().format(disjunction)
+    assert parser.parse(text) is disjunction
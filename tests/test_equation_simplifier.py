@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from domain.models.equations import Or, Var
+from domain.services.equation_compiler import evaluate
+from domain.services.equation_formatter import EquationFormatter
+from domain.services.equation_parser import EquationParser
+from domain.services.equation_simplifier import EquationSimplifier, literal_count
+
+from conftest import assignments, random_expr
+
+VARIABLES = ["A", "B", "C", "D"]
+
+
+@pytest.mark.parametrize("max_exact_variables", [0, 8])
+def test_simplified_expression_is_equivalent(max_exact_variables):
+    rng = random.Random(5)
+    simplifier = EquationSimplifier(max_exact_variables=max_exact_variables)
+    for _ in range(60):
+        expr = random_expr(rng, VARIABLES, depth=5)
+        simplified = simplifier.simplify(expr)
+        assert literal_count(simplified) <= literal_count(expr)
+        for env in assignments(VARIABLES):
+            assert evaluate(simplified, env) == evaluate(expr, env)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("A | A & B", "A"),
+        ("C & B & A", "A & B & C"),
+        ("A & !A", "0"),
+        ("!(A | B)", "!A & !B"),
+        ("A & B | A & !B", "A"),
+        ("!!A | 0", "A"),
+    ],
+)
+def test_canonical_text(text, expected):
+    expr = EquationSimplifier().simplify(EquationParser().parse(text))
+
+    assert EquationFormatter().format(expr) == expected
+
+
+def test_operand_order_does_not_change_the_result():
+    parser = EquationParser()
+    simplifier = EquationSimplifier()
+
+    assert simplifier.simplify(parser.parse("D & (B | !C) & A")) is simplifier.simplify(parser.parse("A & D & (!C | B)"))
+
+
+def test_long_chain_stays_balanced():
+    expr = Var("x0")
+    for i in range(1, 3000):
+        expr = Or(expr, Var(f"x{i}"))
+
+    simplified = EquationSimplifier().simplify(expr)
+
+    depth, stack = 0, [(simplified, 1)]
+    while stack:
+        node, level = stack.pop()
+        depth = max(depth, level)
+        if isinstance(node, Or):
+            stack += [(node.left, level + 1), (node.right, level + 1)]
+    assert depth <= 13
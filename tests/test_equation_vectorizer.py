@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+import pytest
+
+from domain.models.equations import And, Or, Var, chain
+from domain.services.equation_compiler import evaluate
+from domain.services.equation_vectorizer import VectorizedEvaluator
+
+from conftest import random_expr
+
+VARIABLES = ["A", "B", "C", "D", "E"]
+
+
+def test_vectorized_results_match_tree_evaluation():
+    rng = random.Random(3)
+    length = 64
+    columns = {name: np.array([rng.random() < 0.5 for _ in range(length)]) for name in VARIABLES}
+    equations = {f"eq{i}": random_expr(rng, VARIABLES, depth=5) for i in range(30)}
+
+    names, matrix = VectorizedEvaluator().evaluate_many(equations, columns)
+
+    assert names == list(equations)
+    for t in range(length):
+        env = {name: bool(column[t]) for name, column in columns.items()}
+        assert matrix[t].tolist() == [evaluate(equations[name], env) for name in names]
+
+
+def test_truth_table_rows_follow_binary_order():
+    names, inputs, outputs = VectorizedEvaluator().truth_table(Or(And(Var("A"), Var("B")), Var("C")))
+
+    assert names == ["A", "B", "C"]
+    assert inputs.shape == (8, 3) and inputs.dtype == bool
+    assert [int("".join("1" if bit else "0" for bit in row), 2) for row in inputs] == list(range(8))
+    assert outputs.tolist() == [evaluate(Or(And(Var("A"), Var("B")), Var("C")), dict(zip(names, row))) for row in inputs.tolist()]
+
+
+def test_truth_table_rejects_too_many_variables():
+    evaluator = VectorizedEvaluator()
+    expr = chain(And, [Var(f"x{i}") for i in range(evaluator.MAX_TRUTH_TABLE_VARIABLES + 1)])
+
+    with pytest.raises(ValueError):
+        evaluator.truth_table(expr)
+
+
+def test_long_left_deep_chain_does_not_recurse_per_operand():
+    expr = Var("x0")
+    for i in range(1, 5000):
+        expr = Or(expr, Var(f"x{i}"))
+    columns = {"x4999": np.array([True, False])}
+
+    assert VectorizedEvaluator().evaluate(expr, columns).tolist() == [True, False]
@@ -0,0 +1,41 @@
+import dataclasses
+
+import pytest
+
+from domain.models.diagram import DEFAULT_APPEARANCE, NodeAppearance, NodeShape
+from infrastructure.repositories.project_repository import ProjectRepository, diagram_to_dict
+
+
+def test_equal_appearances_share_one_instance():
+    a = NodeAppearance(shape=NodeShape.ELLIPSE, fill_color="#abcdef").intern()
+    b = NodeAppearance(shape=NodeShape.ELLIPSE, fill_color="#abcdef").intern()
+
+    assert a is b
+    assert NodeAppearance.from_dict(a.to_dict()) is a
+    assert NodeAppearance.from_dict({}) is DEFAULT_APPEARANCE
+
+
+def test_appearance_is_immutable():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        DEFAULT_APPEARANCE.fill_color = "#000000"
+
+
+def test_style_table_lists_each_style_once(project):
+    diagram = next(iter(project.steps.values())).diagrams[0]
+
+    data = diagram_to_dict(diagram)
+
+    distinct = list(dict.fromkeys(node.appearance for node in diagram.nodes))
+    assert data["styles"] == [a.to_dict() for a in distinct]
+    assert [data["styles"][n["style"]] for n in data["nodes"]] == [node.appearance.to_dict() for node in diagram.nodes]
+
+
+@pytest.mark.parametrize("name", ["p.depsproj", "p.depsbin"])
+def test_loaded_nodes_share_interned_appearances(tmp_path, project, name):
+    ProjectRepository().save(project, tmp_path / name)
+
+    loaded = ProjectRepository().load(tmp_path / name)
+
+    for step in loaded.steps.values():
+        for diagram in step.diagrams:
+            assert all(node.appearance is node.appearance.intern() for node in diagram.nodes)
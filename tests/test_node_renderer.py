@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QImage, QPainter, QPixmapCache
+from PySide6.QtWidgets import QApplication
+
+from domain.models.diagram import DEFAULT_APPEARANCE, NodeAppearance, NodeShape
+from ui.widgets.node_renderer import MAX_TILE_SCALE, NodeRenderer
+
+BOUNDS = QRectF(-76, -41, 152, 82)
+BODY = QRectF(-70, -35, 140, 70)
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def renderer(app, monkeypatch):
+    QPixmapCache.clear()
+    renderer = NodeRenderer()
+    renderer.tiles = []
+    render_tile = renderer._render_tile
+
+    def counting(*args):
+        renderer.tiles.append(args[2:])
+        return render_tile(*args)
+
+    monkeypatch.setattr(renderer, "_render_tile", counting)
+    return renderer
+
+
+def _paint(renderer, appearance, label, selected=False, scale=1.0):
+    image = QImage(400, 400, QImage.Format_ARGB32)
+    painter = QPainter(image)
+    renderer.paint(painter, BOUNDS, BODY, appearance, label, selected, scale)
+    painter.end()
+
+
+def test_nodes_with_the_same_look_share_one_tile(renderer):
+    for _ in range(50):
+        _paint(renderer, DEFAULT_APPEARANCE, "Moteur")
+    _paint(renderer, DEFAULT_APPEARANCE, "Moteur", scale=1.05)  # même palier de zoom
+
+    assert len(renderer.tiles) == 1
+
+
+def test_each_variant_gets_its_own_tile(renderer):
+    ellipse = NodeAppearance(shape=NodeShape.ELLIPSE).intern()
+
+    _paint(renderer, DEFAULT_APPEARANCE, "Moteur")
+    _paint(renderer, DEFAULT_APPEARANCE, "Pompe")
+    _paint(renderer, DEFAULT_APPEARANCE, None)
+    _paint(renderer, DEFAULT_APPEARANCE, "Moteur", selected=True)
+    _paint(renderer, ellipse, "Moteur")
+    _paint(renderer, DEFAULT_APPEARANCE, "Moteur", scale=2.0)
+
+    assert len(renderer.tiles) == 6
+
+
+def test_large_zoom_draws_directly(renderer):
+    _paint(renderer, DEFAULT_APPEARANCE, "Moteur", scale=MAX_TILE_SCALE * 2)
+
+    assert renderer.tiles == []
+
+
+def test_label_layouts_are_bounded(app):
+    renderer = NodeRenderer(max_labels=3)
+
+    first = renderer.static_text("a", 140)
+    assert renderer.static_text("a", 140) is first
+    for label in "bcd":
+        renderer.static_text(label, 140)
+
+    assert len(renderer._labels) == 3
+    assert renderer.static_text("a", 140) is not first
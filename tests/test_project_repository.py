@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from domain.models.diagram import NodeType
+from infrastructure.repositories.project_repository import ProjectRepository
+
+
+def test_json_round_trip(tmp_path, project):
+    path = tmp_path / "projet.depsproj"
+    repository = ProjectRepository()
+    repository.save(project, path)
+
+    assert repository.load(path) == project
+
+
+def test_streaming_loader_matches_json_load(tmp_path, project):
+    path = tmp_path / "projet.depsproj"
+    ProjectRepository(pretty_json=True).save(project, path)
+    calls = []
+
+    loaded = ProjectRepository(streaming_threshold=0).load(path, progress=lambda done, total: calls.append((done, total)))
+
+    assert loaded == project
+    assert calls and calls[-1][0] == calls[-1][1] == path.stat().st_size
+
+
+def test_streaming_loader_accepts_styles_after_nodes(tmp_path, project):
+    path = tmp_path / "projet.depsproj"
+    ProjectRepository().save(project, path)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    for step in data["steps"].values():
+        for diagram in step["diagrams"]:
+            diagram["styles"] = diagram.pop("styles")  # la table passe après les noeuds
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    assert ProjectRepository(streaming_threshold=0).load(path) == project
+
+
+@pytest.mark.parametrize("streaming_threshold", [0, 1 << 30])
+def test_missing_styles_table_is_an_error(tmp_path, streaming_threshold):
+    node = {"id": "n1", "type": list(NodeType)[0].value, "label": "", "x": 0, "y": 0, "style": 0}
+    data = {
+        "id": "p",
+        "name": "p",
+        "steps": {"s": {"id": "s", "name": "s", "diagrams": [{"id": "d", "name": "d", "nodes": [node]}]}},
+    }
+    path = tmp_path / "projet.depsproj"
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="styles"):
+        ProjectRepository(streaming_threshold=streaming_threshold).load(path)
@@ -0,0 +1,22 @@
+from domain.services.deps_generator import DepsGenerator
+from domain.services.project_snapshot import ProjectSnapshot
+from infrastructure.repositories.project_repository import ProjectRepository
+
+
+def test_snapshot_of_lazy_project_survives_file_rewrite(tmp_path, project):
+    path = tmp_path / "projet.depsbin"
+    ProjectRepository().save(project, path)
+    live = ProjectRepository().load(path, lazy=True)
+    snapshot = ProjectSnapshot.capture(live)
+
+    # enregistrement complet (compaction) : le fichier est remplacé
+    ProjectRepository(delta_saves=False).save(live, path)
+    exported = DepsGenerator().generate(snapshot.to_project())
+
+    assert exported == DepsGenerator().generate(project)
+    # les diagrammes jamais ouverts restent lisibles dans le projet affiché
+    assert live == project
+
+
+def test_snapshot_round_trip(project):
+    assert ProjectSnapshot.capture(project).to_project() == project